@@ -0,0 +1,3 @@
+"""
+bot/analytics/__init__.py - Offline analytics over local columnar snapshots
+"""
@@ -0,0 +1,315 @@
+"""
+bot/analytics/snapshot.py - Memory-mapped columnar snapshot of the timesheet table
+
+A snapshot is a directory with one flat binary file per column plus meta.json:
+
+    user.i32        code into meta["dictionaries"]["user_id"]
+    project.i32     code into meta["dictionaries"]["project"]
+    task_type.i16   code into meta["dictionaries"]["task_type"]
+    entry_date.i32  days since 1970-01-01
+    hours.f32       hours
+
+Rows with NULL hours are left out (they would be NaN in the float column);
+SUM() ignores them in SQL too, so reports still match the database. NULL
+and '' projects/task types get separate codes (None and "" labels), the
+same separate groups GROUP BY gives.
+
+The builder streams the table through a server-side cursor, so memory stays
+flat apart from the dictionaries. Reports are vectorized NumPy over
+numpy.memmap views and never touch the database.
+
+Requires numpy (requirements-analytics.txt; only the snapshot scripts
+import this module).
+"""
+
+import json
+import logging
+import os
+import shutil
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from bot.db.pool import get_pool
+
+logger = logging.getLogger(__name__)
+
+EPOCH = date(1970, 1, 1)
+
+# Monday 1970-01-05 is day 4; weeks are Monday-aligned like date_trunc('week')
+_FIRST_MONDAY = 4
+
+COLUMNS = {
+    "user": np.int32,
+    "project": np.int32,
+    "task_type": np.int16,
+    "entry_date": np.int32,
+    "hours": np.float32,
+}
+
+_SUFFIX = {np.int16: "i16", np.int32: "i32", np.float32: "f32"}
+
+GROUP_KEYS = {"user": "user_id", "project": "project", "task_type": "task_type"}
+
+
+def _column_path(path: Path, name: str) -> Path:
+    return path / f"{name}.{_SUFFIX[COLUMNS[name]]}"
+
+
+def to_days(d: date) -> int:
+    """Date -> int32 day number used in the entry_date column"""
+    return (d - EPOCH).days
+
+
+def from_days(days: int) -> date:
+    """Inverse of to_days"""
+    return EPOCH + timedelta(days=int(days))
+
+
+class _Dictionary:
+    """Assigns dense integer codes to values in first-seen order"""
+
+    def __init__(self):
+        self.codes: Dict = {}
+        self.values: List = []
+
+    def encode(self, value) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+
+async def build_snapshot(path: str, chunk_size: int = 50_000) -> Dict:
+    """
+    Dump the timesheet table into a columnar snapshot directory
+
+    The snapshot is written next to `path` and renamed into place, so
+    readers never see a half-written snapshot.
+
+    Args:
+        path: Target directory (replaced if it exists)
+        chunk_size: Rows converted and appended per batch
+
+    Returns:
+        The snapshot metadata (row count, dictionaries, date range)
+    """
+    target = Path(path)
+    tmp = target.with_name(target.name + ".tmp")
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir(parents=True)
+
+    dicts = {name: _Dictionary() for name in GROUP_KEYS}
+    files = {name: open(_column_path(tmp, name), "wb") for name in COLUMNS}
+    rows = 0
+    started = time.perf_counter()
+
+    def flush(chunk: List[tuple]) -> None:
+        user, project, task_type, entry_date, hours = zip(*chunk)
+        columns = {
+            "user": [dicts["user"].encode(v) for v in user],
+            "project": [dicts["project"].encode(v) for v in project],
+            "task_type": [dicts["task_type"].encode(v) for v in task_type],
+            "entry_date": [to_days(v) for v in entry_date],
+            "hours": hours,
+        }
+        for name, values in columns.items():
+            np.asarray(values, dtype=COLUMNS[name]).tofile(files[name])
+
+    try:
+        pool = get_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction(isolation="repeatable_read", readonly=True):
+                chunk = []
+                async for r in conn.cursor(
+                    "SELECT user_id, project, task_type, entry_date, hours::float8 "
+                    "FROM timesheet WHERE hours IS NOT NULL",
+                    prefetch=chunk_size,
+                ):
+                    chunk.append(tuple(r))
+                    if len(chunk) >= chunk_size:
+                        flush(chunk)
+                        rows += len(chunk)
+                        chunk = []
+                if chunk:
+                    flush(chunk)
+                    rows += len(chunk)
+    finally:
+        for f in files.values():
+            f.close()
+
+    if len(dicts["task_type"].values) > np.iinfo(np.int16).max:
+        raise RuntimeError("Too many distinct task types for an int16 column")
+
+    meta = {
+        "rows": rows,
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "dictionaries": {GROUP_KEYS[name]: d.values for name, d in dicts.items()},
+    }
+    with open(tmp / "meta.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+    if target.exists():
+        old = target.with_name(target.name + ".old")
+        if old.exists():
+            shutil.rmtree(old)
+        os.replace(target, old)
+        os.replace(tmp, target)
+        shutil.rmtree(old)
+    else:
+        os.replace(tmp, target)
+
+    logger.info("Snapshot of %s rows written to %s in %.1fs", rows, target, time.perf_counter() - started)
+    return meta
+
+
+class Snapshot:
+    """
+    Read-only, memory-mapped view of a snapshot directory
+
+    Columns are numpy.memmap arrays; pages are loaded lazily by the OS
+    and shared between processes reading the same snapshot.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        with open(self.path / "meta.json", "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+
+        self.rows = self.meta["rows"]
+        self.dictionaries = self.meta["dictionaries"]
+
+        for name, dtype in COLUMNS.items():
+            if self.rows:
+                column = np.memmap(_column_path(self.path, name), dtype=dtype, mode="r", shape=(self.rows,))
+            else:
+                column = np.empty(0, dtype=dtype)
+            setattr(self, name, column)
+
+    def labels(self, by: str) -> List:
+        """Decoded values for a group-by column ("user", "project", "task_type")"""
+        return self.dictionaries[GROUP_KEYS[by]]
+
+    def _mask(self, date_from: Optional[date], date_to: Optional[date]) -> Optional[np.ndarray]:
+        if date_from is None and date_to is None:
+            return None
+        mask = np.ones(self.rows, dtype=bool)
+        if date_from is not None:
+            mask &= self.entry_date >= to_days(date_from)
+        if date_to is not None:
+            mask &= self.entry_date <= to_days(date_to)
+        return mask
+
+    def _select(self, mask: Optional[np.ndarray], *names: str) -> Tuple[np.ndarray, ...]:
+        columns = tuple(getattr(self, name) for name in names)
+        if mask is None:
+            return columns
+        return tuple(c[mask] for c in columns)
+
+    def group_sum(
+        self,
+        by: str,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> Dict:
+        """
+        Total hours per user, project or task_type
+
+        Args:
+            by: "user", "project" or "task_type"
+            date_from: First entry_date to include
+            date_to: Last entry_date to include
+
+        Returns:
+            Dict of label -> hours, largest first (groups with no hours omitted)
+        """
+        codes, hours = self._select(self._mask(date_from, date_to), by, "hours")
+        labels = self.labels(by)
+
+        totals = np.bincount(codes, weights=hours, minlength=len(labels))
+        order = np.argsort(-totals, kind="stable")
+        return {labels[i]: float(totals[i]) for i in order if totals[i]}
+
+    def weekly_pivot(
+        self,
+        by: str = "project",
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> Tuple[List, List[date], np.ndarray]:
+        """
+        Hours per (group, Monday-aligned week)
+
+        Args:
+            by: "user", "project" or "task_type"
+            date_from: First entry_date to include
+            date_to: Last entry_date to include
+
+        Returns:
+            (row labels, week start dates, hours matrix [rows x weeks]);
+            only groups and weeks with entries are included
+        """
+        codes, days, hours = self._select(self._mask(date_from, date_to), by, "entry_date", "hours")
+        labels = self.labels(by)
+        if not len(days):
+            return [], [], np.zeros((0, 0))
+
+        weeks = (days.astype(np.int64) - _FIRST_MONDAY) // 7
+        first_week = int(weeks.min())
+        n_weeks = int(weeks.max()) - first_week + 1
+
+        cells = codes.astype(np.int64) * n_weeks + (weeks - first_week)
+        matrix = np.bincount(cells, weights=hours, minlength=len(labels) * n_weeks)
+        matrix = matrix.reshape(len(labels), n_weeks)
+
+        rows = np.flatnonzero(matrix.any(axis=1))
+        cols = np.flatnonzero(matrix.any(axis=0))
+        week_starts = [from_days(_FIRST_MONDAY + 7 * (first_week + w)) for w in cols]
+        return [labels[r] for r in rows], week_starts, matrix[np.ix_(rows, cols)]
+
+    def user_percentiles(
+        self,
+        percentiles: Sequence[float] = (50, 90, 99),
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> Dict[int, Dict[float, float]]:
+        """
+        Percentiles of each user's daily logged hours (days with entries only)
+
+        Args:
+            percentiles: Percentiles in 0-100
+            date_from: First entry_date to include
+            date_to: Last entry_date to include
+
+        Returns:
+            Dict of user_id -> {percentile: hours}
+        """
+        codes, days, hours = self._select(self._mask(date_from, date_to), "user", "entry_date", "hours")
+        labels = self.labels("user")
+        if not len(days):
+            return {}
+
+        # Daily totals per user: collapse (user, day) pairs, then sort by user
+        first_day = int(days.min())
+        n_days = int(days.max()) - first_day + 1
+        keys = codes.astype(np.int64) * n_days + (days - first_day)
+        pairs, inverse = np.unique(keys, return_inverse=True)
+        daily = np.bincount(inverse, weights=hours)
+        users = pairs // n_days
+
+        # pairs is sorted, so each user's days are one contiguous run
+        bounds = np.flatnonzero(np.diff(users)) + 1
+        starts = np.concatenate(([0], bounds))
+        ends = np.concatenate((bounds, [len(users)]))
+
+        q = np.asarray(percentiles, dtype=np.float64)
+        result = {}
+        for start, end in zip(starts, ends):
+            values = np.percentile(daily[start:end], q)
+            result[labels[users[start]]] = {float(p): float(v) for p, v in zip(q, values)}
+        return result
@@ -0,0 +1,202 @@
+"""
+bot/app/admin_flow.py - Admin analytics intents
+(admin_user_summary, admin_project_summary, admin_efficiency)
+"""
+
+import asyncio
+import logging
+import re
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import List, Tuple
+
+from bot.config import ADMIN_QUERY_BUDGET_MS
+from bot.db.users import is_admin
+from bot.db.analytics import (
+    find_user,
+    find_project,
+    user_weekly_summary,
+    project_weekly_summary,
+    efficiency_metrics,
+)
+
+logger = logging.getLogger(__name__)
+
+ADMIN_INTENTS = {"admin_user_summary", "admin_project_summary", "admin_efficiency"}
+
+# Default reporting window when the message names no period
+DEFAULT_WEEKS = 4
+
+# Where admin_user_summary questions name the user ("how much work did
+# john do", "hours for john", "john's summary", "user john")
+_NAME = r"([\w.@-]+)"
+_USER_PATTERNS = [
+    re.compile(rf"\b(?:did|has|have|does)\s+{_NAME}\s+(?:do|done|did|work|worked|log|logged|spend|spent|put)\b"),
+    re.compile(rf"\b(?:work|hours|summary|report|timesheet|performance)\s+(?:of|for|by|from)\s+{_NAME}"),
+    re.compile(rf"\b{_NAME}'s\b"),
+    re.compile(rf"\buser\s+{_NAME}"),
+]
+_NOT_NAMES = {"the", "a", "this", "last", "my", "me", "i", "you", "we", "team", "everyone", "all", "user", "users"}
+
+
+def _user_candidates(text: str) -> List[str]:
+    """Words in the positions an admin_user_summary question names its user"""
+    names = []
+    for pattern in _USER_PATTERNS:
+        for m in pattern.finditer(text):
+            name = m.group(1)
+            if name not in _NOT_NAMES and name not in names:
+                names.append(name)
+    return names
+
+
+def _parse_period(text: str, today: date) -> Tuple[date, date, str]:
+    """
+    Parse a reporting period from an admin question
+
+    Returns:
+        (start, end, label)
+    """
+    lower = text.lower()
+    monday = today - timedelta(days=today.weekday())
+    first_of_month = today.replace(day=1)
+
+    if "last month" in lower:
+        end = first_of_month - timedelta(days=1)
+        return end.replace(day=1), end, end.strftime("%B %Y")
+    if "this month" in lower:
+        return first_of_month, today, today.strftime("%B %Y")
+    if "last week" in lower:
+        return monday - timedelta(days=7), monday - timedelta(days=1), "last week"
+    if "this week" in lower:
+        return monday, today, "this week"
+    if "today" in lower:
+        return today, today, "today"
+    if "yesterday" in lower:
+        yesterday = today - timedelta(days=1)
+        return yesterday, yesterday, "yesterday"
+
+    match = re.search(r"last\s+(\d+)\s+(day|week|month)s?", lower)
+    if match:
+        n = int(match.group(1))
+        days = {"day": n, "week": 7 * n, "month": 30 * n}[match.group(2)]
+        return today - timedelta(days=days - 1), today, f"last {n} {match.group(2)}s"
+
+    return monday - timedelta(weeks=DEFAULT_WEEKS - 1), today, f"last {DEFAULT_WEEKS} weeks"
+
+
+def _fmt_hours(hours: float) -> str:
+    return f"{round(hours or 0, 1):g}h"
+
+
+async def handle_admin_query(user_id: int, intent: str, message: str) -> str:
+    """
+    Answer an admin analytics question within the latency budget
+
+    Args:
+        user_id: Database user ID of the asker
+        intent: One of ADMIN_INTENTS
+        message: User's message text
+
+    Returns:
+        Bot's reply message
+    """
+    if not await is_admin(user_id):
+        return "Sorry, team reports are only available to admins 🔒"
+
+    try:
+        return await asyncio.wait_for(
+            _answer(intent, message),
+            timeout=ADMIN_QUERY_BUDGET_MS / 1000,
+        )
+    except asyncio.TimeoutError:
+        logger.warning("Admin query over budget for user %s: intent=%s", user_id, intent)
+        return "That report is taking too long ⏳ Try a shorter period (e.g. 'this week')."
+    except Exception as e:
+        logger.error("Admin query failed for user %s: %s", user_id, e, exc_info=True)
+        return "Sorry, I couldn't build that report. Please try again."
+
+
+async def _answer(intent: str, message: str) -> str:
+    text = message.strip().lower()
+    start, end, label = _parse_period(text, datetime.now().date())
+
+    if intent == "admin_user_summary":
+        candidates = _user_candidates(text)
+        user = await find_user(candidates) if candidates else None
+        if not user:
+            return "Which user? Try e.g. 'how much work did adhish do last week'."
+
+        rows = await user_weekly_summary(user["user_id"], start, end)
+        name = user.get("display_name") or user["username"]
+        if not rows:
+            return f"{name} has no work logged for {label}."
+
+        weeks = OrderedDict()
+        for r in rows:
+            weeks.setdefault(r["week_start"], []).append(r)
+
+        lines = []
+        for week_start, week_rows in weeks.items():
+            total = sum(r["hours"] for r in week_rows)
+            projects = ", ".join(
+                f"{r['project'] or 'N/A'} {_fmt_hours(r['hours'])}" for r in week_rows
+            )
+            lines.append(f"Week of {week_start:%b %d}: {_fmt_hours(total)} ({projects})")
+
+        total = sum(r["hours"] for r in rows)
+        return (
+            f"📊 **{name}** — {label}\n\n" + "\n".join(lines)
+            + f"\n\nTotal: {_fmt_hours(total)}"
+        )
+
+    if intent == "admin_project_summary":
+        project = await find_project(text, start, end)
+        if not project:
+            return f"I couldn't find a project with work logged for {label} in that message."
+
+        rows = await project_weekly_summary(project, start, end)
+        weeks = OrderedDict()
+        for r in rows:
+            weeks.setdefault(r["week_start"], []).append(r)
+
+        lines = []
+        for week_start, week_rows in weeks.items():
+            total = sum(r["hours"] for r in week_rows)
+            top = ", ".join(
+                f"{r['username']} {_fmt_hours(r['hours'])}" for r in week_rows[:3]
+            )
+            lines.append(
+                f"Week of {week_start:%b %d}: {_fmt_hours(total)} by "
+                f"{len(week_rows)} people (top: {top})"
+            )
+
+        total = sum(r["hours"] for r in rows)
+        return (
+            f"📊 **{project}** — {label}\n\n" + "\n".join(lines)
+            + f"\n\nTotal: {_fmt_hours(total)}"
+        )
+
+    # admin_efficiency
+    metrics = await efficiency_metrics(start, end)
+    if not metrics["total_hours"]:
+        return f"No work logged for {label}."
+
+    total = metrics["total_hours"]
+    by_type = "\n".join(
+        f"• {r['task_type']}: {_fmt_hours(r['hours'])} ({r['hours'] / total:.0%})"
+        for r in metrics["task_types"]
+    )
+    possible_days = metrics["users_total"] * metrics["workdays"]
+    coverage = metrics["logged_days"] / possible_days if possible_days else 0
+    per_day = total / metrics["logged_days"] if metrics["logged_days"] else 0
+
+    return (
+        f"📈 **Team efficiency** — {label}\n\n"
+        f"Hours by task type:\n{by_type}\n\n"
+        f"Logging coverage: {coverage:.0%} of workdays "
+        f"({metrics['logged_days']}/{possible_days})\n"
+        f"Active users: {metrics['users_active']} of {metrics['users_total']}\n"
+        f"Avg hours per logged day: {_fmt_hours(per_day)}\n"
+        f"Total: {_fmt_hours(total)}"
+    )
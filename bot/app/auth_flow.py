@@ -117,7 +117,7 @@ async def handle_auth(external_id: str, message: str, session: dict) -> dict:
             return {"reply": reply_invite_invalid()}
         
         # Create user
-        user_id = await create_user(username, display_name, password)
+        user_id = await create_user(username, display_name, password, invite.get("role") or "user")
         await mark_used(invite_code, user_id)
         
         # Mark as authenticated
@@ -0,0 +1,148 @@
+"""
+bot/app/dedup.py - Inbound activity de-duplication
+
+Bot Framework retries a delivery when it does not get a timely 200. Each
+activity is claimed by (conversation id, activity id) before routing:
+
+    NEW        first delivery, process it
+    DUPLICATE  already answered; resend the stored reply instead of re-running
+    IN_FLIGHT  the original is still being processed; drop the retry
+
+The memory backend is per process; DEDUP_BACKEND=postgres shares claims
+through the inbound_activity table for multi-process deployments.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from bot.cache import TTLCache
+from bot.config import (
+    DEDUP_ENABLED,
+    DEDUP_BACKEND,
+    DEDUP_TTL,
+    DEDUP_CACHE_SIZE,
+    DEDUP_INFLIGHT_TIMEOUT,
+)
+from bot.db.inbound import claim_activity, complete_activity, release_activity, purge_activities
+
+logger = logging.getLogger(__name__)
+
+NEW = "new"
+DUPLICATE = "duplicate"
+IN_FLIGHT = "in_flight"
+
+# Postgres backend: delete expired rows at most this often
+PURGE_INTERVAL = 60
+
+# activity key -> stored reply (None while in flight)
+_memory = TTLCache(maxsize=DEDUP_CACHE_SIZE, ttl=DEDUP_TTL)
+_last_purge = 0.0
+
+_stats = {NEW: 0, DUPLICATE: 0, IN_FLIGHT: 0, "released": 0, "errors": 0}
+
+
+def activity_key(activity) -> Optional[str]:
+    """
+    De-duplication key of an inbound activity
+
+    Returns:
+        "<conversation id>:<activity id>", or None if the activity has no id
+    """
+    if not activity.id:
+        return None
+    conversation_id = activity.conversation.id if activity.conversation else ""
+    return f"{conversation_id}:{activity.id}"
+
+
+async def claim(key: Optional[str]) -> Tuple[str, Optional[str]]:
+    """
+    Claim an activity before processing it
+
+    Args:
+        key: From activity_key (None disables de-duplication for this activity)
+
+    Returns:
+        (outcome, reply): outcome is NEW, DUPLICATE or IN_FLIGHT; reply is
+        the stored reply for DUPLICATE
+    """
+    if not DEDUP_ENABLED or key is None:
+        return NEW, None
+
+    if DEDUP_BACKEND == "postgres":
+        try:
+            await _maybe_purge()
+            claimed, reply = await claim_activity(key, DEDUP_INFLIGHT_TIMEOUT, DEDUP_TTL)
+        except Exception as e:
+            # Never block a message because the dedup store is unavailable
+            _stats["errors"] += 1
+            logger.warning("Dedup claim failed for %s, processing anyway: %s", key, e)
+            return NEW, None
+        outcome = NEW if claimed else (IN_FLIGHT if reply is None else DUPLICATE)
+    else:
+        marker = object()
+        reply = _memory.get(key, marker)
+        if reply is marker:
+            _memory.set(key, None, expires_at=time.time() + DEDUP_INFLIGHT_TIMEOUT)
+            outcome, reply = NEW, None
+        else:
+            outcome = IN_FLIGHT if reply is None else DUPLICATE
+
+    _stats[outcome] += 1
+    if outcome != NEW:
+        logger.info("Duplicate delivery %s (%s)", key, outcome)
+    return outcome, reply
+
+
+async def complete(key: Optional[str], reply: str) -> None:
+    """Record the reply of a processed activity (for retries that arrive later)"""
+    if not DEDUP_ENABLED or key is None:
+        return
+
+    if DEDUP_BACKEND == "postgres":
+        try:
+            await complete_activity(key, reply)
+        except Exception as e:
+            _stats["errors"] += 1
+            logger.warning("Dedup complete failed for %s: %s", key, e)
+    else:
+        _memory.set(key, reply)
+
+
+async def release(key: Optional[str]) -> None:
+    """Drop the claim of a turn that failed, so the next retry is processed"""
+    if not DEDUP_ENABLED or key is None:
+        return
+
+    _stats["released"] += 1
+    if DEDUP_BACKEND == "postgres":
+        try:
+            await release_activity(key)
+        except Exception as e:
+            _stats["errors"] += 1
+            logger.warning("Dedup release failed for %s: %s", key, e)
+    else:
+        _memory.pop(key)
+
+
+async def _maybe_purge() -> None:
+    global _last_purge
+    now = time.time()
+    if now - _last_purge < PURGE_INTERVAL:
+        return
+    _last_purge = now
+    await purge_activities(max(DEDUP_TTL, DEDUP_INFLIGHT_TIMEOUT))
+
+
+def get_dedup_stats() -> Dict[str, Any]:
+    """
+    De-duplication counters
+
+    Returns:
+        Dict with backend, new/duplicate/in-flight outcome counts, released
+        claims, store errors and (memory backend) the store size
+    """
+    stats = {"backend": DEDUP_BACKEND if DEDUP_ENABLED else "disabled", **_stats}
+    if DEDUP_BACKEND != "postgres":
+        stats["size"] = len(_memory)
+    return stats
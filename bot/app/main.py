@@ -1,15 +1,51 @@
+import hmac
+import os
+import time
+from datetime import date
+from typing import Any, Dict, Optional
+
 from aiohttp import web
 from botbuilder.core import BotFrameworkAdapter, BotFrameworkAdapterSettings, TurnContext
-from botbuilder.schema import Activity
+from botbuilder.schema import Activity, ConversationReference
 
-from bot.config import BOT_APP_ID, BOT_APP_PASSWORD
-from bot.db.pool import init_pool
+from bot.config import BOT_APP_ID, BOT_APP_PASSWORD, EXPORT_API_TOKEN, ASYNC_TURNS_ENABLED
+from bot.db.pool import init_pool, get_pool_stats
+from bot.db.export import write_export, EXPORT_FORMATS
+from bot.hashing import shutdown_hashing_executor
 from bot.app.router import route_message
-from bot.logging import logger
+from bot.app.turn_queue import turn_queue, get_turn_queue_stats
+from bot.app.turn_lock import turn_locks, get_turn_lock_stats
+from bot.app.dedup import DUPLICATE, IN_FLIGHT, activity_key, claim, complete, release, get_dedup_stats
+from bot.logging import logger, setup_logging, get_logging_stats, user_text
+from bot.texts import reply_busy
+from bot.nlp.llm_backends import get_llm_backend_stats
+from bot import metrics, tracing
+from bot.metrics import STAGE_SECONDS, TURNS_REJECTED, timed_stage
 
 adapter_settings = BotFrameworkAdapterSettings(BOT_APP_ID, BOT_APP_PASSWORD)
 adapter = BotFrameworkAdapter(adapter_settings)
 
+_started_at = time.time()
+
+async def send_proactive(reference: ConversationReference, text: str):
+    """Send a reply outside the original request, from a stored conversation reference"""
+    async def send(turn_context: TurnContext):
+        with STAGE_SECONDS.time("send_activity"):
+            await turn_context.send_activity(text)
+
+    await adapter.continue_conversation(reference, send, BOT_APP_ID)
+
+@timed_stage("turn")
+async def process_turn(key: Optional[str], external_id: str, message: str) -> str:
+    """Route a message and record its reply against the activity key (see bot/app/dedup.py)"""
+    try:
+        res = await route_message(external_id, message)
+    except Exception:
+        await release(key)
+        raise
+    await complete(key, res["reply"])
+    return res["reply"]
+
 async def messages(req: web.Request) -> web.Response:
     body = await req.json()
     activity = Activity().deserialize(body)
@@ -24,21 +60,172 @@ async def messages(req: web.Request) -> web.Response:
         message = (turn_context.activity.text or "").strip()
         if not message:
             return
-        logger.info(f"Incoming: external_id={external_id}, message={message}")
-        res = await route_message(external_id, message)
-        await turn_context.send_activity(res["reply"])
+        with tracing.start_turn(
+            "activity",
+            channel=turn_context.activity.channel_id or "",
+            activity_id=turn_context.activity.id or "",
+        ):
+            logger.info("Incoming: external_id=%s, message=%s", external_id, user_text(message))
+
+            # Channel retries: resend the stored reply, or drop while the original runs
+            key = activity_key(turn_context.activity)
+            outcome, cached_reply = await claim(key)
+            if outcome == DUPLICATE:
+                with STAGE_SECONDS.time("send_activity"):
+                    await turn_context.send_activity(cached_reply)
+                return
+            if outcome == IN_FLIGHT:
+                return
+
+            if ASYNC_TURNS_ENABLED and turn_queue.running:
+                # Ack now, reply proactively once the turn has run
+                reference = TurnContext.get_conversation_reference(turn_context.activity)
+                parent = tracing.current_span()
+
+                async def run_turn():
+                    with tracing.resume(parent, "turn.async"):
+                        try:
+                            reply = await process_turn(key, external_id, message)
+                        except Exception as e:
+                            logger.error("Turn failed for %s: %s", external_id, e, exc_info=True)
+                            reply = "Sorry, something went wrong. Please try again."
+                        await send_proactive(reference, reply)
+
+                if turn_queue.submit(run_turn):
+                    return
+
+                # Shed load rather than run the turn on the request path;
+                # releasing the claim lets the user's resend go through
+                logger.warning("Turn queue full, rejecting turn for %s", external_id)
+                TURNS_REJECTED.inc()
+                await release(key)
+                with STAGE_SECONDS.time("send_activity"):
+                    await turn_context.send_activity(reply_busy())
+                return
+
+            reply = await process_turn(key, external_id, message)
+            with STAGE_SECONDS.time("send_activity"):
+                await turn_context.send_activity(reply)
 
     await adapter.process_activity(activity, auth_header, call_bot_logic)
     return web.Response(status=200)
 
+async def export_timesheets(req: web.Request) -> web.StreamResponse:
+    """
+    GET /api/export?format=csv|jsonl&user=&project=&from=YYYY-MM-DD&to=YYYY-MM-DD
+    Streams matching rows as a chunked response; needs EXPORT_API_TOKEN.
+    """
+    token = req.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+    if not EXPORT_API_TOKEN or not hmac.compare_digest(token, EXPORT_API_TOKEN):
+        return web.Response(status=401, text="Unauthorized")
+
+    fmt = req.query.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        return web.Response(status=400, text=f"format must be one of {EXPORT_FORMATS}")
+
+    try:
+        date_from = date.fromisoformat(req.query["from"]) if req.query.get("from") else None
+        date_to = date.fromisoformat(req.query["to"]) if req.query.get("to") else None
+    except ValueError:
+        return web.Response(status=400, text="from/to must be YYYY-MM-DD")
+
+    resp = web.StreamResponse(
+        headers={
+            "Content-Type": "text/csv" if fmt == "csv" else "application/x-ndjson",
+            "Content-Disposition": f'attachment; filename="timesheet.{fmt}"',
+        },
+    )
+    resp.enable_chunked_encoding()
+    await resp.prepare(req)
+
+    async def write(text: str):
+        await resp.write(text.encode("utf-8"))
+
+    count = await write_export(
+        write,
+        fmt,
+        user=req.query.get("user"),
+        project=req.query.get("project"),
+        date_from=date_from,
+        date_to=date_to,
+    )
+    logger.info("Export streamed %s rows (%s)", count, fmt)
+    await resp.write_eof()
+    return resp
+
+def health_report() -> Dict[str, Any]:
+    """Health of this process (one worker when run under bot/app/serve.py)"""
+    return {
+        "pid": os.getpid(),
+        "worker": os.getenv("SERVE_WORKER_SLOT"),
+        "uptime_s": round(time.time() - _started_at, 1),
+        "pool": get_pool_stats(),
+        "turn_queue": get_turn_queue_stats(),
+        "turn_locks": get_turn_lock_stats(),
+        "dedup": get_dedup_stats(),
+        "tracing": tracing.get_tracing_stats(),
+        "llm_backend": get_llm_backend_stats(),
+        "logging": get_logging_stats(),
+    }
+
+async def healthz(req: web.Request) -> web.Response:
+    return web.json_response(health_report())
+
+async def metrics_endpoint(req: web.Request) -> web.Response:
+    """GET /metrics - Prometheus text format"""
+    pool = get_pool_stats()
+    queue = get_turn_queue_stats()
+    locks = get_turn_lock_stats()
+
+    lines = [metrics.render()]
+    for name, help, value in (
+        ("timesheet_bot_db_pool_size", "Open pool connections", pool["size"]),
+        ("timesheet_bot_db_pool_in_use", "Pool connections checked out", pool["in_use"]),
+        ("timesheet_bot_turn_queue_depth", "Turns waiting for a worker", queue["queue_depth"]),
+        ("timesheet_bot_turn_lock_waiting", "Turns waiting behind the same user", locks["waiting"]),
+    ):
+        lines.append("\n".join(metrics.gauge_lines(name, help, value)) + "\n")
+
+    return web.Response(
+        text="".join(lines),
+        content_type="text/plain",
+        headers={"X-Content-Type-Options": "nosniff"},
+    )
+
 async def on_startup(app: web.Application):
+    # Idempotent; covers runners that import `app` without our entry points
+    setup_logging()
     logger.info("Starting bot app...")
     await init_pool()
 
+    if ASYNC_TURNS_ENABLED:
+        turn_queue.start()
+    tracing.exporter.start()
+
+    from bot.nlp.extract import load_extraction_cache
+    load_extraction_cache()
+
+    from bot.nlp.llm_client import load_llm_backend
+    await load_llm_backend()
+
+async def on_cleanup(app: web.Application):
+    await turn_queue.stop()
+    await turn_locks.close()
+    await tracing.exporter.stop()
+
+    from bot.nlp.extract import save_extraction_cache
+    save_extraction_cache()
+    shutdown_hashing_executor()
+
 app = web.Application()
 app.router.add_post("/api/messages", messages)
+app.router.add_get("/api/export", export_timesheets)
+app.router.add_get("/healthz", healthz)
+app.router.add_get("/metrics", metrics_endpoint)
 app.on_startup.append(on_startup)
+app.on_cleanup.append(on_cleanup)
 
 if __name__ == "__main__":
+    setup_logging()
     logger.info("Bot running at http://localhost:3978/api/messages")
     web.run_app(app, port=3978)
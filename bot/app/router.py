@@ -6,7 +6,15 @@ from bot.app.auth_flow import handle_auth
 from bot.app.timesheet_flow import (
     handle_new_timesheet_message,
     handle_followup,
+    is_correction_message,
 )
+from bot.app.summary_flow import handle_weekly_summary, handle_today_summary
+from bot.app.admin_flow import ADMIN_INTENTS, handle_admin_query
+from bot.app.turn_lock import turn_locks
+from bot import tracing
+from bot.logging import user_text
+from bot.metrics import TURNS
+from bot.nlp.intents import understand_turn
 
 logger = logging.getLogger(__name__)
 
@@ -15,36 +23,79 @@ async def route_message(external_id: str, message: str) -> Dict[str, Any]:
     """
     Route incoming message to appropriate handler.
 
+    Turns for the same external_id are serialized (see bot/app/turn_lock.py),
+    so each turn sees the session the previous one left behind.
+
     Returns:
         {"reply": "...", "user_id": Optional[int]}
     """
+    with tracing.span("route", external_id=external_id):
+        async with turn_locks.hold(external_id):
+            return await _route_message(external_id, message)
+
+
+async def _route_message(external_id: str, message: str) -> Dict[str, Any]:
     session = await get_or_create_session(external_id)
     state = session.get("state")
+    TURNS.labels(state or "NONE", session.get("pending_action") or "none").inc()
+
+    span = tracing.current_span()
+    if span:
+        span.set(state=state, pending_action=session.get("pending_action") or "")
 
     logger.info(
-        f"Routing message for {external_id}: state={state}, msg={message[:50]}"
+        "Routing message for %s: state=%s, msg=%s",
+        external_id, state, user_text(message, 50),
     )
 
     # If not authenticated, handle auth flow
     if state != "AUTHENTICATED":
         # FIX: pass session as 3rd arg
-        result = await handle_auth(external_id, message, session)
+        with tracing.span("flow.auth"):
+            result = await handle_auth(external_id, message, session)
         # handle_auth should always return at least {"reply": "..."}
         return result
 
     # User is authenticated
     user_id = session.get("user_id")
     if not user_id:
-        logger.error(f"Authenticated session without user_id: {external_id}")
+        logger.error("Authenticated session without user_id: %s", external_id)
         return {"reply": "Something went wrong. Please type 'hi' to restart."}
 
     pending_action = session.get("pending_action")
 
     if pending_action:
         # Follow-up to clarification
-        reply = await handle_followup(user_id, external_id, session, message)
+        with tracing.span("flow.followup", pending_action=pending_action):
+            reply = await handle_followup(user_id, external_id, session, message)
         return {"reply": reply, "user_id": user_id}
 
+    # Summaries and admin reports. The fast path and keyword rules decide
+    # first; otherwise one (batched) LLM call yields the intent and the
+    # entries, which are handed to the timesheet flow as they are
+    understanding = None
+    if not is_correction_message(message):
+        understanding = await understand_turn(message)
+        intent = understanding.intent
+
+        if intent == "weekly_summary":
+            with tracing.span("flow.weekly_summary"):
+                result = await handle_weekly_summary(user_id)
+            return {"reply": result["reply"], "user_id": user_id}
+
+        if intent == "daily_summary":
+            with tracing.span("flow.daily_summary"):
+                result = await handle_today_summary(user_id)
+            return {"reply": result["reply"], "user_id": user_id}
+
+        if intent in ADMIN_INTENTS:
+            with tracing.span("flow.admin", intent=intent):
+                reply = await handle_admin_query(user_id, intent, message)
+            return {"reply": reply, "user_id": user_id}
+
     # Fresh timesheet message
-    reply = await handle_new_timesheet_message(user_id, external_id, session, message)
+    with tracing.span("flow.timesheet"):
+        reply = await handle_new_timesheet_message(
+            user_id, external_id, session, message, understanding=understanding
+        )
     return {"reply": reply, "user_id": user_id}
@@ -0,0 +1,431 @@
+"""
+bot/app/serve.py - Multi-process supervisor for the bot app (Linux/Unix)
+
+Usage:
+    python -m bot.app.serve                    # one worker per CPU on SERVE_PORT
+    python -m bot.app.serve --workers 4
+    python -m bot.app.serve --reuse-port       # workers bind with SO_REUSEPORT
+
+The supervisor binds the listening socket once and starts N worker
+processes (`python -m bot.app.serve --worker`) that inherit it, so the
+kernel spreads connections across cores. With --reuse-port each worker
+binds its own socket instead.
+
+Each worker gets a share of DB_CONNECTION_BUDGET // (workers + 1)
+connections; the spare share covers the extra worker that exists while a
+rolling restart replaces one. With more than one worker, the share holds
+the worker's pool plus its advisory-lock connection.
+
+With more than one worker, state that is per process by default has to be
+shared or turned off: workers run with SESSION_CACHE_SIZE=0 (sessions are
+read from Postgres every turn) and TURN_LOCK_BACKEND=postgres (per-user
+advisory lock), and the supervisor refuses to start unless
+DEDUP_BACKEND=postgres (or DEDUP_ENABLED=false).
+
+Signals:
+    SIGHUP          rolling restart: start a replacement, wait until it is
+                    ready, then stop the old worker gracefully, one at a time
+    SIGTERM/SIGINT  stop all workers gracefully and exit
+
+Workers report readiness and a heartbeat (their /healthz payload) over a
+pipe. A worker that exits is restarted (with backoff if it keeps crashing);
+one that misses heartbeats is replaced. SERVE_STATUS_PATH, if set, receives
+the latest per-worker health as JSON.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict, Optional
+
+from bot.config import (
+    SERVE_HOST,
+    SERVE_PORT,
+    SERVE_WORKERS,
+    SERVE_HEARTBEAT_INTERVAL,
+    SERVE_SHUTDOWN_TIMEOUT,
+    SERVE_STATUS_PATH,
+    DB_CONNECTION_BUDGET,
+    DB_POOL_MIN_SIZE,
+    DEDUP_ENABLED,
+    DEDUP_BACKEND,
+)
+
+logger = logging.getLogger(__name__)
+
+# Seconds a new worker may take to open its pool and start serving
+READY_TIMEOUT = 60
+
+# Heartbeats a worker may miss before it is replaced
+MISSED_HEARTBEATS = 3
+
+# Restart backoff for workers that crash right after starting
+MAX_BACKOFF = 30
+
+
+def pool_size_per_worker(workers: int, budget: int = DB_CONNECTION_BUDGET) -> int:
+    """
+    Max pool size for each worker so all connections (plus one spare
+    worker's share) fit the budget
+
+    With several workers each also holds one advisory-lock connection
+    outside its pool (see multi_worker_env), which comes out of its share.
+    """
+    share = budget // (workers + 1)
+    if workers > 1:
+        share -= 1
+    return max(1, share)
+
+
+def multi_worker_env(workers: int) -> Dict[str, str]:
+    """
+    Environment overrides that make `workers` processes safe to run together
+
+    Args:
+        workers: Number of worker processes
+
+    Returns:
+        Variables to set for every worker (empty for a single worker)
+
+    Raises:
+        ValueError: If the configuration keeps state that cannot be shared
+    """
+    if workers <= 1:
+        return {}
+    if DEDUP_ENABLED and DEDUP_BACKEND != "postgres":
+        raise ValueError(
+            f"--workers {workers} needs DEDUP_BACKEND=postgres (got {DEDUP_BACKEND!r}): "
+            "a retry can reach a different worker than the original delivery"
+        )
+    return {
+        # A cached session would go stale when another worker updates it
+        "SESSION_CACHE_SIZE": "0",
+        # In-process locks cannot serialize a user's turns across workers
+        "TURN_LOCK_BACKEND": "postgres",
+    }
+
+
+class Worker:
+    """One worker process and what it last reported"""
+
+    def __init__(self, slot: int, proc: asyncio.subprocess.Process):
+        self.slot = slot
+        self.proc = proc
+        self.started_at = time.time()
+        self.ready = asyncio.Event()
+        self.last_heartbeat = time.time()
+        self.health: Dict = {}
+        self.stopping = False
+
+    @property
+    def pid(self) -> int:
+        return self.proc.pid
+
+
+class Supervisor:
+    def __init__(self, workers: int, host: str, port: int, reuse_port: bool):
+        self.n_workers = workers
+        self.host = host
+        self.port = port
+        self.reuse_port = reuse_port
+        self.pool_size = pool_size_per_worker(workers)
+        self.sock: Optional[socket.socket] = None
+        self.workers: Dict[int, Worker] = {}
+        self.crashes: Dict[int, int] = {}
+        self.stopping = False
+        self.restarting = False
+        self._done = asyncio.Event()
+
+    def _bind(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(1024)
+        sock.set_inheritable(True)
+        return sock
+
+    async def run(self) -> None:
+        if not self.reuse_port:
+            self.sock = self._bind()
+
+        logger.info(
+            "Starting %s workers on %s:%s (pool max %s each, budget %s)",
+            self.n_workers, self.host, self.port, self.pool_size, DB_CONNECTION_BUDGET,
+        )
+
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGHUP, lambda: asyncio.ensure_future(self.rolling_restart()))
+        loop.add_signal_handler(signal.SIGTERM, lambda: asyncio.ensure_future(self.stop()))
+        loop.add_signal_handler(signal.SIGINT, lambda: asyncio.ensure_future(self.stop()))
+
+        for slot in range(self.n_workers):
+            await self.spawn(slot)
+
+        watchdog = asyncio.create_task(self._watchdog())
+        await self._done.wait()
+        watchdog.cancel()
+
+        if self.sock:
+            self.sock.close()
+
+    async def spawn(self, slot: int) -> Worker:
+        """Start a worker process for `slot` (does not wait for readiness)"""
+        status_read, status_write = os.pipe()
+
+        env = dict(
+            os.environ,
+            SERVE_WORKER_SLOT=str(slot),
+            SERVE_STATUS_FD=str(status_write),
+            DB_POOL_MAX_SIZE=str(self.pool_size),
+            DB_POOL_MIN_SIZE=str(min(DB_POOL_MIN_SIZE, self.pool_size)),
+            **multi_worker_env(self.n_workers),
+        )
+        pass_fds = [status_write]
+        if self.sock:
+            env["SERVE_LISTEN_FD"] = str(self.sock.fileno())
+            pass_fds.append(self.sock.fileno())
+        else:
+            env["SERVE_REUSE_PORT"] = f"{self.host}:{self.port}"
+
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "bot.app.serve", "--worker",
+            env=env,
+            pass_fds=pass_fds,
+        )
+        os.close(status_write)
+
+        worker = Worker(slot, proc)
+        current = self.workers.get(slot)
+        if current is None or current.proc.returncode is not None:
+            # Otherwise this is a replacement; _replace swaps it in once ready
+            self.workers[slot] = worker
+
+        asyncio.create_task(self._read_status(worker, status_read))
+        asyncio.create_task(self._wait_exit(worker))
+        logger.info("Worker %s started (pid %s)", slot, proc.pid)
+        return worker
+
+    async def _read_status(self, worker: Worker, fd: int) -> None:
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader),
+            os.fdopen(fd, "rb"),
+        )
+
+        async for line in reader:
+            try:
+                msg = json.loads(line)
+            except ValueError:
+                continue
+
+            worker.last_heartbeat = time.time()
+            if msg.get("type") == "ready":
+                worker.ready.set()
+                self.crashes[worker.slot] = 0
+                logger.info("Worker %s ready (pid %s)", worker.slot, worker.pid)
+            elif msg.get("type") == "heartbeat":
+                worker.health = msg.get("health", {})
+                self._write_status()
+
+    async def _wait_exit(self, worker: Worker) -> None:
+        code = await worker.proc.wait()
+
+        if worker.stopping or self.stopping:
+            logger.info("Worker %s (pid %s) exited with %s", worker.slot, worker.pid, code)
+            return
+        if self.workers.get(worker.slot) is not worker:
+            return
+
+        crashes = self.crashes.get(worker.slot, 0) + 1
+        self.crashes[worker.slot] = crashes
+        backoff = min(2 ** (crashes - 1), MAX_BACKOFF)
+        logger.error(
+            "Worker %s (pid %s) died with %s, restarting in %ss",
+            worker.slot, worker.pid, code, backoff,
+        )
+        await asyncio.sleep(backoff)
+        if not self.stopping:
+            await self.spawn(worker.slot)
+
+    async def _stop_worker(self, worker: Worker) -> None:
+        """SIGTERM, wait for the graceful shutdown, then SIGKILL"""
+        worker.stopping = True
+        if worker.proc.returncode is not None:
+            return
+        worker.proc.send_signal(signal.SIGTERM)
+        try:
+            await asyncio.wait_for(worker.proc.wait(), timeout=SERVE_SHUTDOWN_TIMEOUT + 5)
+        except asyncio.TimeoutError:
+            logger.warning("Worker %s (pid %s) did not stop, killing", worker.slot, worker.pid)
+            worker.proc.kill()
+            await worker.proc.wait()
+
+    async def _replace(self, slot: int) -> bool:
+        """Start a new worker for `slot`, and once it is ready stop the old one"""
+        old = self.workers.get(slot)
+        new = await self.spawn(slot)
+
+        # Ready, died, or timed out - whichever comes first
+        waiters = [asyncio.ensure_future(new.ready.wait()), asyncio.ensure_future(new.proc.wait())]
+        await asyncio.wait(waiters, timeout=READY_TIMEOUT, return_when=asyncio.FIRST_COMPLETED)
+        for waiter in waiters:
+            waiter.cancel()
+
+        if new.proc.returncode is not None or not new.ready.is_set():
+            logger.error("Replacement for worker %s did not become ready, keeping the old one", slot)
+            await self._stop_worker(new)
+            return False
+
+        self.workers[slot] = new
+        if old is not None:
+            await self._stop_worker(old)
+        return True
+
+    async def rolling_restart(self) -> None:
+        if self.restarting or self.stopping:
+            return
+        self.restarting = True
+        logger.info("Rolling restart...")
+        try:
+            for slot in sorted(self.workers):
+                if not await self._replace(slot):
+                    logger.error("Rolling restart aborted")
+                    return
+            logger.info("Rolling restart complete")
+        finally:
+            self.restarting = False
+
+    async def stop(self) -> None:
+        if self.stopping:
+            return
+        self.stopping = True
+        logger.info("Stopping workers...")
+        await asyncio.gather(*(self._stop_worker(w) for w in list(self.workers.values())))
+        self._done.set()
+
+    async def _watchdog(self) -> None:
+        """Replace ready workers that stopped sending heartbeats"""
+        while True:
+            await asyncio.sleep(SERVE_HEARTBEAT_INTERVAL)
+            if self.restarting:
+                continue
+
+            deadline = time.time() - MISSED_HEARTBEATS * SERVE_HEARTBEAT_INTERVAL
+            for slot, worker in list(self.workers.items()):
+                if worker.ready.is_set() and worker.proc.returncode is None and worker.last_heartbeat < deadline:
+                    logger.error("Worker %s (pid %s) missed heartbeats, replacing", slot, worker.pid)
+                    await self._replace(slot)
+
+    def _write_status(self) -> None:
+        if not SERVE_STATUS_PATH:
+            return
+
+        status = {
+            "supervisor_pid": os.getpid(),
+            "updated_at": time.time(),
+            "workers": [
+                {
+                    "slot": w.slot,
+                    "pid": w.pid,
+                    "ready": w.ready.is_set(),
+                    "last_heartbeat": w.last_heartbeat,
+                    "restarts": self.crashes.get(w.slot, 0),
+                    "health": w.health,
+                }
+                for w in self.workers.values()
+            ],
+        }
+        tmp = SERVE_STATUS_PATH + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(status, f, default=str)
+        os.replace(tmp, SERVE_STATUS_PATH)
+
+
+# ----------------------------------------------------------------------
+# Worker side
+# ----------------------------------------------------------------------
+
+def _send_status(fd: int, msg: dict) -> None:
+    # One short line per write stays below PIPE_BUF, so writes are atomic
+    try:
+        os.write(fd, (json.dumps(msg, default=str) + "\n").encode())
+    except OSError:
+        pass
+
+
+def run_worker() -> None:
+    """Run the bot app on the inherited (or SO_REUSEPORT) socket"""
+    from aiohttp import web
+    from bot.app.main import app, health_report
+    from bot.logging import setup_logging
+
+    setup_logging()
+
+    status_fd = int(os.environ["SERVE_STATUS_FD"])
+
+    async def report_ready(app: web.Application):
+        _send_status(status_fd, {"type": "ready", "pid": os.getpid()})
+
+        async def heartbeat():
+            while True:
+                _send_status(status_fd, {"type": "heartbeat", "health": health_report()})
+                await asyncio.sleep(SERVE_HEARTBEAT_INTERVAL)
+
+        app["heartbeat"] = asyncio.create_task(heartbeat())
+
+    async def stop_heartbeat(app: web.Application):
+        task = app.get("heartbeat")
+        if task:
+            task.cancel()
+
+    # Runs after the other startup hooks (pool, caches), so "ready" means ready
+    app.on_startup.append(report_ready)
+    app.on_shutdown.append(stop_heartbeat)
+
+    if os.getenv("SERVE_LISTEN_FD"):
+        sock = socket.socket(fileno=int(os.environ["SERVE_LISTEN_FD"]))
+        web.run_app(app, sock=sock, shutdown_timeout=SERVE_SHUTDOWN_TIMEOUT, print=None)
+    else:
+        host, port = os.environ["SERVE_REUSE_PORT"].rsplit(":", 1)
+        web.run_app(
+            app,
+            host=host,
+            port=int(port),
+            reuse_port=True,
+            shutdown_timeout=SERVE_SHUTDOWN_TIMEOUT,
+            print=None,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the bot with multiple worker processes")
+    parser.add_argument("--workers", type=int, default=SERVE_WORKERS or os.cpu_count() or 1)
+    parser.add_argument("--host", default=SERVE_HOST)
+    parser.add_argument("--port", type=int, default=SERVE_PORT)
+    parser.add_argument("--reuse-port", action="store_true", help="workers bind with SO_REUSEPORT")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker()
+        return
+
+    try:
+        multi_worker_env(args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+
+    logging.basicConfig(level=logging.INFO)
+    supervisor = Supervisor(args.workers, args.host, args.port, args.reuse_port)
+    asyncio.run(supervisor.run())
+
+
+if __name__ == "__main__":
+    main()
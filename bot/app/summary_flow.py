@@ -6,10 +6,10 @@ async def handle_weekly_summary(user_id: int):
         return {"reply": "No work logged this week."}
 
     lines = [
-        f"{r['entry_date']}: {r['project']} – {r['task']} – {r['hours']}h"
+        f"{r['entry_date']}: {r['project'] or 'N/A'} – {r['task_type'] or 'Unknown'} – {round(r['hours'], 2)}h"
         for r in rows
     ]
-    total = sum(r['hours'] for r in rows)
+    total = round(rows[0]['total_hours'], 2)
     return {"reply": f"Weekly Summary:\n" + "\n".join(lines) + f"\n\nTotal: {total} hours"}
 
 
@@ -19,8 +19,8 @@ async def handle_today_summary(user_id: int):
         return {"reply": "No work logged today."}
 
     lines = [
-        f"{r['project']} – {r['task']} – {r['hours']}h"
+        f"{r['project'] or 'N/A'} – {r['task_type'] or 'Unknown'} – {round(r['hours'], 2)}h"
         for r in rows
     ]
-    total = sum(r['hours'] for r in rows)
+    total = round(rows[0]['total_hours'], 2)
     return {"reply": f"Today's Summary:\n" + "\n".join(lines) + f"\n\nTotal: {total} hours"}
@@ -9,6 +9,7 @@ Features:
 - Type safety
 """
 
+import copy
 import json
 import re
 import logging
@@ -17,7 +18,7 @@ from typing import Optional, Dict, List
 
 from bot.db.sessions import update_session
 from bot.db.timesheet import (
-    save_timesheet_entry,
+    save_timesheet_entries,
     get_last_entry,
     get_last_project,
     update_last_entry_hours,
@@ -32,20 +33,12 @@ from bot.texts import (
     reply_need_task_description,
     reply_confirm_last_project,
 )
+from bot.nlp.task_types import normalize_task_type
+from bot.nlp.fastpath import register_known_projects
+from bot.logging import user_text
 
 logger = logging.getLogger(__name__)
 
-# Valid task types for normalization
-VALID_TASK_TYPES = {
-    "development", "dev", "coding", "programming",
-    "testing", "test", "qa", "quality assurance",
-    "debugging", "debug", "bugfix", "bug fixing",
-    "meeting", "discussion", "call",
-    "research", "investigation", "analysis",
-    "documentation", "docs", "writing",
-    "devops", "deployment", "ci/cd", "pipeline"
-}
-
 
 def _normalize_task_type(task_type: str) -> str:
     """
@@ -57,27 +50,7 @@ def _normalize_task_type(task_type: str) -> str:
     Returns:
         Normalized task type (e.g., "Testing", "Development")
     """
-    if not task_type:
-        return "Unknown"
-    
-    lower = task_type.lower().strip()
-    
-    # Map variations to standard types
-    mapping = {
-        "development": ["development", "dev", "coding", "programming"],
-        "testing": ["testing", "test", "qa", "quality assurance"],
-        "debugging": ["debugging", "debug", "bugfix", "bug fixing"],
-        "meeting": ["meeting", "discussion", "call"],
-        "research": ["research", "investigation", "analysis"],
-        "documentation": ["documentation", "docs", "writing"],
-        "devops": ["devops", "deployment", "ci/cd", "pipeline"]
-    }
-    
-    for standard, variations in mapping.items():
-        if lower in variations:
-            return standard.capitalize()
-    
-    return task_type.capitalize()
+    return normalize_task_type(task_type)
 
 
 def _extract_project_name(text: str) -> str:
@@ -150,7 +123,7 @@ def _deserialize_entries(entries_json: str) -> List[dict]:
                 entry["date"] = datetime.fromisoformat(entry["date"]).date()
         return entries
     except (json.JSONDecodeError, ValueError) as e:
-        logger.error(f"Failed to deserialize entries: {e}")
+        logger.error("Failed to deserialize entries: %s", e)
         return []
 
 
@@ -159,6 +132,7 @@ async def handle_new_timesheet_message(
     external_id: str,
     session: dict,
     message: str,
+    understanding=None,
 ) -> str:
     """
     Handle new timesheet message with full validation and confirmation
@@ -168,32 +142,38 @@ async def handle_new_timesheet_message(
         external_id: Teams/external user ID
         session: Current session state
         message: User's message text
+        understanding: TurnUnderstanding the router already got for this
+            message; its entries are used instead of extracting again
     
     Returns:
         Bot's reply message
     """
     text = message.strip()
-    lower = text.lower()
     
-    logger.info(f"Processing timesheet message for user {user_id}: {text[:100]}")
+    logger.info("Processing timesheet message for user %s: %s", user_id, user_text(text))
     
     # === CORRECTION HANDLING ===
-    if lower.startswith("update last") or lower.startswith("correct last"):
+    if is_correction_message(text):
         return await _handle_correction(user_id, text)
     
     # === NEW TIMESHEET ENTRY ===
-    try:
-        from bot.nlp.extract import extract_timesheet_entries
-        extracted = await extract_timesheet_entries(text)
-    except Exception as e:
-        logger.error(f"Extraction failed for user {user_id}: {e}", exc_info=True)
-        return "Sorry, I had trouble understanding that. Could you try again? 🙏"
+    if understanding is not None:
+        if understanding.failed:
+            return "Sorry, I had trouble understanding that. Could you try again? 🙏"
+        extracted = copy.deepcopy(understanding.entries)
+    else:
+        try:
+            from bot.nlp.extract import extract_timesheet_entries
+            extracted = await extract_timesheet_entries(text)
+        except Exception as e:
+            logger.error("Extraction failed for user %s: %s", user_id, e, exc_info=True)
+            return "Sorry, I had trouble understanding that. Could you try again? 🙏"
     
     # Filter valid entries
     entries = [e for e in extracted if e.get("hours", 0) > 0]
     
     if not entries:
-        logger.warning(f"No valid entries extracted for user {user_id}")
+        logger.warning("No valid entries extracted for user %s", user_id)
         return reply_need_hours()
     
     # Normalize task types
@@ -201,7 +181,8 @@ async def handle_new_timesheet_message(
         if "task_type" in e:
             e["task_type"] = _normalize_task_type(e["task_type"])
     
-    logger.debug(f"Extracted {len(entries)} entries: {entries}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Extracted %s entries: %s", len(entries), user_text(entries, 500))
     
     # === VALIDATION PIPELINE ===
     
@@ -292,26 +273,25 @@ async def handle_followup(
     
     entries = _deserialize_entries(pending_json)
     if not entries:
-        logger.error(f"Failed to deserialize entries for user {user_id}")
+        logger.error("Failed to deserialize entries for user %s", user_id)
         await update_session(external_id, pending_action=None, pending_entries=None)
         return "Something went wrong. Please try again."
     
     text = message.strip()
     lower = text.lower()
     
-    logger.info(f"Handling followup for user {user_id}: action={action}, message={text[:50]}")
+    logger.info("Handling followup for user %s: action=%s, message=%s", user_id, action, user_text(text, 50))
     
     # === CONFIRM SAVE ===
     if action == "CONFIRM_SAVE":
         if lower in {"y", "yes", "yeah", "yup", "ok", "okay", "sure", "correct"}:
             # Save to database
             try:
-                await _save_entries(user_id, entries, "confirmed")
-                await update_session(external_id, pending_action=None, pending_entries=None)
-                logger.info(f"Saved {len(entries)} entries for user {user_id}")
+                await _save_entries(user_id, entries, "confirmed", external_id)
+                logger.info("Saved %s entries for user %s", len(entries), user_id)
                 return reply_saved(len(entries))
             except Exception as e:
-                logger.error(f"Failed to save entries for user {user_id}: {e}", exc_info=True)
+                logger.error("Failed to save entries for user %s: %s", user_id, e, exc_info=True)
                 return "Sorry, there was an error saving your entry. Please try again."
         
         elif lower in {"n", "no", "nope", "cancel"}:
@@ -575,7 +555,7 @@ async def handle_followup(
         return f"📋 **Confirm:**\n\n{summary}\n\nType **'yes'** to save or **'edit'** to change."
     
     # Fallback
-    logger.warning(f"Unhandled action {action} for user {user_id}")
+    logger.warning("Unhandled action %s for user %s", action, user_id)
     await update_session(external_id, pending_action=None, pending_entries=None)
     return await handle_new_timesheet_message(user_id, external_id, session, message)
 
@@ -596,16 +576,22 @@ async def _handle_correction(user_id: int, message: str) -> str:
         if not success:
             return reply_correction_no_entry()
         
-        logger.info(f"Updated last entry to {new_hours}h for user {user_id}")
+        logger.info("Updated last entry to %sh for user %s", new_hours, user_id)
         return reply_correction_success(new_hours)
     
     except Exception as e:
-        logger.error(f"Correction failed for user {user_id}: {e}", exc_info=True)
+        logger.error("Correction failed for user %s: %s", user_id, e, exc_info=True)
         return "Sorry, I couldn't update that entry. Please try again."
 
 
 # === HELPER FUNCTIONS ===
 
+def is_correction_message(text: str) -> bool:
+    """Check if message is an 'update last ...' / 'correct last ...' correction"""
+    lower = text.strip().lower()
+    return lower.startswith("update last") or lower.startswith("correct last")
+
+
 def _all_have_field(entries: List[dict], field: str) -> bool:
     """Check if all entries have a non-empty field"""
     return all(e.get(field) and str(e.get(field)).strip() for e in entries)
@@ -620,29 +606,34 @@ def _all_have_valid_task_type(entries: List[dict]) -> bool:
     return True
 
 
-async def _save_entries(user_id: int, entries: List[dict], raw_msg: str) -> None:
+async def _save_entries(
+    user_id: int,
+    entries: List[dict],
+    raw_msg: str,
+    external_id: Optional[str] = None,
+) -> None:
     """
-    Save all entries to database with error handling
+    Save all entries to database in one transaction
     
     Args:
         user_id: Database user ID
         entries: List of entry dicts
         raw_msg: Original message or "confirmed"
+        external_id: Session whose pending entries are cleared with the save
     
     Raises:
-        Exception: If save fails
+        Exception: If save fails (nothing is saved)
     """
-    for entry in entries:
-        try:
-            await save_timesheet_entry(
-                user_id=user_id,
-                entry_date=entry.get("date"),
-                project=entry.get("project", ""),
-                task=entry.get("task", ""),
-                hours=entry.get("hours"),
-                task_type=entry.get("task_type", "Unknown"),
-                raw_msg=raw_msg,
-            )
-        except Exception as e:
-            logger.error(f"Failed to save entry for user {user_id}: {entry}, error: {e}", exc_info=True)
-            raise
+    try:
+        await save_timesheet_entries(
+            user_id=user_id,
+            entries=entries,
+            raw_msg=raw_msg,
+            clear_session=external_id,
+        )
+    except Exception as e:
+        logger.error("Failed to save entries for user %s: %s, error: %s", user_id, user_text(entries, 500), e, exc_info=True)
+        raise
+    
+    # Confirmed projects become known to the fast-path parser
+    register_known_projects(e.get("project", "") for e in entries)
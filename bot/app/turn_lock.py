@@ -0,0 +1,155 @@
+"""
+bot/app/turn_lock.py - Per-user turn serialization
+
+Turns for the same external_id run one at a time (in arrival order), so a
+double-send or a channel retry cannot interleave with the turn already
+reading and writing that user's session. Different users never wait on
+each other.
+
+A key's lock only exists while a turn holds or waits for it, so memory is
+bounded by the number of users with a turn in flight.
+
+The in-process lock only covers one process. With TURN_LOCK_BACKEND=postgres
+(set by bot/app/serve.py for multi-worker runs) the holder of the local
+lock also takes a Postgres advisory lock on the key, so turns for one user
+are serialized across workers too.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from bot.config import TURN_LOCK_BACKEND
+from bot.db.advisory import AdvisoryLocks
+
+logger = logging.getLogger(__name__)
+
+# Log turns that waited longer than this behind an earlier turn for the same user
+SLOW_WAIT_MS = 1000
+
+
+class _Entry:
+    __slots__ = ("lock", "refs")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.refs = 0
+
+
+class KeyedLock:
+    """
+    asyncio.Lock per key, created on demand and dropped when idle
+
+    Args:
+        shared: Cross-process locks taken while the local lock is held
+    """
+
+    def __init__(self, shared: Optional[AdvisoryLocks] = None):
+        self.shared = shared
+        self._entries: Dict[str, _Entry] = {}
+        self._stats = {
+            "acquired": 0,
+            "contended": 0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+            "max_waiters": 0,
+            "max_keys": 0,
+        }
+
+    @asynccontextmanager
+    async def hold(self, key: str) -> AsyncIterator[None]:
+        """
+        Hold the lock for `key` for the duration of the block
+
+        Args:
+            key: Serialization key (external_id)
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _Entry()
+            self._stats["max_keys"] = max(self._stats["max_keys"], len(self._entries))
+
+        entry.refs += 1
+        contended = entry.lock.locked()
+        if contended:
+            self._stats["contended"] += 1
+            self._stats["max_waiters"] = max(self._stats["max_waiters"], entry.refs - 1)
+
+        started = time.perf_counter()
+        try:
+            await entry.lock.acquire()
+        except BaseException:
+            self._release_ref(key, entry)
+            raise
+
+        if self.shared is not None:
+            try:
+                await self.shared.acquire(key)
+            except BaseException:
+                entry.lock.release()
+                self._release_ref(key, entry)
+                raise
+
+        waited_ms = (time.perf_counter() - started) * 1000
+        self._stats["acquired"] += 1
+        self._stats["total_wait_ms"] += waited_ms
+        self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], waited_ms)
+        if waited_ms > SLOW_WAIT_MS:
+            logger.warning("Turn for %s waited %.0fms behind an earlier turn", key, waited_ms)
+
+        try:
+            yield
+        finally:
+            try:
+                if self.shared is not None:
+                    await self.shared.release(key)
+            finally:
+                entry.lock.release()
+                self._release_ref(key, entry)
+
+    def _release_ref(self, key: str, entry: _Entry) -> None:
+        entry.refs -= 1
+        if entry.refs == 0 and self._entries.get(key) is entry:
+            del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Lock counters
+
+        Returns:
+            Dict with active keys, turns waiting now, acquisitions, how many
+            had to queue, and average/max queue wait in ms
+        """
+        acquired = self._stats["acquired"]
+        return {
+            "backend": "postgres" if self.shared is not None else "memory",
+            "active_keys": len(self._entries),
+            "waiting": sum(e.refs - 1 for e in self._entries.values() if e.lock.locked()),
+            "acquired": acquired,
+            "contended": self._stats["contended"],
+            "avg_wait_ms": self._stats["total_wait_ms"] / acquired if acquired else 0.0,
+            "max_wait_ms": self._stats["max_wait_ms"],
+            "max_waiters": self._stats["max_waiters"],
+            "max_keys": self._stats["max_keys"],
+            **({"shared_polls": self.shared.polls} if self.shared is not None else {}),
+        }
+
+    async def close(self) -> None:
+        """Close the cross-process lock connection, if any"""
+        if self.shared is not None:
+            await self.shared.close()
+
+
+if TURN_LOCK_BACKEND == "postgres":
+    turn_locks = KeyedLock(shared=AdvisoryLocks("turn_lock"))
+elif TURN_LOCK_BACKEND == "memory":
+    turn_locks = KeyedLock()
+else:
+    raise ValueError(f"TURN_LOCK_BACKEND must be memory or postgres, got {TURN_LOCK_BACKEND!r}")
+
+
+def get_turn_lock_stats() -> Dict[str, Any]:
+    """Queue-wait metrics of the per-user turn lock"""
+    return turn_locks.stats()
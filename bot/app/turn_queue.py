@@ -0,0 +1,148 @@
+"""
+bot/app/turn_queue.py - Bounded in-process worker pool for asynchronous turns
+
+The messages handler enqueues a turn and returns 200 right away; a worker
+runs the pipeline and replies proactively. The queue is bounded: when it
+is full, submit() refuses the job and the caller answers with a short
+"busy, try again" reply instead of growing memory without limit or
+running the turn on the request path.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from bot.config import TURN_WORKERS, TURN_QUEUE_SIZE
+
+logger = logging.getLogger(__name__)
+
+Job = Callable[[], Awaitable[None]]
+
+
+class TurnQueue:
+    """Fixed number of worker tasks draining a bounded asyncio.Queue"""
+
+    def __init__(self, workers: int = TURN_WORKERS, maxsize: int = TURN_QUEUE_SIZE):
+        self.workers = workers
+        self.maxsize = maxsize
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._busy = 0
+        self._stats = {
+            "submitted": 0,
+            "rejected": 0,
+            "completed": 0,
+            "failed": 0,
+            "max_depth": 0,
+            "total_wait_ms": 0.0,
+            "total_run_ms": 0.0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """Start the workers (call from the running event loop)"""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"turn-worker-{i}")
+            for i in range(self.workers)
+        ]
+        logger.info("Turn queue started: %s workers, queue size %s", self.workers, self.maxsize)
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """
+        Let queued turns finish (up to `timeout` seconds), then stop the workers
+
+        Args:
+            timeout: Seconds to wait for the queue to drain
+        """
+        if not self._tasks:
+            return
+
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Turn queue stopped with %s turns unprocessed", self._queue.qsize())
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, job: Job) -> bool:
+        """
+        Enqueue a turn without waiting
+
+        Args:
+            job: Coroutine function running the whole turn, reply included
+
+        Returns:
+            False if the pool is not running or the queue is full
+        """
+        if not self._tasks:
+            return False
+
+        try:
+            self._queue.put_nowait((time.perf_counter(), job))
+        except asyncio.QueueFull:
+            self._stats["rejected"] += 1
+            return False
+
+        self._stats["submitted"] += 1
+        self._stats["max_depth"] = max(self._stats["max_depth"], self._queue.qsize())
+        return True
+
+    async def _worker(self) -> None:
+        while True:
+            enqueued, job = await self._queue.get()
+            started = time.perf_counter()
+            self._busy += 1
+            try:
+                await job()
+                self._stats["completed"] += 1
+            except Exception as e:
+                self._stats["failed"] += 1
+                logger.error("Queued turn failed: %s", e, exc_info=True)
+            finally:
+                finished = time.perf_counter()
+                self._busy -= 1
+                self._stats["total_wait_ms"] += (started - enqueued) * 1000
+                self._stats["total_run_ms"] += (finished - started) * 1000
+                self._queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Worker pool counters
+
+        Returns:
+            Dict with workers, busy workers, current/peak queue depth,
+            submitted/rejected/completed/failed turns and average
+            queue-wait and run times in ms
+        """
+        done = self._stats["completed"] + self._stats["failed"]
+        return {
+            "workers": self.workers,
+            "busy": self._busy,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_size": self.maxsize,
+            "max_depth": self._stats["max_depth"],
+            "submitted": self._stats["submitted"],
+            "rejected": self._stats["rejected"],
+            "completed": self._stats["completed"],
+            "failed": self._stats["failed"],
+            "avg_wait_ms": self._stats["total_wait_ms"] / done if done else 0.0,
+            "avg_run_ms": self._stats["total_run_ms"] / done if done else 0.0,
+        }
+
+
+turn_queue = TurnQueue()
+
+
+def get_turn_queue_stats() -> Dict[str, Any]:
+    """Counters of the asynchronous turn worker pool"""
+    return turn_queue.stats()
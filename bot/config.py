@@ -12,5 +12,110 @@ POSTGRES_DSN = os.getenv(
 )
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+# OpenAI-compatible endpoint to use instead of api.openai.com (e.g. bot/scripts/stub_llm.py)
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "")
+
+# LLM backend: live | record (live + save prompt/response pairs) | replay (saved pairs only)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "live").lower()
+LLM_STORE_PATH = os.getenv("LLM_STORE_PATH", "llm_store.jsonl")
+LLM_REPLAY_LATENCY_MS = os.getenv("LLM_REPLAY_LATENCY_MS", "0")  # milliseconds, or "recorded"
 
 DEFAULT_TIMEZONE = "Asia/Kolkata"
+
+# Fast-path (regex) extraction in front of the LLM
+FASTPATH_ENABLED = os.getenv("FASTPATH_ENABLED", "true").lower() == "true"
+FASTPATH_MIN_CONFIDENCE = float(os.getenv("FASTPATH_MIN_CONFIDENCE", "0.75"))
+KNOWN_PROJECTS = [
+    p.strip() for p in os.getenv("KNOWN_PROJECTS", "").split(",") if p.strip()
+]
+
+# Extraction result cache (LLM results keyed on normalized message + date)
+EXTRACT_CACHE_SIZE = int(os.getenv("EXTRACT_CACHE_SIZE", "5000"))
+EXTRACT_CACHE_TTL = int(os.getenv("EXTRACT_CACHE_TTL", "86400"))
+EXTRACT_CACHE_PATH = os.getenv("EXTRACT_CACHE_PATH", "")
+
+# Cross-user micro-batching of LLM extraction requests
+EXTRACT_BATCH_ENABLED = os.getenv("EXTRACT_BATCH_ENABLED", "false").lower() == "true"
+EXTRACT_BATCH_WINDOW_MS = int(os.getenv("EXTRACT_BATCH_WINDOW_MS", "30"))
+EXTRACT_BATCH_MAX_SIZE = int(os.getenv("EXTRACT_BATCH_MAX_SIZE", "16"))
+
+# In-process session cache in front of the sessions table (size 0 disables)
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "10000"))
+SESSION_CACHE_TTL = int(os.getenv("SESSION_CACHE_TTL", "300"))
+
+# bcrypt hashing off the event loop
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", "2"))
+
+# Bearer token for GET /api/export (export route is disabled when empty)
+EXPORT_API_TOKEN = os.getenv("EXPORT_API_TOKEN", "")
+
+# Monthly timesheet partitions to keep created ahead of the current month
+TIMESHEET_PARTITIONS_AHEAD = int(os.getenv("TIMESHEET_PARTITIONS_AHEAD", "3"))
+
+# Admin analytics: per-question latency budget and result cache
+ADMIN_QUERY_BUDGET_MS = int(os.getenv("ADMIN_QUERY_BUDGET_MS", "2000"))
+ANALYTICS_CACHE_SIZE = int(os.getenv("ANALYTICS_CACHE_SIZE", "500"))
+ANALYTICS_CACHE_TTL = int(os.getenv("ANALYTICS_CACHE_TTL", "300"))
+
+# Local columnar snapshot of the timesheet table (org-wide reporting)
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "snapshots/timesheet")
+
+# Asynchronous turns: ack the channel at once, reply proactively from a worker pool
+ASYNC_TURNS_ENABLED = os.getenv("ASYNC_TURNS_ENABLED", "false").lower() == "true"
+TURN_WORKERS = int(os.getenv("TURN_WORKERS", "16"))
+TURN_QUEUE_SIZE = int(os.getenv("TURN_QUEUE_SIZE", "200"))
+
+# Per-user turn serialization: memory (one process) | postgres (advisory
+# lock on external_id, required when several processes serve the bot)
+TURN_LOCK_BACKEND = os.getenv("TURN_LOCK_BACKEND", "memory")
+
+# Inbound activity de-duplication (channel retries); backend: memory | postgres
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+DEDUP_BACKEND = os.getenv("DEDUP_BACKEND", "memory")
+DEDUP_TTL = int(os.getenv("DEDUP_TTL", "600"))
+DEDUP_CACHE_SIZE = int(os.getenv("DEDUP_CACHE_SIZE", "10000"))
+DEDUP_INFLIGHT_TIMEOUT = int(os.getenv("DEDUP_INFLIGHT_TIMEOUT", "120"))
+
+# asyncpg pool sizing and connection lifetime (0 disables a limit/timeout)
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_CONNECT_TIMEOUT = float(os.getenv("DB_CONNECT_TIMEOUT", "60"))
+DB_COMMAND_TIMEOUT = float(os.getenv("DB_COMMAND_TIMEOUT", "0"))
+DB_MAX_QUERIES = int(os.getenv("DB_MAX_QUERIES", "50000"))
+DB_MAX_INACTIVE_LIFETIME = float(os.getenv("DB_MAX_INACTIVE_LIFETIME", "300"))
+# Prepared statements asyncpg caches per connection (0 disables, e.g. behind pgbouncer)
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "256"))
+
+# Multi-process serving (python -m bot.app.serve); SERVE_WORKERS=0 means one per CPU
+SERVE_HOST = os.getenv("SERVE_HOST", "0.0.0.0")
+SERVE_PORT = int(os.getenv("SERVE_PORT", "3978"))
+SERVE_WORKERS = int(os.getenv("SERVE_WORKERS", "0"))
+SERVE_HEARTBEAT_INTERVAL = float(os.getenv("SERVE_HEARTBEAT_INTERVAL", "5"))
+SERVE_SHUTDOWN_TIMEOUT = float(os.getenv("SERVE_SHUTDOWN_TIMEOUT", "30"))
+SERVE_STATUS_PATH = os.getenv("SERVE_STATUS_PATH", "")
+# Postgres connections shared by all workers' pools
+DB_CONNECTION_BUDGET = int(os.getenv("DB_CONNECTION_BUDGET", "40"))
+
+# Request tracing; exporter: jsonl (TRACE_JSONL_PATH) | otlp (OTLP/HTTP JSON to TRACE_OTLP_ENDPOINT)
+TRACE_ENABLED = os.getenv("TRACE_ENABLED", "false").lower() == "true"
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.1"))
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "jsonl")
+TRACE_JSONL_PATH = os.getenv("TRACE_JSONL_PATH", "traces.jsonl")
+TRACE_OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "10000"))
+TRACE_FLUSH_INTERVAL = float(os.getenv("TRACE_FLUSH_INTERVAL", "2"))
+
+# Logging: records are queued and formatted/written on a background thread (bot/logging.py)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()  # json | text
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# "bot.db=0.1,bot.nlp.fastpath=0.01": fraction of DEBUG/INFO records kept per logger (prefix)
+LOG_SAMPLE_RATES = {
+    name.strip(): float(rate)
+    for name, rate in (
+        item.split("=", 1) for item in os.getenv("LOG_SAMPLE_RATES", "").split(",") if "=" in item
+    )
+}
+# Log user message bodies as "<N chars>" instead of their text
+LOG_REDACT_MESSAGES = os.getenv("LOG_REDACT_MESSAGES", "true").lower() == "true"
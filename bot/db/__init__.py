@@ -2,7 +2,7 @@
 bot/db/__init__.py - Database module exports
 """
 
-from bot.db.pool import init_pool, get_pool
+from bot.db.pool import init_pool, get_pool, get_pool_stats
 from bot.db.users import (
     get_user_by_username,
     verify_user_password,
@@ -11,6 +11,7 @@ from bot.db.users import (
 from bot.db.sessions import (
     get_or_create_session,
     update_session,
+    invalidate_session,
 )
 from bot.db.invites import (
     get_invite,
@@ -18,6 +19,7 @@ from bot.db.invites import (
 )
 from bot.db.timesheet import (
     save_timesheet_entry,
+    save_timesheet_entries,
     get_last_entry,
     get_last_project,
     update_last_entry_hours,
@@ -26,14 +28,17 @@ from bot.db.timesheet import (
 __all__ = [
     "init_pool",
     "get_pool",
+    "get_pool_stats",
     "get_user_by_username",
     "verify_user_password",
     "create_user",
     "get_or_create_session",
     "update_session",
+    "invalidate_session",
     "get_invite",
     "mark_used",
     "save_timesheet_entry",
+    "save_timesheet_entries",
     "get_last_entry",
     "get_last_project",
     "update_last_entry_hours",
@@ -0,0 +1,73 @@
+"""
+bot/db/advisory.py - Per-key Postgres advisory locks shared across processes
+
+Locks are session-level advisory locks taken on one dedicated connection
+per process (outside the pool), so a turn holding its user's lock never
+ties up a pool connection. The connection runs one command at a time, so
+acquire() polls pg_try_advisory_lock instead of blocking on
+pg_advisory_lock; turns from the same process are already serialized in
+memory, so polling only happens when two processes get the same user.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+import asyncpg
+
+from bot.config import POSTGRES_DSN
+
+logger = logging.getLogger(__name__)
+
+# Poll interval while another process holds the lock (doubles up to the max)
+POLL_START = 0.01
+POLL_MAX = 0.5
+
+
+class AdvisoryLocks:
+    """
+    Advisory locks in the namespace `namespace`, keyed by hashtext(key)
+
+    Args:
+        namespace: Lock namespace (first half of the two-int lock id)
+        dsn: Database to lock in
+    """
+
+    def __init__(self, namespace: str, dsn: str = POSTGRES_DSN):
+        self.namespace = namespace
+        self.dsn = dsn
+        self._conn: Optional[asyncpg.Connection] = None
+        self._mutex = asyncio.Lock()
+        self.polls = 0
+
+    async def _fetchval(self, sql: str, key: str):
+        async with self._mutex:
+            if self._conn is None or self._conn.is_closed():
+                # Locks taken on a lost connection were released by the server
+                self._conn = await asyncpg.connect(self.dsn)
+            return await self._conn.fetchval(sql, self.namespace, key)
+
+    async def acquire(self, key: str) -> None:
+        """Wait until this process holds the lock for `key`"""
+        delay = POLL_START
+        while not await self._fetchval(
+            "SELECT pg_try_advisory_lock(hashtext($1), hashtext($2))", key
+        ):
+            self.polls += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, POLL_MAX)
+
+    async def release(self, key: str) -> None:
+        """Release the lock for `key` (a no-op if the connection was lost)"""
+        released = await self._fetchval(
+            "SELECT pg_advisory_unlock(hashtext($1), hashtext($2))", key
+        )
+        if not released:
+            logger.warning("Advisory lock %s/%s was not held at release", self.namespace, key)
+
+    async def close(self) -> None:
+        """Close the dedicated connection (releases every lock it holds)"""
+        async with self._mutex:
+            if self._conn is not None:
+                await self._conn.close()
+                self._conn = None
@@ -0,0 +1,240 @@
+"""
+bot/db/analytics.py - Org-wide analytics over timesheet_daily_rollup
+
+All queries read the trigger-maintained daily rollup (never raw entries),
+are cancelled after ADMIN_QUERY_BUDGET_MS, and are cached per (report, target, period).
+Cached reports are dropped when entries inside their period change in this
+process, and are only served while the rollup change counter (migration
+0008, bumped by any process or import that writes timesheet) still has the
+value the report was built at.
+"""
+
+import logging
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from bot.cache import TTLCache
+from bot.config import ADMIN_QUERY_BUDGET_MS, ANALYTICS_CACHE_SIZE, ANALYTICS_CACHE_TTL
+from bot.db.pool import get_pool
+from bot.metrics import db_call
+
+logger = logging.getLogger(__name__)
+
+# (report, target, start, end) -> (rollup change counter, result)
+_cache = TTLCache(maxsize=ANALYTICS_CACHE_SIZE, ttl=ANALYTICS_CACHE_TTL)
+
+
+def invalidate_dates(dates: Iterable[date]) -> None:
+    """
+    Drop cached reports whose period covers any of the given dates
+
+    Called by the write paths in bot/db/timesheet.py.
+
+    Args:
+        dates: entry_dates that were inserted or changed
+    """
+    dates = {d for d in dates if d is not None}
+    if not dates:
+        return
+
+    stale = [
+        key for key, _, _ in _cache.items()
+        if any(key[2] <= d <= key[3] for d in dates)
+    ]
+    for key in stale:
+        _cache.pop(key)
+
+    if stale:
+        logger.debug("Invalidated %s cached analytics reports", len(stale))
+
+
+def get_analytics_cache_stats() -> Dict[str, Any]:
+    """Analytics cache size and hit-rate counters"""
+    return _cache.stats()
+
+
+async def _fetch(query: str, *args) -> List[dict]:
+    """Run a read-only query under the admin latency budget"""
+    pool = get_pool()
+
+    # asyncpg cancels the query server-side when the timeout expires
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(query, *args, timeout=ADMIN_QUERY_BUDGET_MS / 1000)
+        return [dict(r) for r in rows]
+
+
+async def _rollup_version() -> int:
+    """Current value of the rollup change counter (one cheap round trip)"""
+    pool = get_pool()
+    async with pool.acquire() as conn:
+        return await conn.fetchval("SELECT last_value FROM timesheet_rollup_changes")
+
+
+async def _cached(report: str, target: Any, start: date, end: date, loader) -> Any:
+    key = (report, target, start, end)
+    # Read before loading: a write landing mid-load makes the entry stale, not wrong
+    version = await _rollup_version()
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    result = await loader()
+    _cache.set(key, (version, result))
+    return result
+
+
+@db_call
+async def find_user(words: List[str]) -> Optional[dict]:
+    """
+    Find the user named by candidate words: an exact username first, then
+    a first name (only if exactly one user has it)
+
+    Args:
+        words: Lowercase words from the name positions of the message
+
+    Returns:
+        User dict (user_id, username, display_name) or None
+    """
+    rows = await _fetch("""
+        SELECT user_id, username, display_name
+        FROM users
+        WHERE lower(username) = ANY($1::text[])
+        ORDER BY array_position($1::text[], lower(username::text))
+        LIMIT 1
+    """, words)
+    if rows:
+        return rows[0]
+
+    rows = await _fetch("""
+        SELECT user_id, username, display_name
+        FROM users
+        WHERE lower(split_part(display_name, ' ', 1)) = ANY($1::text[])
+        LIMIT 2
+    """, words)
+    return rows[0] if len(rows) == 1 else None
+
+
+@db_call
+async def find_project(text: str, start: date, end: date) -> Optional[str]:
+    """
+    Find the longest project name (active in the period) mentioned in text
+
+    Args:
+        text: Lowercase message text
+        start: First day of the period
+        end: Last day of the period
+
+    Returns:
+        Project name or None
+    """
+    rows = await _fetch("""
+        SELECT project
+        FROM (
+            SELECT DISTINCT project
+            FROM timesheet_daily_rollup
+            WHERE entry_date BETWEEN $2 AND $3 AND project <> ''
+        ) p
+        WHERE position(lower(project) IN $1) > 0
+        ORDER BY length(project) DESC
+        LIMIT 1
+    """, text, start, end)
+    return rows[0]["project"] if rows else None
+
+
+@db_call
+async def user_weekly_summary(user_id: int, start: date, end: date) -> List[dict]:
+    """
+    Hours per ISO week and project for one user
+
+    Returns:
+        Rows with week_start, project, hours, days_logged
+    """
+    async def load():
+        return await _fetch("""
+            SELECT date_trunc('week', entry_date)::date AS week_start,
+                   project,
+                   SUM(hours) AS hours,
+                   COUNT(DISTINCT entry_date) AS days_logged
+            FROM timesheet_daily_rollup
+            WHERE user_id = $1 AND entry_date BETWEEN $2 AND $3
+            GROUP BY 1, 2
+            ORDER BY 1, 3 DESC
+        """, user_id, start, end)
+
+    return await _cached("user_weekly", user_id, start, end, load)
+
+
+@db_call
+async def project_weekly_summary(project: str, start: date, end: date) -> List[dict]:
+    """
+    Hours per ISO week and user for one project
+
+    Returns:
+        Rows with week_start, username, hours
+    """
+    async def load():
+        return await _fetch("""
+            SELECT date_trunc('week', r.entry_date)::date AS week_start,
+                   COALESCE(u.username, r.user_id::text) AS username,
+                   SUM(r.hours) AS hours
+            FROM timesheet_daily_rollup r
+            LEFT JOIN users u ON u.user_id = r.user_id
+            WHERE r.project = $1 AND r.entry_date BETWEEN $2 AND $3
+            GROUP BY 1, 2
+            ORDER BY 1, 3 DESC
+        """, project, start, end)
+
+    return await _cached("project_weekly", project, start, end, load)
+
+
+@db_call
+async def efficiency_metrics(start: date, end: date) -> Dict[str, Any]:
+    """
+    Org-wide efficiency metrics for a period
+
+    Returns:
+        Dict with:
+            task_types: rows of task_type, hours
+            users_total: registered users
+            users_active: users with at least one entry
+            logged_days: distinct (user, workday) pairs with entries
+            workdays: Mon-Fri days in the period (up to today)
+            total_hours: hours logged
+    """
+    async def load():
+        task_types = await _fetch("""
+            SELECT COALESCE(NULLIF(task_type, ''), 'Unknown') AS task_type,
+                   SUM(hours) AS hours
+            FROM timesheet_daily_rollup
+            WHERE entry_date BETWEEN $1 AND $2
+            GROUP BY 1
+            ORDER BY 2 DESC
+        """, start, end)
+
+        totals = (await _fetch("""
+            SELECT (SELECT COUNT(*) FROM users) AS users_total,
+                   COUNT(DISTINCT user_id) AS users_active,
+                   COUNT(DISTINCT (user_id, entry_date))
+                       FILTER (WHERE EXTRACT(ISODOW FROM entry_date) < 6) AS logged_days,
+                   COALESCE(SUM(hours), 0) AS total_hours
+            FROM timesheet_daily_rollup
+            WHERE entry_date BETWEEN $1 AND $2
+        """, start, end))[0]
+
+        return {
+            "task_types": task_types,
+            "workdays": _count_workdays(start, min(end, date.today())),
+            **totals,
+        }
+
+    return await _cached("efficiency", None, start, end, load)
+
+
+def _count_workdays(start: date, end: date) -> int:
+    days = 0
+    current = start
+    while current <= end:
+        if current.weekday() < 5:
+            days += 1
+        current += timedelta(days=1)
+    return days
@@ -0,0 +1,174 @@
+"""
+bot/db/export.py - Streaming timesheet export (server-side cursor)
+"""
+
+import csv
+import io
+import json
+import logging
+from datetime import date
+from typing import AsyncIterator, Awaitable, Callable, Iterable, List, Optional
+
+from bot.db.pool import get_pool
+
+logger = logging.getLogger(__name__)
+
+EXPORT_COLUMNS = [
+    "entry_id",
+    "user_id",
+    "username",
+    "entry_date",
+    "project",
+    "task",
+    "hours",
+    "task_type",
+    "created_at",
+    "updated_at",
+]
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+
+async def iter_timesheet_rows(
+    user: Optional[str] = None,
+    project: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    prefetch: int = 1000,
+) -> AsyncIterator[dict]:
+    """
+    Stream filtered timesheet rows without loading them all into memory
+
+    Rows are read through an asyncpg cursor inside a read-only
+    transaction, `prefetch` rows per round trip.
+
+    Args:
+        user: Username or numeric user_id
+        project: Exact project name
+        date_from: First entry_date to include
+        date_to: Last entry_date to include
+        prefetch: Rows fetched per cursor round trip
+
+    Yields:
+        Row dicts with EXPORT_COLUMNS keys
+    """
+    conditions = []
+    args = []
+
+    if user:
+        args.append(int(user) if user.isdigit() else user)
+        conditions.append(
+            f"t.user_id = ${len(args)}" if user.isdigit() else f"u.username = ${len(args)}"
+        )
+    if project:
+        args.append(project)
+        conditions.append(f"t.project = ${len(args)}")
+    if date_from:
+        args.append(date_from)
+        conditions.append(f"t.entry_date >= ${len(args)}")
+    if date_to:
+        args.append(date_to)
+        conditions.append(f"t.entry_date <= ${len(args)}")
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    query = f"""
+        SELECT t.entry_id, t.user_id, u.username, t.entry_date, t.project,
+               t.task, t.hours, t.task_type, t.created_at, t.updated_at
+        FROM timesheet t
+        LEFT JOIN users u ON u.user_id = t.user_id
+        {where}
+        ORDER BY t.entry_date, t.entry_id
+    """
+
+    pool = get_pool()
+    count = 0
+
+    async with pool.acquire() as conn:
+        async with conn.transaction(isolation="repeatable_read", readonly=True):
+            async for row in conn.cursor(query, *args, prefetch=prefetch):
+                count += 1
+                yield dict(row)
+
+    logger.info("Exported %s timesheet rows", count)
+
+
+async def write_export(
+    write: Callable[[str], Awaitable[None]],
+    fmt: str = "csv",
+    batch_size: int = 500,
+    **filters,
+) -> int:
+    """
+    Stream an export through `write`, one formatted batch at a time
+
+    Args:
+        write: Coroutine receiving each text chunk (HTTP response, file, ...)
+        fmt: "csv" or "jsonl"
+        batch_size: Rows rendered per write
+        **filters: user, project, date_from, date_to (see iter_timesheet_rows)
+
+    Returns:
+        Number of rows written
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    header = format_header(fmt)
+    if header:
+        await write(header)
+
+    count = 0
+    batch = []
+    async for row in iter_timesheet_rows(**filters):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            await write(format_rows(batch, fmt))
+            count += len(batch)
+            batch = []
+
+    if batch:
+        await write(format_rows(batch, fmt))
+        count += len(batch)
+
+    return count
+
+
+def format_header(fmt: str) -> str:
+    """Header line for the format ('' for JSONL)"""
+    if fmt == "csv":
+        return _csv_lines([EXPORT_COLUMNS])
+    return ""
+
+
+def format_rows(rows: Iterable[dict], fmt: str) -> str:
+    """
+    Render a batch of rows as CSV or JSONL text
+
+    Args:
+        rows: Row dicts from iter_timesheet_rows
+        fmt: "csv" or "jsonl"
+
+    Returns:
+        Text with one line per row
+    """
+    if fmt == "csv":
+        return _csv_lines([[_csv_value(row[c]) for c in EXPORT_COLUMNS] for row in rows])
+
+    return "".join(
+        json.dumps({c: row[c] for c in EXPORT_COLUMNS}, default=str) + "\n"
+        for row in rows
+    )
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def _csv_lines(rows: List[list]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue()
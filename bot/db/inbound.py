@@ -0,0 +1,99 @@
+"""
+bot/db/inbound.py - inbound_activity table (shared de-duplication store)
+"""
+
+import logging
+from typing import Optional, Tuple
+
+from bot.db.pool import get_pool
+from bot.metrics import db_call
+
+logger = logging.getLogger(__name__)
+
+
+@db_call
+async def claim_activity(
+    activity_key: str,
+    inflight_timeout: float,
+    ttl: float,
+) -> Tuple[bool, Optional[str]]:
+    """
+    Claim an inbound activity for processing
+
+    A row left in flight longer than `inflight_timeout` (crashed worker) or
+    finished longer than `ttl` ago is reclaimed.
+
+    Args:
+        activity_key: Conversation id + activity id
+        inflight_timeout: Seconds before an unfinished claim is abandoned
+        ttl: Seconds a finished reply is kept
+
+    Returns:
+        (claimed, reply): claimed is True if the caller should process the
+        activity; otherwise reply is the stored reply (None while in flight)
+    """
+    pool = get_pool()
+
+    async with pool.acquire() as conn:
+        claimed = await conn.fetchval("""
+            INSERT INTO inbound_activity (activity_key)
+            VALUES ($1)
+            ON CONFLICT (activity_key) DO UPDATE
+                SET reply = NULL, created_at = NOW()
+                WHERE inbound_activity.created_at < NOW() - make_interval(
+                    secs => CASE WHEN inbound_activity.reply IS NULL THEN $2::float8 ELSE $3::float8 END
+                )
+            RETURNING TRUE
+        """, activity_key, float(inflight_timeout), float(ttl))
+
+        if claimed:
+            return True, None
+
+        reply = await conn.fetchval(
+            "SELECT reply FROM inbound_activity WHERE activity_key = $1",
+            activity_key,
+        )
+        return False, reply
+
+
+@db_call
+async def complete_activity(activity_key: str, reply: str) -> None:
+    """Store the reply of a processed activity"""
+    pool = get_pool()
+    async with pool.acquire() as conn:
+        await conn.execute(
+            "UPDATE inbound_activity SET reply = $2, created_at = NOW() WHERE activity_key = $1",
+            activity_key,
+            reply,
+        )
+
+
+@db_call
+async def release_activity(activity_key: str) -> None:
+    """Forget a claim whose turn failed, so a retry is processed again"""
+    pool = get_pool()
+    async with pool.acquire() as conn:
+        await conn.execute(
+            "DELETE FROM inbound_activity WHERE activity_key = $1 AND reply IS NULL",
+            activity_key,
+        )
+
+
+@db_call
+async def purge_activities(ttl: float) -> int:
+    """
+    Delete rows older than `ttl` seconds
+
+    Returns:
+        Number of rows deleted
+    """
+    pool = get_pool()
+    async with pool.acquire() as conn:
+        result = await conn.execute(
+            "DELETE FROM inbound_activity WHERE created_at < NOW() - make_interval(secs => $1)",
+            float(ttl),
+        )
+    deleted = int(result.split()[-1])
+    if deleted:
+        logger.debug("Purged %s inbound activity rows", deleted)
+    return deleted
@@ -5,10 +5,12 @@ bot/db/invites.py - Invite code management for onboarding
 import logging
 from typing import Optional
 from bot.db.pool import get_pool
+from bot.metrics import db_call
 
 logger = logging.getLogger(__name__)
 
 
+@db_call
 async def get_invite(code: str) -> Optional[dict]:
     """
     Get unused invite code
@@ -28,13 +30,14 @@ async def get_invite(code: str) -> Optional[dict]:
         )
         
         if row:
-            logger.info(f"Found valid invite: {code}")
+            logger.info("Found valid invite: %s", code)
             return dict(row)
         
-        logger.warning(f"Invalid or used invite: {code}")
+        logger.warning("Invalid or used invite: %s", code)
         return None
 
 
+@db_call
 async def mark_used(code: str, user_id: int) -> None:
     """
     Mark invite code as used by a user
@@ -52,9 +55,10 @@ async def mark_used(code: str, user_id: int) -> None:
             WHERE code = $2
         """, user_id, code)
         
-        logger.info(f"Marked invite as used: {code} by user_id={user_id}")
+        logger.info("Marked invite as used: %s by user_id=%s", code, user_id)
 
 
+@db_call
 async def create_invite(code: str, role: str = "user") -> None:
     """
     Create new invite code
@@ -72,4 +76,4 @@ async def create_invite(code: str, role: str = "user") -> None:
             role
         )
         
-        logger.info(f"Created invite code: {code} (role={role})")
\ No newline at end of file
+        logger.info("Created invite code: %s (role=%s)", code, role)
\ No newline at end of file
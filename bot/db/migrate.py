@@ -0,0 +1,110 @@
+"""
+bot/db/migrate.py - Versioned schema migrations
+
+Migrations are the NNNN_name.sql files in bot/db/migrations, applied in
+order, each in its own transaction, and recorded in `schema_version`.
+"""
+
+import logging
+import re
+from pathlib import Path
+from typing import List, Tuple
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+
+# Serializes concurrent runners (several workers starting at once)
+_ADVISORY_LOCK_ID = 724_001
+
+_FILENAME_RE = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+
+def load_migrations() -> List[Tuple[int, str, str]]:
+    """
+    Read migration files in version order
+
+    Returns:
+        List of (version, name, sql)
+    """
+    migrations = []
+    for path in MIGRATIONS_DIR.iterdir():
+        match = _FILENAME_RE.match(path.name)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), path.read_text(encoding="utf-8")))
+
+    migrations.sort()
+
+    versions = [m[0] for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration versions in {MIGRATIONS_DIR}")
+
+    return migrations
+
+
+def latest_version() -> int:
+    """Highest migration version shipped with the code"""
+    migrations = load_migrations()
+    return migrations[-1][0] if migrations else 0
+
+
+async def get_schema_version(conn: asyncpg.Connection) -> int:
+    """Currently applied version (0 if the database was never migrated)"""
+    exists = await conn.fetchval("SELECT to_regclass('schema_version') IS NOT NULL")
+    if not exists:
+        return 0
+    return await conn.fetchval("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+
+
+async def run_migrations(pool: asyncpg.Pool) -> int:
+    """
+    Apply pending migrations; no DDL runs when the schema is current
+
+    Args:
+        pool: Database pool
+
+    Returns:
+        Schema version after running
+    """
+    migrations = load_migrations()
+    target = migrations[-1][0] if migrations else 0
+
+    async with pool.acquire() as conn:
+        current = await get_schema_version(conn)
+        if current >= target:
+            logger.info("Schema is current (version %s), skipping migrations.", current)
+            return current
+
+        await conn.execute("SELECT pg_advisory_lock($1)", _ADVISORY_LOCK_ID)
+        try:
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INT PRIMARY KEY,
+                    name VARCHAR(200) NOT NULL,
+                    applied_at TIMESTAMPTZ DEFAULT NOW()
+                );
+            """)
+
+            # Another process may have migrated while we waited for the lock
+            current = await get_schema_version(conn)
+
+            for version, name, sql in migrations:
+                if version <= current:
+                    continue
+
+                logger.info("Applying migration %04d_%s...", version, name)
+                async with conn.transaction():
+                    await conn.execute(sql)
+                    await conn.execute(
+                        "INSERT INTO schema_version (version, name) VALUES ($1, $2)",
+                        version,
+                        name,
+                    )
+                current = version
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock($1)", _ADVISORY_LOCK_ID)
+
+    logger.info("Schema migrated to version %s.", current)
+    return current
@@ -0,0 +1,46 @@
+-- 0001_initial_schema.sql - Base tables (matches the original bootstrap schema)
+
+-- users
+CREATE TABLE IF NOT EXISTS users (
+    user_id SERIAL PRIMARY KEY,
+    username VARCHAR(100) UNIQUE NOT NULL,
+    password_hash VARCHAR(255) NOT NULL,
+    display_name VARCHAR(200)
+);
+
+-- invites for first-time onboarding
+CREATE TABLE IF NOT EXISTS invites (
+    code VARCHAR(100) PRIMARY KEY,
+    role VARCHAR(50) DEFAULT 'user',
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    used BOOLEAN DEFAULT false,
+    used_by INT REFERENCES users(user_id),
+    used_at TIMESTAMPTZ
+);
+
+-- sessions with pending clarifications
+CREATE TABLE IF NOT EXISTS sessions (
+    external_id TEXT PRIMARY KEY,
+    user_id INT REFERENCES users(user_id),
+    state VARCHAR(50) NOT NULL,
+    temp_username VARCHAR(100),
+    temp_display_name VARCHAR(200),
+    invite_code VARCHAR(100),
+    pending_action VARCHAR(50),
+    pending_entries JSONB,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- timesheet data
+CREATE TABLE IF NOT EXISTS timesheet (
+    entry_id SERIAL PRIMARY KEY,
+    user_id INT REFERENCES users(user_id),
+    entry_date DATE,
+    project VARCHAR(255),
+    task TEXT,
+    hours FLOAT,
+    task_type VARCHAR(100),
+    raw_msg TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ
+);
@@ -0,0 +1,13 @@
+-- 0002_hot_query_indexes.sql - Indexes for the per-user hot queries
+
+-- get_last_entry / get_last_project / update_last_entry_hours
+CREATE INDEX IF NOT EXISTS idx_timesheet_user_created
+    ON timesheet (user_id, created_at DESC);
+
+-- weekly_summary / today_summary
+CREATE INDEX IF NOT EXISTS idx_timesheet_user_date
+    ON timesheet (user_id, entry_date);
+
+-- stale session cleanup
+CREATE INDEX IF NOT EXISTS idx_sessions_updated_at
+    ON sessions (updated_at);
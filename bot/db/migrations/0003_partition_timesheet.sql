@@ -0,0 +1,81 @@
+-- 0003_partition_timesheet.sql - Monthly range partitioning of timesheet on entry_date
+--
+-- The existing table is renamed, a partitioned table takes its place
+-- (same columns and sequence), rows are copied over and the old table is
+-- dropped. entry_date becomes NOT NULL since it is part of the key.
+
+-- Create one monthly partition (idempotent). Rows for that month that
+-- landed in the default partition are moved into it before attaching.
+CREATE OR REPLACE FUNCTION ensure_timesheet_partition(p_month DATE) RETURNS TEXT AS $$
+DECLARE
+    start_date DATE := date_trunc('month', p_month)::date;
+    end_date DATE := (date_trunc('month', p_month) + INTERVAL '1 month')::date;
+    part_name TEXT := format('timesheet_%s', to_char(start_date, 'YYYY_MM'));
+BEGIN
+    IF to_regclass(part_name) IS NOT NULL THEN
+        RETURN part_name;
+    END IF;
+
+    EXECUTE format('CREATE TABLE %I (LIKE timesheet INCLUDING DEFAULTS)', part_name);
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM timesheet_default WHERE entry_date >= %L AND entry_date < %L RETURNING *) '
+        'INSERT INTO %I SELECT * FROM moved',
+        start_date, end_date, part_name
+    );
+    EXECUTE format(
+        'ALTER TABLE timesheet ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        part_name, start_date, end_date
+    );
+    RETURN part_name;
+END;
+$$ LANGUAGE plpgsql;
+
+ALTER TABLE timesheet RENAME TO timesheet_legacy;
+ALTER TABLE timesheet_legacy RENAME CONSTRAINT timesheet_pkey TO timesheet_legacy_pkey;
+DROP INDEX IF EXISTS idx_timesheet_user_created;
+DROP INDEX IF EXISTS idx_timesheet_user_date;
+ALTER SEQUENCE timesheet_entry_id_seq OWNED BY NONE;
+
+CREATE TABLE timesheet (
+    entry_id INT NOT NULL DEFAULT nextval('timesheet_entry_id_seq'),
+    user_id INT REFERENCES users(user_id),
+    entry_date DATE NOT NULL,
+    project VARCHAR(255),
+    task TEXT,
+    hours FLOAT,
+    task_type VARCHAR(100),
+    raw_msg TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ,
+    PRIMARY KEY (entry_id, entry_date)
+) PARTITION BY RANGE (entry_date);
+
+ALTER SEQUENCE timesheet_entry_id_seq OWNED BY timesheet.entry_id;
+
+-- Catch-all for dates without a monthly partition yet
+CREATE TABLE timesheet_default PARTITION OF timesheet DEFAULT;
+
+CREATE INDEX idx_timesheet_user_created ON timesheet (user_id, created_at DESC);
+CREATE INDEX idx_timesheet_user_date ON timesheet (user_id, entry_date);
+
+-- Partitions from the oldest existing month through three months ahead
+SELECT ensure_timesheet_partition(month::date)
+FROM generate_series(
+    date_trunc('month', LEAST(
+        (SELECT MIN(entry_date) FROM timesheet_legacy),
+        CURRENT_DATE
+    )),
+    date_trunc('month', CURRENT_DATE) + INTERVAL '3 months',
+    INTERVAL '1 month'
+) AS month;
+
+INSERT INTO timesheet (
+    entry_id, user_id, entry_date, project, task, hours,
+    task_type, raw_msg, created_at, updated_at
+)
+SELECT
+    entry_id, user_id, COALESCE(entry_date, created_at::date, CURRENT_DATE), project, task, hours,
+    task_type, raw_msg, created_at, updated_at
+FROM timesheet_legacy;
+
+DROP TABLE timesheet_legacy;
@@ -0,0 +1,83 @@
+-- 0004_daily_rollup.sql - Per-day totals maintained by statement-level triggers
+--
+-- Every INSERT/UPDATE/DELETE (and COPY) against timesheet applies its
+-- per-(user, day, project, task_type) deltas here, so summaries read a
+-- handful of rows instead of raw entries. Run bot.scripts.rebuild_rollup
+-- to recompute or verify it from scratch.
+
+CREATE TABLE IF NOT EXISTS timesheet_daily_rollup (
+    user_id INT NOT NULL,
+    entry_date DATE NOT NULL,
+    project VARCHAR(255) NOT NULL DEFAULT '',
+    task_type VARCHAR(100) NOT NULL DEFAULT '',
+    hours FLOAT NOT NULL DEFAULT 0,
+    entry_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, entry_date, project, task_type)
+);
+
+-- org-wide date-range queries
+CREATE INDEX IF NOT EXISTS idx_rollup_entry_date
+    ON timesheet_daily_rollup (entry_date);
+
+CREATE OR REPLACE FUNCTION timesheet_rollup_trigger() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO timesheet_daily_rollup AS r (user_id, entry_date, project, task_type, hours, entry_count)
+        SELECT user_id, entry_date, COALESCE(project, ''), COALESCE(task_type, ''),
+               -SUM(COALESCE(hours, 0)), -COUNT(*)
+        FROM old_rows
+        WHERE user_id IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+        ON CONFLICT (user_id, entry_date, project, task_type) DO UPDATE
+        SET hours = r.hours + EXCLUDED.hours,
+            entry_count = r.entry_count + EXCLUDED.entry_count;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO timesheet_daily_rollup AS r (user_id, entry_date, project, task_type, hours, entry_count)
+        SELECT user_id, entry_date, COALESCE(project, ''), COALESCE(task_type, ''),
+               SUM(COALESCE(hours, 0)), COUNT(*)
+        FROM new_rows
+        WHERE user_id IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+        ON CONFLICT (user_id, entry_date, project, task_type) DO UPDATE
+        SET hours = r.hours + EXCLUDED.hours,
+            entry_count = r.entry_count + EXCLUDED.entry_count;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM timesheet_daily_rollup r
+        USING (SELECT DISTINCT user_id, entry_date FROM old_rows) o
+        WHERE r.user_id = o.user_id
+          AND r.entry_date = o.entry_date
+          AND r.entry_count <= 0;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables require one trigger per event
+CREATE TRIGGER timesheet_rollup_insert
+    AFTER INSERT ON timesheet
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION timesheet_rollup_trigger();
+
+CREATE TRIGGER timesheet_rollup_update
+    AFTER UPDATE ON timesheet
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION timesheet_rollup_trigger();
+
+CREATE TRIGGER timesheet_rollup_delete
+    AFTER DELETE ON timesheet
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION timesheet_rollup_trigger();
+
+-- Backfill from existing entries
+INSERT INTO timesheet_daily_rollup (user_id, entry_date, project, task_type, hours, entry_count)
+SELECT user_id, entry_date, COALESCE(project, ''), COALESCE(task_type, ''),
+       SUM(COALESCE(hours, 0)), COUNT(*)
+FROM timesheet
+WHERE user_id IS NOT NULL
+GROUP BY 1, 2, 3, 4
+ON CONFLICT (user_id, entry_date, project, task_type) DO NOTHING;
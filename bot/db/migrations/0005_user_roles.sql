@@ -0,0 +1,3 @@
+-- 0005_user_roles.sql - Roles on users (granted through invite codes)
+
+ALTER TABLE users ADD COLUMN IF NOT EXISTS role VARCHAR(50) NOT NULL DEFAULT 'user';
@@ -0,0 +1,11 @@
+-- 0006_inbound_activity.sql - Shared de-duplication store for inbound activities
+-- (used when DEDUP_BACKEND=postgres, so retries are recognized by any worker)
+
+CREATE TABLE IF NOT EXISTS inbound_activity (
+    activity_key TEXT PRIMARY KEY,       -- conversation id + activity id
+    reply TEXT,                          -- NULL while the turn is in flight
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_inbound_activity_created_at
+    ON inbound_activity (created_at);
@@ -0,0 +1,41 @@
+-- 0007_partition_function_lock.sql - Make ensure_timesheet_partition safe to run concurrently
+--
+-- Every worker calls ensure_timesheet_partition() at pool init. Two of them
+-- could both see the partition missing and race on CREATE TABLE. The check
+-- is now repeated under a transaction-scoped advisory lock per partition,
+-- and a duplicate_table from a creator outside the lock counts as success.
+
+CREATE OR REPLACE FUNCTION ensure_timesheet_partition(p_month DATE) RETURNS TEXT AS $$
+DECLARE
+    start_date DATE := date_trunc('month', p_month)::date;
+    end_date DATE := (date_trunc('month', p_month) + INTERVAL '1 month')::date;
+    part_name TEXT := format('timesheet_%s', to_char(start_date, 'YYYY_MM'));
+BEGIN
+    IF to_regclass(part_name) IS NOT NULL THEN
+        RETURN part_name;
+    END IF;
+
+    -- Held until the calling transaction ends; re-check once we have it
+    PERFORM pg_advisory_xact_lock(hashtext('ensure_timesheet_partition'), hashtext(part_name));
+    IF to_regclass(part_name) IS NOT NULL THEN
+        RETURN part_name;
+    END IF;
+
+    BEGIN
+        EXECUTE format('CREATE TABLE %I (LIKE timesheet INCLUDING DEFAULTS)', part_name);
+        EXECUTE format(
+            'WITH moved AS (DELETE FROM timesheet_default WHERE entry_date >= %L AND entry_date < %L RETURNING *) '
+            'INSERT INTO %I SELECT * FROM moved',
+            start_date, end_date, part_name
+        );
+        EXECUTE format(
+            'ALTER TABLE timesheet ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+            part_name, start_date, end_date
+        );
+    EXCEPTION WHEN duplicate_table THEN
+        -- Created concurrently by someone not using this function
+        NULL;
+    END;
+    RETURN part_name;
+END;
+$$ LANGUAGE plpgsql;
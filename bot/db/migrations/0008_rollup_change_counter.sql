@@ -0,0 +1,50 @@
+-- 0008_rollup_change_counter.sql - Tell cached reports that the rollup changed
+--
+-- Every process caches admin reports (bot/db/analytics.py) but only sees
+-- its own writes. The rollup trigger now bumps a sequence on every
+-- statement that touches timesheet; readers compare its value with the one
+-- their cached report was built at. A sequence is not transactional, so
+-- concurrent writers never wait on each other for it.
+
+CREATE SEQUENCE IF NOT EXISTS timesheet_rollup_changes;
+
+CREATE OR REPLACE FUNCTION timesheet_rollup_trigger() RETURNS trigger AS $$
+BEGIN
+    -- Change counter for cached reports in other processes (see bot/db/analytics.py)
+    PERFORM nextval('timesheet_rollup_changes');
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO timesheet_daily_rollup AS r (user_id, entry_date, project, task_type, hours, entry_count)
+        SELECT user_id, entry_date, COALESCE(project, ''), COALESCE(task_type, ''),
+               -SUM(COALESCE(hours, 0)), -COUNT(*)
+        FROM old_rows
+        WHERE user_id IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+        ON CONFLICT (user_id, entry_date, project, task_type) DO UPDATE
+        SET hours = r.hours + EXCLUDED.hours,
+            entry_count = r.entry_count + EXCLUDED.entry_count;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO timesheet_daily_rollup AS r (user_id, entry_date, project, task_type, hours, entry_count)
+        SELECT user_id, entry_date, COALESCE(project, ''), COALESCE(task_type, ''),
+               SUM(COALESCE(hours, 0)), COUNT(*)
+        FROM new_rows
+        WHERE user_id IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+        ON CONFLICT (user_id, entry_date, project, task_type) DO UPDATE
+        SET hours = r.hours + EXCLUDED.hours,
+            entry_count = r.entry_count + EXCLUDED.entry_count;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM timesheet_daily_rollup r
+        USING (SELECT DISTINCT user_id, entry_date FROM old_rows) o
+        WHERE r.user_id = o.user_id
+          AND r.entry_date = o.entry_date
+          AND r.entry_count <= 0;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,43 @@
+"""
+bot/db/partitions.py - Monthly partition maintenance for the timesheet table
+"""
+
+import logging
+from typing import List
+
+import asyncpg
+
+from bot.config import TIMESHEET_PARTITIONS_AHEAD
+
+logger = logging.getLogger(__name__)
+
+
+async def ensure_timesheet_partitions(
+    pool: asyncpg.Pool,
+    months_ahead: int = TIMESHEET_PARTITIONS_AHEAD,
+) -> List[str]:
+    """
+    Make sure monthly partitions exist from this month through `months_ahead`
+
+    Existing partitions are left alone (no DDL runs for them). Safe to run
+    from several workers at once: the SQL function creates each partition
+    under an advisory lock (migration 0007).
+
+    Args:
+        pool: Database pool
+        months_ahead: Future months to create partitions for
+
+    Returns:
+        Partition names covering the range
+    """
+    async with pool.acquire() as conn:
+        rows = await conn.fetch("""
+            SELECT ensure_timesheet_partition(
+                (date_trunc('month', CURRENT_DATE) + make_interval(months => m))::date
+            ) AS partition
+            FROM generate_series(0, $1) AS m
+        """, months_ahead)
+
+    partitions = [r["partition"] for r in rows]
+    logger.info("Timesheet partitions ensured through %s", partitions[-1])
+    return partitions
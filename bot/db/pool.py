@@ -1,14 +1,126 @@
 # bot/db/pool.py - Database connection pooling
 # Async PostgreSQL with asyncpg
 
+import asyncio
 import asyncpg
 import logging
-
-from bot.config import POSTGRES_DSN
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List
+
+from bot.config import (
+    POSTGRES_DSN,
+    DB_POOL_MIN_SIZE,
+    DB_POOL_MAX_SIZE,
+    DB_CONNECT_TIMEOUT,
+    DB_COMMAND_TIMEOUT,
+    DB_MAX_QUERIES,
+    DB_MAX_INACTIVE_LIFETIME,
+    DB_STATEMENT_CACHE_SIZE,
+)
+from bot.db.migrate import run_migrations
+from bot.db.partitions import ensure_timesheet_partitions
+from bot import tracing
+from bot.metrics import STAGE_SECONDS
 
 logger = logging.getLogger(__name__)
 
-_pool: asyncpg.Pool | None = None
+# Seconds of per-second query counts kept for queries_per_sec
+RATE_WINDOW = 60
+
+_pool: "InstrumentedPool | None" = None
+
+_stats = {
+    "acquired": 0,
+    "in_use": 0,
+    "max_in_use": 0,
+    "total_acquire_ms": 0.0,
+    "max_acquire_ms": 0.0,
+    "slow_acquires": 0,
+    "acquire_timeouts": 0,
+    "queries": 0,
+    "total_query_ms": 0.0,
+}
+
+# Acquires slower than this count as slow (the pool was exhausted)
+SLOW_ACQUIRE_MS = 10
+
+# [second, query count] for the last RATE_WINDOW seconds
+_query_rate: Deque[List[int]] = deque()
+
+_acquire_histogram = STAGE_SECONDS.labels("db.pool_acquire")
+
+
+class _TimedAcquire:
+    """Wraps the pool's acquire context to record wait time and connections in use"""
+
+    def __init__(self, ctx):
+        self._ctx = ctx
+
+    async def __aenter__(self):
+        started = time.perf_counter()
+        try:
+            conn = await self._ctx.__aenter__()
+        except asyncio.TimeoutError:
+            _stats["acquire_timeouts"] += 1
+            raise
+
+        waited = time.perf_counter() - started
+        _acquire_histogram.observe(waited)
+        tracing.record_span("db.acquire", waited)
+        waited_ms = waited * 1000
+        _stats["acquired"] += 1
+        _stats["total_acquire_ms"] += waited_ms
+        _stats["max_acquire_ms"] = max(_stats["max_acquire_ms"], waited_ms)
+        if waited_ms > SLOW_ACQUIRE_MS:
+            _stats["slow_acquires"] += 1
+
+        _stats["in_use"] += 1
+        _stats["max_in_use"] = max(_stats["max_in_use"], _stats["in_use"])
+        return conn
+
+    async def __aexit__(self, *exc):
+        _stats["in_use"] -= 1
+        return await self._ctx.__aexit__(*exc)
+
+
+class InstrumentedPool:
+    """
+    asyncpg pool whose `async with pool.acquire()` is timed (see get_pool_stats)
+
+    Everything else is delegated to the wrapped pool.
+    """
+
+    def __init__(self, pool: asyncpg.Pool):
+        self._pool = pool
+
+    def acquire(self, *, timeout=None):
+        return _TimedAcquire(self._pool.acquire(timeout=timeout))
+
+    def __getattr__(self, name):
+        return getattr(self._pool, name)
+
+
+def _log_query(record) -> None:
+    _stats["queries"] += 1
+    if record.elapsed is not None:
+        _stats["total_query_ms"] += record.elapsed * 1000
+        # Scheduled with the context of the query, so the span gets the right parent
+        tracing.record_span("db.query", record.elapsed, query=" ".join(record.query.split())[:200])
+
+    now = int(time.monotonic())
+    if _query_rate and _query_rate[-1][0] == now:
+        _query_rate[-1][1] += 1
+    else:
+        _query_rate.append([now, 1])
+        while _query_rate[0][0] <= now - RATE_WINDOW:
+            _query_rate.popleft()
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """Per-connection setup, run once when the pool opens a connection"""
+    if hasattr(conn, "add_query_logger"):
+        conn.add_query_logger(_log_query)
 
 
 async def init_pool() -> asyncpg.Pool:
@@ -18,16 +130,29 @@ async def init_pool() -> asyncpg.Pool:
     if _pool is not None:
         return _pool
 
-    logger.info(f"Connecting to PostgreSQL: {POSTGRES_DSN}")
+    logger.info(
+        "Connecting to PostgreSQL: %s (pool %s-%s)", POSTGRES_DSN, DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE
+    )
 
-    _pool = await asyncpg.create_pool(
+    _pool = InstrumentedPool(await asyncpg.create_pool(
         dsn=POSTGRES_DSN,
-        min_size=1,
-        max_size=10,
-        timeout=60,
-    )
+        min_size=DB_POOL_MIN_SIZE,
+        max_size=DB_POOL_MAX_SIZE,
+        max_queries=DB_MAX_QUERIES,
+        max_inactive_connection_lifetime=DB_MAX_INACTIVE_LIFETIME,
+        init=_init_connection,
+        statement_cache_size=DB_STATEMENT_CACHE_SIZE,
+        timeout=DB_CONNECT_TIMEOUT,
+        command_timeout=DB_COMMAND_TIMEOUT or None,
+    ))
+
+    await run_migrations(_pool)
+    await ensure_timesheet_partitions(_pool)
+
+    # Connections opened before the migrations may have cached statements
+    # and type info for the old schema; start from fresh ones
+    await _pool.expire_connections()
 
-    await _create_schema()
     logger.info("Postgres pool initialized & schema ensured.")
     return _pool
 
@@ -38,60 +163,34 @@ def get_pool() -> asyncpg.Pool:
     return _pool
 
 
-async def _create_schema():
-    pool = get_pool()
-    async with pool.acquire() as conn:
-        # users
-        await conn.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            user_id SERIAL PRIMARY KEY,
-            username VARCHAR(100) UNIQUE NOT NULL,
-            password_hash VARCHAR(255) NOT NULL,
-            display_name VARCHAR(200)
-        );
-        """)
-
-        # invites for first-time onboarding
-        await conn.execute("""
-        CREATE TABLE IF NOT EXISTS invites (
-            code VARCHAR(100) PRIMARY KEY,
-            role VARCHAR(50) DEFAULT 'user',
-            created_at TIMESTAMPTZ DEFAULT NOW(),
-            used BOOLEAN DEFAULT false,
-            used_by INT REFERENCES users(user_id),
-            used_at TIMESTAMPTZ
-        );
-        """)
-
-        # sessions with pending clarifications
-        await conn.execute("""
-        CREATE TABLE IF NOT EXISTS sessions (
-            external_id TEXT PRIMARY KEY,
-            user_id INT REFERENCES users(user_id),
-            state VARCHAR(50) NOT NULL,
-            temp_username VARCHAR(100),
-            temp_display_name VARCHAR(200),
-            invite_code VARCHAR(100),
-            pending_action VARCHAR(50),
-            pending_entries JSONB,
-            updated_at TIMESTAMPTZ DEFAULT NOW()
-        );
-        """)
-
-        # timesheet data
-        await conn.execute("""
-        CREATE TABLE IF NOT EXISTS timesheet (
-            entry_id SERIAL PRIMARY KEY,
-            user_id INT REFERENCES users(user_id),
-            entry_date DATE,
-            project VARCHAR(255),
-            task TEXT,
-            hours FLOAT,
-            task_type VARCHAR(100),
-            raw_msg TEXT,
-            created_at TIMESTAMPTZ DEFAULT NOW(),
-            updated_at TIMESTAMPTZ
-        );
-        """)
-
-        logger.info("Database schema ensured.")
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Pool counters for sizing the pool under load
+
+    Returns:
+        Dict with pool size/idle/in-use connections, acquire latency
+        (avg/max ms, slow acquires, timeouts), query count, average query
+        time and queries per second over the last RATE_WINDOW seconds
+    """
+    acquired = _stats["acquired"]
+    queries = _stats["queries"]
+
+    now = int(time.monotonic())
+    recent = sum(count for second, count in _query_rate if second > now - RATE_WINDOW)
+
+    return {
+        "min_size": DB_POOL_MIN_SIZE,
+        "max_size": DB_POOL_MAX_SIZE,
+        "size": _pool.get_size() if _pool else 0,
+        "idle": _pool.get_idle_size() if _pool else 0,
+        "in_use": _stats["in_use"],
+        "max_in_use": _stats["max_in_use"],
+        "acquired": acquired,
+        "avg_acquire_ms": _stats["total_acquire_ms"] / acquired if acquired else 0.0,
+        "max_acquire_ms": _stats["max_acquire_ms"],
+        "slow_acquires": _stats["slow_acquires"],
+        "acquire_timeouts": _stats["acquire_timeouts"],
+        "queries": queries,
+        "avg_query_ms": _stats["total_query_ms"] / queries if queries else 0.0,
+        "queries_per_sec": recent / RATE_WINDOW,
+    }
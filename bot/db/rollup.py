@@ -0,0 +1,95 @@
+"""
+bot/db/rollup.py - Rebuild / verify timesheet_daily_rollup from raw entries
+"""
+
+import logging
+from typing import List
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+_ROLLUP_FROM_TIMESHEET = """
+    SELECT user_id, entry_date, COALESCE(project, '') AS project,
+           COALESCE(task_type, '') AS task_type,
+           SUM(COALESCE(hours, 0)) AS hours, COUNT(*)::int AS entry_count
+    FROM timesheet
+    WHERE user_id IS NOT NULL
+    GROUP BY 1, 2, 3, 4
+"""
+
+
+async def mark_rollup_changed(conn: asyncpg.Connection) -> None:
+    """
+    Bump the rollup change counter after a long write transaction commits
+
+    The trigger bumps it when each statement runs, so a report loaded before
+    the transaction committed could otherwise stay cached with the new value.
+
+    Args:
+        conn: Any connection (outside the finished transaction)
+    """
+    await conn.fetchval("SELECT nextval('timesheet_rollup_changes')")
+
+
+async def rebuild_rollup(pool: asyncpg.Pool) -> int:
+    """
+    Recompute the rollup table from scratch
+
+    Writes to timesheet are blocked (SHARE lock) while it runs.
+
+    Returns:
+        Number of rollup rows written
+    """
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            await conn.execute("LOCK TABLE timesheet IN SHARE MODE")
+            await conn.execute("TRUNCATE timesheet_daily_rollup")
+            result = await conn.execute(f"""
+                INSERT INTO timesheet_daily_rollup
+                    (user_id, entry_date, project, task_type, hours, entry_count)
+                {_ROLLUP_FROM_TIMESHEET}
+            """)
+        await mark_rollup_changed(conn)
+
+    count = int(result.split()[-1])
+    logger.info("Rebuilt timesheet_daily_rollup with %s rows", count)
+    return count
+
+
+async def verify_rollup(pool: asyncpg.Pool, tolerance: float = 1e-6) -> List[dict]:
+    """
+    Compare the rollup table with totals recomputed from raw entries
+
+    Args:
+        pool: Database pool
+        tolerance: Allowed floating-point difference in hours
+
+    Returns:
+        Mismatching keys with expected/actual hours and counts (empty if consistent)
+    """
+    async with pool.acquire() as conn:
+        async with conn.transaction(isolation="repeatable_read", readonly=True):
+            rows = await conn.fetch(f"""
+                SELECT COALESCE(e.user_id, r.user_id) AS user_id,
+                       COALESCE(e.entry_date, r.entry_date) AS entry_date,
+                       COALESCE(e.project, r.project) AS project,
+                       COALESCE(e.task_type, r.task_type) AS task_type,
+                       e.hours AS expected_hours, r.hours AS actual_hours,
+                       e.entry_count AS expected_count, r.entry_count AS actual_count
+                FROM ({_ROLLUP_FROM_TIMESHEET}) e
+                FULL OUTER JOIN timesheet_daily_rollup r
+                    USING (user_id, entry_date, project, task_type)
+                WHERE e.user_id IS NULL
+                   OR r.user_id IS NULL
+                   OR e.entry_count <> r.entry_count
+                   OR ABS(e.hours - r.hours) > $1
+                ORDER BY 1, 2, 3, 4
+            """, tolerance)
+
+    mismatches = [dict(r) for r in rows]
+    if mismatches:
+        logger.warning("timesheet_daily_rollup has %s mismatching rows", len(mismatches))
+    else:
+        logger.info("timesheet_daily_rollup matches raw entries")
+    return mismatches
@@ -5,50 +5,58 @@ bot/db/sessions.py - Session state management
 import logging
 import json
 from typing import Optional
+from bot.cache import TTLCache
+from bot.config import SESSION_CACHE_SIZE, SESSION_CACHE_TTL
+from bot.db import statements
 from bot.db.pool import get_pool
+from bot.metrics import db_call
 
 logger = logging.getLogger(__name__)
 
+# No-op update on conflict so RETURNING yields the existing row too
+GET_OR_CREATE_SESSION = statements.register("get_or_create_session", """
+    INSERT INTO sessions (external_id, state)
+    VALUES ($1, 'NEW')
+    ON CONFLICT (external_id) DO UPDATE SET external_id = EXCLUDED.external_id
+    RETURNING *, (xmax = 0) AS created
+""")
 
+# external_id -> session row; written through on every update
+_cache = TTLCache(maxsize=SESSION_CACHE_SIZE, ttl=SESSION_CACHE_TTL)
+
+
+@db_call
 async def get_or_create_session(external_id: str) -> dict:
     """
     Get existing session or create new one
     
+    Served from the in-process cache when possible; a miss costs a
+    single INSERT ... ON CONFLICT ... RETURNING round trip.
+    
     Args:
         external_id: Teams user ID (stable per user)
     
     Returns:
         Session dict with all fields
     """
+    cached = _cache.get(external_id)
+    if cached is not None:
+        return dict(cached)
+    
     pool = get_pool()
     
     async with pool.acquire() as conn:
-        # Try to get existing
-        row = await conn.fetchrow(
-            "SELECT * FROM sessions WHERE external_id = $1",
-            external_id
-        )
-        
-        if row:
-            return dict(row)
-        
-        # Create new
-        await conn.execute(
-            "INSERT INTO sessions (external_id, state) VALUES ($1, $2)",
-            external_id,
-            "NEW"
-        )
-        
-        # Fetch and return
-        row = await conn.fetchrow(
-            "SELECT * FROM sessions WHERE external_id = $1",
-            external_id
-        )
-        
-        logger.info(f"Created new session: {external_id}")
-        return dict(row)
+        row = await statements.fetchrow(conn, GET_OR_CREATE_SESSION, external_id)
+    
+    session = dict(row)
+    if session.pop("created"):
+        logger.info("Created new session: %s", external_id)
+    
+    _cache.set(external_id, session)
+    return dict(session)
 
 
+@db_call
 async def update_session(external_id: str, **fields) -> None:
     """
     Update session fields
@@ -91,9 +99,40 @@ async def update_session(external_id: str, **fields) -> None:
         UPDATE sessions
         SET {", ".join(set_parts)}
         WHERE external_id = ${where_param}
+        RETURNING *
     """
     
-    async with pool.acquire() as conn:
-        await conn.execute(query, *values)
+    try:
+        async with pool.acquire() as conn:
+            row = await conn.fetchrow(query, *values)
+    except Exception:
+        # Unknown outcome - make the next read go to the database
+        _cache.pop(external_id)
+        raise
     
-    logger.debug(f"Updated session: {external_id} with {list(fields.keys())}")
\ No newline at end of file
+    cache_session_row(external_id, row)
+    logger.debug("Updated session: %s with %s", external_id, list(fields.keys()))
+
+
+def cache_session_row(external_id: str, row) -> None:
+    """
+    Write a freshly read/updated sessions row through to the cache
+    
+    Args:
+        external_id: Session ID
+        row: Full sessions row (Record or dict), or None to invalidate
+    """
+    if row is None:
+        _cache.pop(external_id)
+    else:
+        _cache.set(external_id, dict(row))
+
+
+def invalidate_session(external_id: str) -> None:
+    """Drop a session from the in-process cache"""
+    _cache.pop(external_id)
+
+
+def get_session_cache_stats() -> dict:
+    """Session cache size and hit-rate counters"""
+    return _cache.stats()
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+bot/db/statements.py - Registry of hot queries
+
+Modules register their hot queries at import time:
+
+    LAST_ENTRY = register("last_entry", "SELECT ... WHERE user_id = $1 ...")
+
+and run them through fetch/fetchrow/fetchval, which send the SQL text.
+asyncpg keeps a per-connection cache of prepared statements keyed by that
+text (create_pool(statement_cache_size=DB_STATEMENT_CACHE_SIZE)), so each
+query is parsed and planned once per connection and executed from then on.
+Nothing holds PreparedStatement objects across acquires: those are bound
+to the pool's connection proxy and stop working once it is released.
+
+The cache is not warmed when a connection opens. asyncpg's public
+Connection.prepare() bypasses the statement cache (it prepares a separate,
+uncached statement), so preparing the registry in the pool's init hook
+would only double the work. Each hot query is therefore prepared on its
+first run on a connection.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+# name -> SQL
+_registry: Dict[str, str] = {}
+
+# name -> runs
+_runs: Dict[str, int] = {}
+
+
+def register(name: str, sql: str) -> str:
+    """
+    Register a hot query under a unique name
+
+    Args:
+        name: Statement name
+        sql: Query text with $n parameters
+
+    Returns:
+        The name (keep it as a module constant)
+    """
+    existing = _registry.get(name)
+    if existing is not None and existing != sql:
+        raise ValueError(f"Statement {name!r} already registered with different SQL")
+    _registry[name] = sql
+    return name
+
+
+def _sql(name: str) -> str:
+    _runs[name] = _runs.get(name, 0) + 1
+    return _registry[name]
+
+
+async def fetch(conn, name: str, *args, timeout: Optional[float] = None) -> List[asyncpg.Record]:
+    return await conn.fetch(_sql(name), *args, timeout=timeout)
+
+
+async def fetchrow(conn, name: str, *args, timeout: Optional[float] = None) -> Optional[asyncpg.Record]:
+    return await conn.fetchrow(_sql(name), *args, timeout=timeout)
+
+
+async def fetchval(conn, name: str, *args, timeout: Optional[float] = None) -> Any:
+    return await conn.fetchval(_sql(name), *args, timeout=timeout)
+
+
+def get_statement_stats() -> Dict[str, Any]:
+    """
+    Statement registry counters
+
+    Returns:
+        Dict with registered statements and runs per statement
+    """
+    return {
+        "registered": len(_registry),
+        "runs": dict(_runs),
+    }
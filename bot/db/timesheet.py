@@ -5,11 +5,32 @@ bot/db/timesheet.py - Timesheet entry CRUD operations
 import logging
 from datetime import date
 from typing import Optional, List, Iterable
+from bot.db import statements
 from bot.db.pool import get_pool
+from bot.metrics import db_call
+from bot.db.analytics import invalidate_dates
+from bot.db.sessions import cache_session_row, invalidate_session
 
 logger = logging.getLogger(__name__)
 
+LAST_ENTRY = statements.register("last_entry", """
+    SELECT * FROM timesheet
+    WHERE user_id = $1
+    ORDER BY created_at DESC
+    LIMIT 1
+""")
 
+LAST_PROJECTS = statements.register("last_projects", """
+    SELECT project FROM timesheet
+    WHERE user_id = $1
+    AND project IS NOT NULL
+    AND LENGTH(TRIM(project)) > 0
+    ORDER BY created_at DESC
+    LIMIT 5
+""")
+
+
+@db_call
 async def save_timesheet_entry(
     user_id: int,
     entry_date: date,
@@ -35,7 +56,7 @@ async def save_timesheet_entry(
         raise ValueError(f"entry_date must be date object, got {type(entry_date)}")
     
     if hours <= 0:
-        logger.warning(f"Skipping entry with zero/negative hours: {hours}")
+        logger.warning("Skipping entry with zero/negative hours: %s", hours)
         return
     
     pool = get_pool()
@@ -46,9 +67,96 @@ async def save_timesheet_entry(
             VALUES ($1, $2, $3, $4, $5, $6, $7, NOW())
         """, user_id, entry_date, project, task, hours, task_type, raw_msg)
         
-        logger.info(f"Saved entry for user {user_id}: {hours}h on {entry_date}")
+        logger.info("Saved entry for user %s: %sh on %s", user_id, hours, entry_date)
+    
+    invalidate_dates([entry_date])
+
+
+@db_call
+async def save_timesheet_entries(
+    user_id: int,
+    entries: List[dict],
+    raw_msg: str,
+    clear_session: Optional[str] = None,
+) -> List[int]:
+    """
+    Save several timesheet entries in one transaction and one round trip
+    
+    Either all entries are written or none are. When clear_session is
+    given, that session's pending_action/pending_entries are cleared in
+    the same transaction.
+    
+    Args:
+        user_id: User ID
+        entries: Entry dicts with keys date, project, task, hours, task_type
+        raw_msg: Original user message
+        clear_session: external_id whose pending entries should be cleared
+    
+    Returns:
+        entry_ids of the inserted rows
+    """
+    rows = []
+    for entry in entries:
+        entry_date = entry.get("date")
+        if not isinstance(entry_date, date):
+            raise ValueError(f"entry_date must be date object, got {type(entry_date)}")
+        
+        hours = entry.get("hours") or 0
+        if hours <= 0:
+            logger.warning("Skipping entry with zero/negative hours: %s", hours)
+            continue
+        
+        rows.append((
+            entry_date,
+            entry.get("project", ""),
+            entry.get("task", ""),
+            float(hours),
+            entry.get("task_type", "Unknown"),
+        ))
+    
+    pool = get_pool()
+    session_row = None
+    
+    try:
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                entry_ids = []
+                if rows:
+                    dates, projects, tasks, hours_list, task_types = zip(*rows)
+                    # clock_timestamp() keeps created_at distinct per row, so
+                    # "last entry" stays well-defined within one batch
+                    entry_ids = await conn.fetch("""
+                        INSERT INTO timesheet (user_id, entry_date, project, task, hours, task_type, raw_msg, created_at)
+                        SELECT $1, d, p, t, h, tt, $7, clock_timestamp()
+                        FROM unnest($2::date[], $3::text[], $4::text[], $5::float8[], $6::text[])
+                            AS u(d, p, t, h, tt)
+                        RETURNING entry_id
+                    """, user_id, list(dates), list(projects), list(tasks),
+                        list(hours_list), list(task_types), raw_msg)
+                    entry_ids = [r["entry_id"] for r in entry_ids]
+                
+                if clear_session:
+                    session_row = await conn.fetchrow("""
+                        UPDATE sessions
+                        SET pending_action = NULL, pending_entries = NULL, updated_at = NOW()
+                        WHERE external_id = $1
+                        RETURNING *
+                    """, clear_session)
+    except Exception:
+        if clear_session:
+            invalidate_session(clear_session)
+        raise
+    
+    if clear_session:
+        cache_session_row(clear_session, session_row)
+    
+    invalidate_dates(row[0] for row in rows)
+    
+    logger.info("Saved %s entries for user %s", len(entry_ids), user_id)
+    return entry_ids
 
 
+@db_call
 async def get_last_entry(user_id: int) -> Optional[dict]:
     """
     Get user's most recent timesheet entry
@@ -62,16 +170,12 @@ async def get_last_entry(user_id: int) -> Optional[dict]:
     pool = get_pool()
     
     async with pool.acquire() as conn:
-        row = await conn.fetchrow("""
-            SELECT * FROM timesheet
-            WHERE user_id = $1
-            ORDER BY created_at DESC
-            LIMIT 1
-        """, user_id)
+        row = await statements.fetchrow(conn, LAST_ENTRY, user_id)
         
         return dict(row) if row else None
 
 
+@db_call
 async def get_last_project(user_id: int) -> Optional[str]:
     """
     Get user's most recent non-empty project name
@@ -87,14 +191,7 @@ async def get_last_project(user_id: int) -> Optional[str]:
     pool = get_pool()
     
     async with pool.acquire() as conn:
-        rows = await conn.fetch("""
-            SELECT project FROM timesheet
-            WHERE user_id = $1
-            AND project IS NOT NULL
-            AND LENGTH(TRIM(project)) > 0
-            ORDER BY created_at DESC
-            LIMIT 5
-        """, user_id)
+        rows = await statements.fetch(conn, LAST_PROJECTS, user_id)
         
         if not rows:
             return None
@@ -103,12 +200,13 @@ async def get_last_project(user_id: int) -> Optional[str]:
         for row in rows:
             project = row.get("project", "").strip()
             if project:
-                logger.debug(f"Found last project for user {user_id}: {project}")
+                logger.debug("Found last project for user %s: %s", user_id, project)
                 return project
         
         return None
 
 
+@db_call
 async def update_last_entry_hours(user_id: int, new_hours: float) -> bool:
     """
     Update hours on user's most recent entry
@@ -123,28 +221,30 @@ async def update_last_entry_hours(user_id: int, new_hours: float) -> bool:
         True if updated, False if no entry foundS
     """
     if new_hours <= 0:
-        logger.warning(f"Cannot update entry to {new_hours}h (must be > 0)")
+        logger.warning("Cannot update entry to %sh (must be > 0)", new_hours)
         return False
     
     pool = get_pool()
     
     async with pool.acquire() as conn:
-        result = await conn.execute("""
+        entry_date = await conn.fetchval("""
             UPDATE timesheet
             SET hours = $1, updated_at = NOW()
-            WHERE entry_id = (
-                SELECT entry_id FROM timesheet
+            WHERE (entry_id, entry_date) = (
+                SELECT entry_id, entry_date FROM timesheet
                 WHERE user_id = $2
                 ORDER BY created_at DESC
                 LIMIT 1
             )
+            RETURNING entry_date
         """, new_hours, user_id)
         
-        success = result != "UPDATE 0"
+        success = entry_date is not None
         
         if success:
-            logger.info(f"Updated last entry for user {user_id} to {new_hours}h")
+            invalidate_dates([entry_date])
+            logger.info("Updated last entry for user %s to %sh", user_id, new_hours)
         else:
-            logger.warning(f"No entry found to update for user {user_id}")
+            logger.warning("No entry found to update for user %s", user_id)
         
         return success
\ No newline at end of file
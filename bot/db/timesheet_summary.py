@@ -1,29 +1,42 @@
 from datetime import datetime, timedelta
+from bot.db import statements
 from bot.db.pool import get_pool
+from bot.metrics import db_call
 
+# Summaries read timesheet_daily_rollup (kept current by triggers on
+# timesheet); total_hours is the sum over all returned rows.
+
+WEEKLY_SUMMARY = statements.register("weekly_summary", """
+    SELECT entry_date, project, task_type, hours, entry_count,
+           SUM(hours) OVER () AS total_hours
+    FROM timesheet_daily_rollup
+    WHERE user_id = $1 AND entry_date >= $2
+    ORDER BY entry_date, project, task_type
+""")
+
+TODAY_SUMMARY = statements.register("today_summary", """
+    SELECT entry_date, project, task_type, hours, entry_count,
+           SUM(hours) OVER () AS total_hours
+    FROM timesheet_daily_rollup
+    WHERE user_id = $1 AND entry_date = $2
+    ORDER BY project, task_type
+""")
+
+@db_call
 async def weekly_summary(user_id: int):
     pool = get_pool()
     today = datetime.now().date()
     monday = today - timedelta(days=today.weekday())
 
     async with pool.acquire() as conn:
-        rows = await conn.fetch("""
-            SELECT entry_date, project, task, hours
-            FROM timesheet
-            WHERE user_id = $1 AND entry_date >= $2
-            ORDER BY entry_date
-        """, user_id, monday)
+        rows = await statements.fetch(conn, WEEKLY_SUMMARY, user_id, monday)
         return [dict(r) for r in rows]
 
 
+@db_call
 async def today_summary(user_id: int):
     pool = get_pool()
     today = datetime.now().date()
     async with pool.acquire() as conn:
-        rows = await conn.fetch("""
-            SELECT entry_date, project, task, hours 
-            FROM timesheet
-            WHERE user_id = $1 AND entry_date = $2
-            ORDER BY entry_date
-        """, user_id, today)
+        rows = await statements.fetch(conn, TODAY_SUMMARY, user_id, today)
         return [dict(r) for r in rows]
@@ -2,40 +2,60 @@
 bot/db/users.py - User CRUD operations
 """
 
-import bcrypt
 import logging
 from typing import Optional
+from bot.db import statements
 from bot.db.pool import get_pool
+from bot.metrics import db_call
+from bot.hashing import hash_password, check_password
 
 logger = logging.getLogger(__name__)
 
+USER_BY_USERNAME = statements.register(
+    "user_by_username",
+    "SELECT * FROM users WHERE username = $1",
+)
 
-async def create_user(username: str, display_name: str, password: str) -> int:
+USER_ROLE = statements.register(
+    "user_role",
+    "SELECT role FROM users WHERE user_id = $1",
+)
+
+
+@db_call
+async def create_user(
+    username: str,
+    display_name: str,
+    password: str,
+    role: str = "user",
+) -> int:
     """
     Create new user and return user_id
     
     Args:
         username: Username (must be unique)
         display_name: Display name (e.g., "Adhish Pawar")
-        password: Plain text password (will be bcrypt hashed)
+        password: Plain text password (bcrypt hashed on the hashing pool)
+        role: "user" or "admin" (usually from the invite code)
     
     Returns:
         user_id of created user
     """
     pool = get_pool()
-    hashed = bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=12)).decode()
+    hashed = await hash_password(password)
     
     async with pool.acquire() as conn:
         user_id = await conn.fetchval("""
-            INSERT INTO users (username, display_name, password_hash)
-            VALUES ($1, $2, $3)
+            INSERT INTO users (username, display_name, password_hash, role)
+            VALUES ($1, $2, $3, $4)
             RETURNING user_id
-        """, username, display_name, hashed)
+        """, username, display_name, hashed, role)
         
-        logger.info(f"Created user: {username} (id={user_id})")
+        logger.info("Created user: %s (id=%s, role=%s)", username, user_id, role)
         return user_id
 
 
+@db_call
 async def get_user_by_username(username: str) -> Optional[dict]:
     """
     Get user record by username
@@ -49,13 +69,11 @@ async def get_user_by_username(username: str) -> Optional[dict]:
     pool = get_pool()
     
     async with pool.acquire() as conn:
-        row = await conn.fetchrow(
-            "SELECT * FROM users WHERE username = $1",
-            username
-        )
+        row = await statements.fetchrow(conn, USER_BY_USERNAME, username)
         return dict(row) if row else None
 
 
+@db_call
 async def verify_user_password(username: str, password: str) -> Optional[dict]:
     """
     Verify password and return user if correct
@@ -70,15 +88,33 @@ async def verify_user_password(username: str, password: str) -> Optional[dict]:
     user = await get_user_by_username(username)
     
     if not user:
-        logger.warning(f"User not found: {username}")
+        logger.warning("User not found: %s", username)
         return None
     
     try:
-        if bcrypt.checkpw(password.encode(), user["password_hash"].encode()):
-            logger.info(f"Password verified for: {username}")
+        if await check_password(password, user["password_hash"]):
+            logger.info("Password verified for: %s", username)
             return user
     except Exception as e:
-        logger.error(f"Password verification error: {e}")
+        logger.error("Password verification error: %s", e)
     
-    logger.warning(f"Invalid password for: {username}")
-    return None
\ No newline at end of file
+    logger.warning("Invalid password for: %s", username)
+    return None
+
+
+@db_call
+async def is_admin(user_id: int) -> bool:
+    """
+    Check whether a user has the admin role
+    
+    Args:
+        user_id: User ID
+    
+    Returns:
+        True if the user is an admin
+    """
+    pool = get_pool()
+    
+    async with pool.acquire() as conn:
+        role = await statements.fetchval(conn, USER_ROLE, user_id)
+        return role == "admin"
@@ -0,0 +1,124 @@
+"""
+bot/hashing.py - bcrypt hashing/verification on a dedicated thread pool
+
+bcrypt releases the GIL, so a small thread pool keeps the event loop free
+while logins are verified. The pool size is also the concurrency cap;
+callers beyond it wait in the queue and show up in the queue-depth stats.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import bcrypt
+
+from bot.config import BCRYPT_ROUNDS, HASH_WORKERS
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+_stats = {
+    "in_flight": 0,
+    "completed": 0,
+    "max_queue_depth": 0,
+    "total_wait_ms": 0.0,
+    "total_hash_ms": 0.0,
+}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=HASH_WORKERS,
+            thread_name_prefix="bcrypt",
+        )
+    return _executor
+
+
+async def _run(fn: Callable[..., Any], *args) -> Any:
+    """Run a bcrypt call on the hashing pool and record queue/run times"""
+    loop = asyncio.get_running_loop()
+    submitted = time.perf_counter()
+    started = None
+
+    def job():
+        nonlocal started
+        started = time.perf_counter()
+        return fn(*args)
+
+    _stats["in_flight"] += 1
+    _stats["max_queue_depth"] = max(
+        _stats["max_queue_depth"],
+        _stats["in_flight"] - HASH_WORKERS,
+    )
+    try:
+        return await loop.run_in_executor(_get_executor(), job)
+    finally:
+        finished = time.perf_counter()
+        _stats["in_flight"] -= 1
+        _stats["completed"] += 1
+        if started is not None:
+            _stats["total_wait_ms"] += (started - submitted) * 1000
+            _stats["total_hash_ms"] += (finished - started) * 1000
+
+
+async def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
+    """
+    Hash a password with bcrypt off the event loop
+
+    Args:
+        password: Plain text password
+        rounds: bcrypt cost factor (default BCRYPT_ROUNDS)
+
+    Returns:
+        bcrypt hash as str
+    """
+    hashed = await _run(bcrypt.hashpw, password.encode(), bcrypt.gensalt(rounds=rounds))
+    return hashed.decode()
+
+
+async def check_password(password: str, password_hash: str) -> bool:
+    """
+    Verify a password against a bcrypt hash off the event loop
+
+    Args:
+        password: Plain text password
+        password_hash: Stored bcrypt hash
+
+    Returns:
+        True if the password matches
+    """
+    return await _run(bcrypt.checkpw, password.encode(), password_hash.encode())
+
+
+def get_hashing_stats() -> Dict[str, Any]:
+    """
+    Get hashing pool counters
+
+    Returns:
+        Dict with workers, running/queued counts, peak queue depth and
+        average wait/hash times in ms
+    """
+    completed = _stats["completed"]
+    return {
+        "workers": HASH_WORKERS,
+        "rounds": BCRYPT_ROUNDS,
+        "running": min(_stats["in_flight"], HASH_WORKERS),
+        "queue_depth": max(_stats["in_flight"] - HASH_WORKERS, 0),
+        "max_queue_depth": _stats["max_queue_depth"],
+        "completed": completed,
+        "avg_wait_ms": _stats["total_wait_ms"] / completed if completed else 0.0,
+        "avg_hash_ms": _stats["total_hash_ms"] / completed if completed else 0.0,
+    }
+
+
+def shutdown_hashing_executor() -> None:
+    """Stop the hashing pool (waits for in-flight hashes)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
@@ -1,9 +1,170 @@
+"""
+bot/logging.py - Non-blocking logging setup
+
+setup_logging() puts a QueueHandler on the root logger: the event loop
+only appends the (unformatted) record to a bounded queue, and a
+QueueListener thread formats it - JSON lines by default - and writes it.
+When the queue is full the record is dropped and counted rather than
+blocking a turn. The entry points call it (bot/app/main.py's __main__ and
+on_startup, bot/app/serve.py workers); importing the bot leaves logging
+alone.
+
+Log calls use %-style arguments, so messages below the level are never
+built. LOG_SAMPLE_RATES keeps a fraction of the DEBUG/INFO records of
+noisy loggers; warnings and errors are always kept. User message text is
+logged through user_text(), which prints "<N chars>" unless
+LOG_REDACT_MESSAGES is turned off.
+
+Records are formatted after the call returns, so arguments should not be
+mutated afterwards (log copies or summaries of objects that change;
+user_text() returns such a summary).
+"""
+
+import atexit
+import json
 import logging
+import queue
+import random
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+from bot.config import (
+    LOG_LEVEL,
+    LOG_FORMAT,
+    LOG_QUEUE_SIZE,
+    LOG_SAMPLE_RATES,
+    LOG_REDACT_MESSAGES,
+)
+from bot.tracing import install_log_correlation
+
+# Stamp %(turn_id)s on every record (see bot/tracing.py)
+install_log_correlation()
 
 logger = logging.getLogger("timesheet-bot")
-logger.setLevel(logging.INFO)
 
-handler = logging.StreamHandler()
-formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] %(message)s")
-handler.setFormatter(formatter)
-logger.addHandler(handler)
+TEXT_FORMAT = "[%(asctime)s] [%(levelname)s] [%(turn_id)s] %(message)s"
+
+_listener: Optional[QueueListener] = None
+_stats = {"queued": 0, "dropped": 0, "sampled_out": 0}
+
+
+def user_text(text: Any, limit: int = 100) -> str:
+    """
+    Loggable form of user-provided text (messages, task descriptions)
+
+    Built right away, not when the record is formatted on the listener
+    thread, so callers can keep mutating `text` (e.g. entry dicts).
+
+    Args:
+        text: The text (anything with a str())
+        limit: Characters shown when redaction is off
+    """
+    text = str(text)
+    if LOG_REDACT_MESSAGES:
+        return f"<{len(text)} chars>"
+    return text[:limit]
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "turn_id": getattr(record, "turn_id", "-"),
+            "pid": record.process,
+        }
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _SamplingFilter(logging.Filter):
+    """Keep LOG_SAMPLE_RATES[logger prefix] of the records below WARNING"""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._by_logger: Dict[str, float] = {}
+
+    def _rate(self, name: str) -> float:
+        rate = self._by_logger.get(name)
+        if rate is None:
+            matches = [p for p in self.rates if name == p or name.startswith(p + ".")]
+            rate = self.rates[max(matches, key=len)] if matches else 1.0
+            self._by_logger[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self._rate(record.name)
+        if rate >= 1.0 or random.random() < rate:
+            return True
+        _stats["sampled_out"] += 1
+        return False
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting happens on the listener thread; queue the record as is
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            _stats["queued"] += 1
+        except queue.Full:
+            _stats["dropped"] += 1
+
+
+def setup_logging() -> None:
+    """Send every record through the queue to a background writer (idempotent)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler()
+    if LOG_FORMAT == "json":
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    records = queue.Queue(LOG_QUEUE_SIZE)
+    handler = _NonBlockingQueueHandler(records)
+    handler.addFilter(_SamplingFilter(LOG_SAMPLE_RATES))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(LOG_LEVEL)
+
+    _listener = QueueListener(records, stream)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Write out queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        try:
+            _listener.stop()
+        except queue.Full:
+            pass  # no room for the stop sentinel; the thread is a daemon
+        _listener = None
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    """Records queued, dropped (queue full) and sampled out"""
+    return {
+        "format": LOG_FORMAT,
+        "queue_size": LOG_QUEUE_SIZE,
+        "pending": _listener.queue.qsize() if _listener is not None else 0,
+        **_stats,
+    }
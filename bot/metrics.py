@@ -0,0 +1,222 @@
+"""
+bot/metrics.py - In-process metrics in Prometheus text format
+
+Histograms have fixed buckets chosen up front, so recording is a bisect
+and a few integer increments - no locks (everything records from the
+event loop thread) and no allocation after a label set's first use.
+
+    STAGE_SECONDS    per-stage latency (session lookup, intent, extraction,
+                     each bot/db call as "db.<function>", send_activity, turn)
+    TURNS            turns by session state / pending_action
+    LLM_TOKENS       LLM tokens in and out
+    LLM_CALLS        LLM calls by outcome
+    TURNS_REJECTED   turns answered "busy" because the turn queue was full
+
+render() produces the /metrics payload.
+"""
+
+import functools
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+from bot import tracing
+
+# Seconds; covers cache hits (~1ms) through slow LLM calls (~30s)
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _Family:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        _registry.append(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """Child for one label set (created on first use, then reused)"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+
+
+class Histogram(_Family):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets=DEFAULT_BUCKETS):
+        self.bounds = tuple(sorted(buckets))
+        super().__init__(name, help, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value: float, *labels: str) -> None:
+        self.labels(*labels).observe(value)
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """Observe the duration of the block in seconds"""
+        child = self.labels(*labels)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            child.observe(time.perf_counter() - started)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for values, child in sorted(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.bounds, child.counts):
+                cumulative += count
+                le = _label_str(self.labelnames, values, f'le="{bound:g}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            le = _label_str(self.labelnames, values, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {child.count}")
+            labels = _label_str(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {child.sum:.6f}")
+            lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class Counter(_Family):
+    type = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self.labels(*labels).inc(amount)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for values, child in sorted(self._children.items()):
+            lines.append(f"{self.name}{_label_str(self.labelnames, values)} {child.value:g}")
+        return lines
+
+
+_registry: List[_Family] = []
+
+STAGE_SECONDS = Histogram(
+    "timesheet_bot_stage_seconds",
+    "Latency of each turn stage",
+    ["stage"],
+)
+TURNS = Counter(
+    "timesheet_bot_turns_total",
+    "Turns routed, by session state and pending action",
+    ["state", "pending_action"],
+)
+LLM_TOKENS = Counter(
+    "timesheet_bot_llm_tokens_total",
+    "LLM tokens sent (in) and generated (out)",
+    ["direction"],
+)
+LLM_CALLS = Counter(
+    "timesheet_bot_llm_calls_total",
+    "LLM calls by outcome",
+    ["outcome"],
+)
+TURNS_REJECTED = Counter(
+    "timesheet_bot_turns_rejected_total",
+    "Turns not processed because the turn queue was full",
+)
+
+
+def timed_stage(stage: str) -> Callable:
+    """
+    Decorator recording an async function's latency under STAGE_SECONDS{stage}
+
+    The call is also a tracing span of the same name (when the turn is sampled).
+    """
+    child = STAGE_SECONDS.labels(stage)
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                with tracing.span(stage):
+                    return await fn(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - started)
+        return wrapper
+
+    return decorator
+
+
+def db_call(fn: Callable) -> Callable:
+    """Decorator for bot/db coroutines: STAGE_SECONDS{stage="db.<function>"}"""
+    return timed_stage(f"db.{fn.__name__}")(fn)
+
+
+def record_llm_usage(usage: dict) -> None:
+    """Count tokens from a LangChain usage_metadata dict (input_tokens/output_tokens)"""
+    if not usage:
+        return
+    LLM_TOKENS.labels("in").inc(usage.get("input_tokens", 0))
+    LLM_TOKENS.labels("out").inc(usage.get("output_tokens", 0))
+
+
+def gauge_lines(name: str, help: str, value: float) -> List[str]:
+    """Prometheus lines for a point-in-time value (pool size, queue depth, ...)"""
+    return [f"# HELP {name} {help}", f"# TYPE {name} gauge", f"{name} {value:g}"]
+
+
+def render() -> str:
+    """All registered metrics in Prometheus text exposition format"""
+    lines = []
+    for family in _registry:
+        lines.extend(family.render())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,209 @@
+"""
+bot/nlp/batching.py - Cross-user micro-batching of LLM extraction requests
+
+Requests arriving within a short window are sent as one multi-item prompt
+and the per-item results are fanned back out to the waiting coroutines.
+Items missing from (or malformed in) the batched answer fall back to a
+single-message extraction. The prompt and per-item parser can be swapped,
+so the combined intent + extraction call (bot/nlp/understand.py) is
+batched the same way.
+"""
+
+import asyncio
+import copy
+import json
+import logging
+from datetime import datetime, date
+from typing import List, Dict, Any, Optional, Set, Tuple, Callable, Awaitable
+
+from bot.nlp.llm_client import strip_code_fences
+
+logger = logging.getLogger(__name__)
+
+Entries = List[Dict[str, Any]]
+
+BATCH_EXTRACTION_PROMPT = """
+You are a timesheet entry extractor. Extract work entries from EACH of the numbered user messages below.
+The messages come from different users and are independent of each other.
+
+Output ONLY a valid JSON object mapping each message number to its JSON array of entries.
+No markdown, no backticks, no explanation.
+
+Format:
+{{
+  "1": [
+    {{
+      "date": "YYYY-MM-DD",
+      "hours": 3.5,
+      "task": "testing mobile app",
+      "project": "Glovatrix",
+      "task_type": "Testing"
+    }}
+  ],
+  "2": []
+}}
+
+Rules:
+- "date": Parse relative dates ("today", "yesterday", "monday") to YYYY-MM-DD using that message's date
+- "hours": Extract as float (3h → 3.0, 2.5h → 2.5)
+- "task": Brief description of work done
+- "project": Project name if mentioned, else empty string ""
+- "task_type": One of: Development, Testing, Debugging, Meeting, Research, Documentation, DevOps, or Unknown
+
+Messages:
+{messages}
+
+Output JSON object:
+"""
+
+
+class ExtractionBatcher:
+    """
+    Collects extraction requests for `window_ms` (or until `max_size`
+    distinct messages are waiting) and resolves them with one LLM call.
+
+    Args:
+        call_llm: Coroutine sending a prompt and returning the raw answer text
+        single_extract: Per-item fallback, (message, today) -> entries or None
+        window_ms: How long the first request in a batch waits for company
+        max_size: Flush immediately once this many distinct messages are queued
+        prompt: Multi-item prompt with a {messages} placeholder
+        parse_item: Validates one item of the answer (None if malformed)
+    """
+
+    def __init__(
+        self,
+        call_llm: Callable[[str], Awaitable[str]],
+        single_extract: Callable[[str, date], Awaitable[Optional[Entries]]],
+        window_ms: int = 30,
+        max_size: int = 16,
+        prompt: str = BATCH_EXTRACTION_PROMPT,
+        parse_item: Optional[Callable[[Any], Any]] = None,
+    ):
+        self._call_llm = call_llm
+        self._single_extract = single_extract
+        self.window = window_ms / 1000
+        self.prompt = prompt
+        self.parse_item = parse_item or _parse_item
+        self.max_size = max_size
+
+        # (message, today) -> futures waiting on that exact item
+        self._pending: Dict[Tuple[str, date], List[asyncio.Future]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Running batch tasks; the loop only keeps weak references
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.stats = {
+            "requests": 0,
+            "batches": 0,
+            "batched_items": 0,
+            "fallbacks": 0,
+        }
+
+    async def submit(self, user_message: str, today_date: date) -> Optional[Entries]:
+        """
+        Queue a message for the next batch and wait for its entries
+
+        Returns:
+            List of entry dicts, or None if extraction failed
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault((user_message, today_date), []).append(future)
+        self.stats["requests"] += 1
+
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Hand the queued items to a background batch task"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._pending:
+            return
+
+        batch = self._pending
+        self._pending = {}
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: Dict[Tuple[str, date], List[asyncio.Future]]) -> None:
+        items = list(batch.items())
+        self.stats["batches"] += 1
+        self.stats["batched_items"] += len(items)
+
+        results: Dict[int, Entries] = {}
+        if len(items) > 1:
+            try:
+                results = await self._extract_batch([key for key, _ in items])
+            except Exception as e:
+                logger.error("Batched extraction failed for %s items: %s", len(items), e)
+
+        # Anything the batch didn't answer is retried on its own
+        missing = [i for i in range(len(items)) if i not in results]
+        if missing:
+            if len(items) > 1:
+                self.stats["fallbacks"] += len(missing)
+            singles = await asyncio.gather(
+                *(self._single_extract(*items[i][0]) for i in missing),
+                return_exceptions=True,
+            )
+            for i, entries in zip(missing, singles):
+                results[i] = None if isinstance(entries, BaseException) else entries
+
+        # Each waiter gets its own copy; callers mutate entries in place
+        for i, (_, futures) in enumerate(items):
+            for future in futures:
+                if not future.done():
+                    future.set_result(copy.deepcopy(results[i]))
+
+    async def _extract_batch(self, keys: List[Tuple[str, date]]) -> Dict[int, Entries]:
+        """Run the multi-item prompt; returns only the items that parsed cleanly"""
+        lines = [
+            f'{i + 1}. (date: {today_date.strftime("%Y-%m-%d")}) '
+            f'"{json.dumps(message)[1:-1]}"'
+            for i, (message, today_date) in enumerate(keys)
+        ]
+        prompt = self.prompt.format(messages="\n".join(lines))
+
+        logger.info("Extracting batch of %s messages", len(keys))
+        data = json.loads(strip_code_fences(await self._call_llm(prompt)))
+        if not isinstance(data, dict):
+            raise ValueError(f"expected JSON object, got {type(data).__name__}")
+
+        results = {}
+        for i in range(len(keys)):
+            entries = self.parse_item(data.get(str(i + 1)))
+            if entries is not None:
+                results[i] = entries
+
+        return results
+
+
+def _parse_item(item: Any) -> Optional[Entries]:
+    """Validate one item of the batched answer, or None if malformed"""
+    if isinstance(item, dict):
+        item = [item]
+    if not isinstance(item, list):
+        return None
+
+    entries = []
+    for entry in item:
+        if not isinstance(entry, dict):
+            return None
+        entry = dict(entry)
+        if isinstance(entry.get("date"), str):
+            try:
+                entry["date"] = datetime.strptime(entry["date"], "%Y-%m-%d").date()
+            except ValueError:
+                return None
+        entries.append(entry)
+
+    return entries
@@ -2,23 +2,33 @@
 bot/nlp/extract.py - Extract timesheet entries from natural language using OpenAI
 """
 
+import copy
 import json
 import logging
-from datetime import datetime
-from typing import List, Dict, Any
+import os
+from datetime import datetime, date
+from typing import List, Dict, Any, Optional
 
-from langchain_openai import ChatOpenAI
-from bot.config import OPENAI_API_KEY
+from bot.cache import TTLCache
+from bot.config import (
+    FASTPATH_ENABLED,
+    EXTRACT_CACHE_SIZE,
+    EXTRACT_CACHE_TTL,
+    EXTRACT_CACHE_PATH,
+    EXTRACT_BATCH_ENABLED,
+    EXTRACT_BATCH_WINDOW_MS,
+    EXTRACT_BATCH_MAX_SIZE,
+)
+from bot.nlp.batching import ExtractionBatcher
+from bot.nlp.fastpath import try_fast_path
+from bot.nlp.llm_client import call_llm, strip_code_fences
+from bot.metrics import timed_stage
+from bot.logging import user_text
 
 logger = logging.getLogger(__name__)
 
-# Initialize LLM
-llm = ChatOpenAI(
-    api_key=OPENAI_API_KEY,
-    model="gpt-4o-mini",
-    temperature=0,
-    max_tokens=512,
-)
+# LLM results keyed on "<today>|<normalized message>"
+_cache = TTLCache(maxsize=EXTRACT_CACHE_SIZE, ttl=EXTRACT_CACHE_TTL)
 
 # Extraction prompt - escaped all curly braces with double {{ }}
 EXTRACTION_PROMPT = """
@@ -52,9 +62,15 @@ Output JSON array:
 """
 
 
+@timed_stage("extract_timesheet_entries")
 async def extract_timesheet_entries(user_message: str) -> List[Dict[str, Any]]:
     """
-    Extract timesheet entries from user message using LLM
+    Extract timesheet entries from user message
+    
+    Common short messages are parsed locally by the fast path; repeated
+    messages are served from the extraction cache. The LLM is only
+    called when neither applies (batched with other users' messages
+    when EXTRACT_BATCH_ENABLED is set).
     
     Args:
         user_message: User's natural language message
@@ -62,7 +78,39 @@ async def extract_timesheet_entries(user_message: str) -> List[Dict[str, Any]]:
     Returns:
         List of entry dicts with keys: date, hours, task, project, task_type
     """
-    today = datetime.now().strftime("%Y-%m-%d")
+    today_date = datetime.now().date()
+    
+    if FASTPATH_ENABLED:
+        entries = try_fast_path(user_message, today_date)
+        if entries is not None:
+            logger.info("Fast path extracted %s entries", len(entries))
+            return entries
+    
+    key = _cache_key(user_message, today_date)
+    cached = _cache.get(key)
+    if cached is not None:
+        logger.info("Extraction cache hit (%s entries)", len(cached))
+        return copy.deepcopy(cached)
+    
+    if _batcher is not None:
+        entries = await _batcher.submit(user_message, today_date)
+    else:
+        entries = await _llm_extract(user_message, today_date)
+    if entries is None:
+        return []
+    
+    _cache.set(key, copy.deepcopy(entries))
+    return entries
+
+
+async def _llm_extract(user_message: str, today_date: date) -> Optional[List[Dict[str, Any]]]:
+    """
+    Extract entries with a single LLM call
+    
+    Returns:
+        List of entry dicts, or None if the call or parsing failed
+    """
+    today = today_date.strftime("%Y-%m-%d")
     
     try:
         # Format prompt
@@ -72,22 +120,11 @@ async def extract_timesheet_entries(user_message: str) -> List[Dict[str, Any]]:
         )
         
         # Call LLM
-        logger.info(f"Extracting from: {user_message[:100]}")
-        response = await llm.ainvoke(prompt)
-        
-        # Parse response
-        raw_text = response.content if hasattr(response, "content") else str(response)
-        raw_text = raw_text.strip()
+        logger.info("Extracting from: %s", user_text(user_message))
+        raw_text = await call_llm(prompt)
         
         # Remove markdown code blocks if present
-        CODE_FENCE = "```"
-        if raw_text.startswith(CODE_FENCE):
-            parts = raw_text.split(CODE_FENCE)
-            if len(parts) >= 2:
-                raw_text = parts[1]
-                if raw_text.startswith("json"):
-                    raw_text = raw_text[4:]
-                raw_text = raw_text.strip()
+        raw_text = strip_code_fences(raw_text)
         
         # Parse JSON
         entries = json.loads(raw_text)
@@ -100,13 +137,147 @@ async def extract_timesheet_entries(user_message: str) -> List[Dict[str, Any]]:
             if "date" in entry and isinstance(entry["date"], str):
                 entry["date"] = datetime.strptime(entry["date"], "%Y-%m-%d").date()
         
-        logger.info(f"Extracted {len(entries)} entries")
+        logger.info("Extracted %s entries", len(entries))
         return entries
         
     except json.JSONDecodeError as e:
-        logger.error(f"JSON parse error: {e}")
-        return []
+        logger.error("JSON parse error: %s", e)
+        return None
     
     except Exception as e:
-        logger.error(f"Extraction error: {e}")
-        return []
+        logger.error("Extraction error: %s", e)
+        return None
+
+
+# === MICRO-BATCHING ===
+
+async def _call_batch_llm(prompt: str) -> str:
+    # Batched answers carry one entry list per message
+    return await call_llm(prompt, max_tokens=256 * EXTRACT_BATCH_MAX_SIZE)
+
+
+_batcher = None
+if EXTRACT_BATCH_ENABLED:
+    _batcher = ExtractionBatcher(
+        call_llm=_call_batch_llm,
+        single_extract=_llm_extract,
+        window_ms=EXTRACT_BATCH_WINDOW_MS,
+        max_size=EXTRACT_BATCH_MAX_SIZE,
+    )
+
+
+def get_extraction_batch_stats() -> Dict[str, Any]:
+    """
+    Get micro-batching counters (empty if batching is disabled)
+    
+    Returns:
+        Dict with requests, batches, batched_items, fallbacks
+    """
+    return dict(_batcher.stats) if _batcher is not None else {}
+
+
+# === EXTRACTION CACHE ===
+
+def _cache_key(user_message: str, today_date: date) -> str:
+    """Whitespace/case-normalized message plus the date it was resolved against"""
+    normalized = " ".join(user_message.lower().split())
+    return f"{today_date.isoformat()}|{normalized}"
+
+
+def cache_extraction_result(
+    user_message: str,
+    today_date: date,
+    entries: List[Dict[str, Any]],
+) -> None:
+    """
+    Seed the cache with entries extracted elsewhere (e.g. the combined call)
+    
+    Args:
+        user_message: Message the entries were extracted from
+        today_date: Date relative dates were resolved against
+        entries: Parsed entry dicts
+    """
+    _cache.set(_cache_key(user_message, today_date), copy.deepcopy(entries))
+
+
+def get_extraction_cache_stats() -> Dict[str, Any]:
+    """
+    Get extraction cache size and hit-rate counters
+    
+    Returns:
+        Dict with size, maxsize, hits, misses, evictions, hit_rate
+    """
+    return _cache.stats()
+
+
+def load_extraction_cache(path: str = EXTRACT_CACHE_PATH) -> int:
+    """
+    Load persisted cache entries from a JSON file
+    
+    Args:
+        path: Cache file path (no-op if empty or missing)
+    
+    Returns:
+        Number of live entries loaded
+    """
+    if not path or not os.path.exists(path):
+        return 0
+    
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.error("Failed to load extraction cache from %s: %s", path, e)
+        return 0
+    
+    loaded = 0
+    now = datetime.now().timestamp()
+    for key, item in data.items():
+        if item.get("expires_at", 0) <= now:
+            continue
+        entries = item.get("entries", [])
+        for entry in entries:
+            if isinstance(entry.get("date"), str):
+                entry["date"] = date.fromisoformat(entry["date"])
+        _cache.set(key, entries, expires_at=item["expires_at"])
+        loaded += 1
+    
+    logger.info("Loaded %s extraction cache entries from %s", loaded, path)
+    return loaded
+
+
+def save_extraction_cache(path: str = EXTRACT_CACHE_PATH) -> int:
+    """
+    Persist live cache entries to a JSON file (written atomically)
+    
+    Args:
+        path: Cache file path (no-op if empty)
+    
+    Returns:
+        Number of entries written
+    """
+    if not path:
+        return 0
+    
+    data = {}
+    for key, expires_at, entries in _cache.items():
+        serializable = []
+        for entry in entries:
+            e = entry.copy()
+            if isinstance(e.get("date"), date):
+                e["date"] = e["date"].isoformat()
+            serializable.append(e)
+        data[key] = {"expires_at": expires_at, "entries": serializable}
+    
+    # Per process: workers shutting down together must not share a tmp file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.error("Failed to save extraction cache to %s: %s", path, e)
+        return 0
+    
+    logger.info("Saved %s extraction cache entries to %s", len(data), path)
+    return len(data)
@@ -0,0 +1,375 @@
+"""
+bot/nlp/fastpath.py - Deterministic regex extractor for common timesheet messages
+
+Handles the frequent short shapes ("today 4h api testing", "yesterday 90m
+standup glovatrix") locally and returns the same entry dicts as the LLM
+extractor. Anything it is not confident about is left to the LLM.
+"""
+
+import logging
+import re
+from datetime import date, timedelta
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+
+from bot.config import KNOWN_PROJECTS, FASTPATH_MIN_CONFIDENCE
+from bot.nlp.task_types import find_task_type
+
+logger = logging.getLogger(__name__)
+
+# Hit/miss counters, exposed via get_fastpath_stats()
+_stats = {"hits": 0, "misses": 0}
+
+# Known project names, lowercase -> canonical spelling
+_known_projects: Dict[str, str] = {p.lower(): p for p in KNOWN_PROJECTS}
+
+_WEEKDAYS = {
+    "monday": 0, "mon": 0,
+    "tuesday": 1, "tue": 1, "tues": 1,
+    "wednesday": 2, "wed": 2,
+    "thursday": 3, "thu": 3, "thurs": 3,
+    "friday": 4, "fri": 4,
+    "saturday": 5,
+    "sunday": 6,
+}
+
+_MONTHS = {
+    "jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3,
+    "apr": 4, "april": 4, "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7,
+    "aug": 8, "august": 8, "sep": 9, "sept": 9, "september": 9,
+    "oct": 10, "october": 10, "nov": 11, "november": 11,
+    "dec": 12, "december": 12,
+}
+
+_WEEKDAY_RE = "|".join(sorted(_WEEKDAYS, key=len, reverse=True))
+_MONTH_RE = "|".join(sorted(_MONTHS, key=len, reverse=True))
+
+_RELATIVE_DATE_RE = re.compile(
+    r"\b(?:day before yesterday|yesterday|today|tonight)\b", re.IGNORECASE
+)
+_WEEKDAY_DATE_RE = re.compile(
+    rf"\b(?:(?P<last>last)\s+|on\s+)?(?P<wd>{_WEEKDAY_RE})\b", re.IGNORECASE
+)
+_ISO_DATE_RE = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")
+_DAY_MONTH_RE = re.compile(
+    rf"\b(?P<day>\d{{1,2}})(?:st|nd|rd|th)?\s+(?:of\s+)?(?P<mon>{_MONTH_RE})\b"
+    rf"(?:,?\s+(?P<year>\d{{4}}))?",
+    re.IGNORECASE,
+)
+_MONTH_DAY_RE = re.compile(
+    rf"\b(?P<mon>{_MONTH_RE})\s+(?P<day>\d{{1,2}})(?:st|nd|rd|th)?\b"
+    rf"(?:,?\s+(?P<year>\d{{4}}))?",
+    re.IGNORECASE,
+)
+
+_HOURS_RE = re.compile(
+    r"\b(?P<h>\d+(?:\.\d+)?)\s*(?:h|hr|hrs|hour|hours)\b"
+    r"(?:\s*(?:and\s+)?(?P<m>\d+)\s*(?:m|min|mins|minute|minutes)\b)?",
+    re.IGNORECASE,
+)
+_MINUTES_RE = re.compile(
+    r"\b(?P<m>\d+)\s*(?:m|min|mins|minute|minutes)\b", re.IGNORECASE
+)
+_HALF_HOUR_RE = re.compile(r"\bhalf\s+(?:an\s+)?hour\b", re.IGNORECASE)
+
+# Words that carry no task meaning when left over at the edges of a segment
+_FILLER_WORDS = {
+    "i", "we", "have", "had", "was", "were", "worked", "work", "spent", "did",
+    "doing", "done", "on", "for", "in", "of", "at", "and", "also", "then",
+    "morning", "afternoon", "evening", "night", "the", "about", "around",
+    "approx", "approximately", "project",
+}
+
+# Date words the date patterns don't resolve; left over in the task text
+# they mean the entry's date is not what we parsed ("3h dev tomorrow",
+# "next monday 3h dev"), so the message goes to the LLM
+_UNRESOLVED_DATE_WORDS = (
+    {"tomorrow", "next", "last", "this", "week", "weeks", "weekend", "month", "months", "ago",
+     "sat", "sun"}
+    | set(_WEEKDAYS)
+    | set(_MONTHS)
+)
+
+_PROJECT_PREFIX_RE = r"(?:(?:on|for|in|under)\s+(?:the\s+)?(?:project\s+)?|project\s+)?"
+
+Span = Tuple[int, int]
+
+
+def register_known_projects(projects: Iterable[str]) -> None:
+    """
+    Add project names the fast path should recognize
+
+    Args:
+        projects: Project names in their canonical spelling
+    """
+    for project in projects:
+        if project and project.strip():
+            _known_projects.setdefault(project.strip().lower(), project.strip())
+
+
+def get_fastpath_stats() -> Dict[str, Any]:
+    """
+    Get fast-path hit/miss counters
+
+    Returns:
+        Dict with hits, misses and hit_rate
+    """
+    total = _stats["hits"] + _stats["misses"]
+    return {
+        "hits": _stats["hits"],
+        "misses": _stats["misses"],
+        "hit_rate": _stats["hits"] / total if total else 0.0,
+    }
+
+
+def try_fast_path(user_message: str, today: date) -> Optional[List[Dict[str, Any]]]:
+    """
+    Extract entries locally if the message is confidently understood
+
+    Args:
+        user_message: User's natural language message
+        today: Date that relative dates are resolved against
+
+    Returns:
+        List of entry dicts (date, hours, task, project, task_type),
+        or None when the LLM should handle the message
+    """
+    entries, confidence = parse_timesheet_message(user_message, today)
+
+    if entries and confidence >= FASTPATH_MIN_CONFIDENCE:
+        _stats["hits"] += 1
+        logger.debug("Fast path hit (%.2f): %s entries", confidence, len(entries))
+        return entries
+
+    _stats["misses"] += 1
+    logger.debug("Fast path miss (%.2f)", confidence)
+    return None
+
+
+def parse_timesheet_message(
+    user_message: str,
+    today: date,
+) -> Tuple[List[Dict[str, Any]], float]:
+    """
+    Parse a message into entries with a confidence score
+
+    Args:
+        user_message: User's natural language message
+        today: Date that relative dates are resolved against
+
+    Returns:
+        (entries, confidence) - confidence is 0.0 when the message
+        does not fit any supported shape
+    """
+    text = user_message.strip()
+    if not text or len(text) > 300:
+        return [], 0.0
+
+    dates = _find_dates(text, today)
+    if dates is None:
+        return [], 0.0
+
+    # One segment per date mention; text before the first date belongs to it
+    if len(dates) > 1:
+        bounds = [start for start, _, _ in dates] + [len(text)]
+        bounds[0] = 0
+        segments = [
+            (bounds[i], bounds[i + 1], dates[i]) for i in range(len(dates))
+        ]
+    else:
+        segments = [(0, len(text), dates[0] if dates else None)]
+
+    entries = []
+    confidence = 1.0
+
+    for seg_start, seg_end, date_match in segments:
+        entry, seg_confidence = _parse_segment(text, seg_start, seg_end, date_match, today)
+        if entry is None:
+            return [], 0.0
+        entries.append(entry)
+        confidence = min(confidence, seg_confidence)
+
+    return entries, confidence
+
+
+def _parse_segment(
+    text: str,
+    seg_start: int,
+    seg_end: int,
+    date_match: Optional[Tuple[int, int, date]],
+    today: date,
+) -> Tuple[Optional[Dict[str, Any]], float]:
+    """Parse one date-delimited segment into a single entry"""
+    segment = text[seg_start:seg_end]
+    removed: List[Span] = []
+    confidence = 1.0
+
+    if date_match:
+        start, end, entry_date = date_match
+        removed.append((start - seg_start, end - seg_start))
+    else:
+        entry_date = today
+        confidence -= 0.1
+
+    hours_spans = _find_hours(segment, removed)
+    if len(hours_spans) != 1:
+        return None, 0.0
+
+    (h_start, h_end), hours = hours_spans[0]
+    if not 0 < hours <= 24:
+        return None, 0.0
+    removed.append((h_start, h_end))
+
+    project = ""
+    project_span = _find_project(segment, removed)
+    if project_span:
+        (p_start, p_end), project = project_span
+        removed.append((p_start, p_end))
+    else:
+        confidence -= 0.15
+
+    remaining = _strip_spans(segment, removed)
+
+    # Leftover digits mean a shape we don't understand (times, ranges, ids)
+    if re.search(r"\d", remaining):
+        return None, 0.0
+
+    if any(word in _UNRESOLVED_DATE_WORDS for word in re.findall(r"[a-z]+", remaining.lower())):
+        return None, 0.0
+
+    task = _clean_task(remaining)
+    if not task:
+        confidence -= 0.3
+
+    # The LLM infers a type from context ("standup" -> Meeting); we can't
+    task_type = find_task_type(task)
+    if task_type is None:
+        return None, 0.0
+
+    entry = {
+        "date": entry_date,
+        "hours": hours,
+        "task": task,
+        "project": project,
+        "task_type": task_type,
+    }
+    return entry, confidence
+
+
+def _find_dates(text: str, today: date) -> Optional[List[Tuple[int, int, date]]]:
+    """Find non-overlapping date mentions, or None if one is invalid"""
+    found = []
+
+    for m in _RELATIVE_DATE_RE.finditer(text):
+        word = m.group(0).lower()
+        if word == "yesterday":
+            found.append((m.start(), m.end(), today - timedelta(days=1)))
+        elif word == "day before yesterday":
+            found.append((m.start(), m.end(), today - timedelta(days=2)))
+        else:
+            found.append((m.start(), m.end(), today))
+
+    for m in _WEEKDAY_DATE_RE.finditer(text):
+        delta = (today.weekday() - _WEEKDAYS[m.group("wd").lower()]) % 7
+        if m.group("last") and delta == 0:
+            delta = 7
+        found.append((m.start(), m.end(), today - timedelta(days=delta)))
+
+    for m in _ISO_DATE_RE.finditer(text):
+        try:
+            parsed = date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+        except ValueError:
+            return None
+        found.append((m.start(), m.end(), parsed))
+
+    for regex in (_DAY_MONTH_RE, _MONTH_DAY_RE):
+        for m in regex.finditer(text):
+            month = _MONTHS[m.group("mon").lower()]
+            year = int(m.group("year")) if m.group("year") else today.year
+            try:
+                parsed = date(year, month, int(m.group("day")))
+            except ValueError:
+                return None
+            # "dec 30" said in January means last year
+            if not m.group("year") and parsed > today:
+                try:
+                    parsed = parsed.replace(year=year - 1)
+                except ValueError:
+                    return None
+            found.append((m.start(), m.end(), parsed))
+
+    # Keep the earliest, longest match where mentions overlap
+    found.sort(key=lambda d: (d[0], -(d[1] - d[0])))
+    dates = []
+    for match in found:
+        if dates and match[0] < dates[-1][1]:
+            continue
+        dates.append(match)
+
+    return dates
+
+
+def _find_hours(segment: str, removed: List[Span]) -> List[Tuple[Span, float]]:
+    """Find all duration mentions in a segment as (span, hours)"""
+    found = []
+
+    for m in _HOURS_RE.finditer(segment):
+        hours = float(m.group("h"))
+        if m.group("m"):
+            hours += int(m.group("m")) / 60
+        found.append(((m.start(), m.end()), hours))
+
+    for m in _MINUTES_RE.finditer(segment):
+        if not _overlaps((m.start(), m.end()), [span for span, _ in found]):
+            found.append(((m.start(), m.end()), int(m.group("m")) / 60))
+
+    for m in _HALF_HOUR_RE.finditer(segment):
+        found.append(((m.start(), m.end()), 0.5))
+
+    return [
+        (span, round(hours, 2))
+        for span, hours in found
+        if not _overlaps(span, removed)
+    ]
+
+
+def _find_project(segment: str, removed: List[Span]) -> Optional[Tuple[Span, str]]:
+    """Find the first known project mentioned in a segment"""
+    best = None
+
+    # Longest names first so "glovatrix mobile" wins over "glovatrix"
+    for lower in sorted(_known_projects, key=len, reverse=True):
+        pattern = _PROJECT_PREFIX_RE + r"\b" + re.escape(lower) + r"\b"
+        m = re.search(pattern, segment, re.IGNORECASE)
+        if not m or _overlaps((m.start(), m.end()), removed):
+            continue
+        if best is None or m.start() < best[0][0]:
+            best = ((m.start(), m.end()), _known_projects[lower])
+
+    return best
+
+
+def _strip_spans(segment: str, spans: List[Span]) -> str:
+    """Remove the given spans from a segment, leaving word gaps"""
+    parts = []
+    pos = 0
+    for start, end in sorted(spans):
+        parts.append(segment[pos:start])
+        pos = max(pos, end)
+    parts.append(segment[pos:])
+    return " ".join(parts)
+
+
+def _clean_task(remaining: str) -> str:
+    """Collapse whitespace and strip filler words and punctuation at the edges"""
+    words = re.sub(r"[,;:!\-–—]+", " ", remaining).split()
+
+    while words and words[0].lower().strip(".") in _FILLER_WORDS:
+        words.pop(0)
+    while words and words[-1].lower().strip(".") in _FILLER_WORDS:
+        words.pop()
+
+    return " ".join(words).strip(" .")
+
+
+def _overlaps(span: Span, spans: List[Span]) -> bool:
+    return any(span[0] < end and start < span[1] for start, end in spans)
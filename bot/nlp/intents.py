@@ -1,39 +1,68 @@
-from bot.nlp.llm_client import call_llm
-
-INTENT_SYSTEM_PROMPT = """
-You are an intent classification system for a timesheet bot.
-
-Output ONLY a JSON object: {"intent": "..."}.
-No markdown, no backticks, no explanation.
-
-POSSIBLE INTENTS:
-- "greeting"
-- "date_query"
-- "timesheet_log"
-- "weekly_summary"
-- "daily_summary"
-- "correction"
-- "admin_user_summary"
-- "admin_project_summary"
-- "admin_efficiency"
-- "unknown"
-
-Examples:
-"today 4h api testing" => timesheet_log
-"what did i do this week" => weekly_summary
-"show my tasks today" => daily_summary
-"correct yesterday 4h to 3h" => correction
-"how much work john did" => admin_user_summary
-"project summary glovatrix" => admin_project_summary
-"user performance last month" => admin_efficiency
-"""
+import re
+from typing import Optional
+
+from bot.metrics import timed_stage
+
+VALID_INTENTS = {
+    "greeting",
+    "date_query",
+    "timesheet_log",
+    "weekly_summary",
+    "daily_summary",
+    "correction",
+    "admin_user_summary",
+    "admin_project_summary",
+    "admin_efficiency",
+    "unknown",
+}
+
+# Whole messages that settle the intent without the LLM. Kept conservative:
+# only first-person requests match, so "how much work did john do this
+# week" or "did api testing this week" still go to the LLM, and a message
+# that mentions hours could be a log entry, so it never matches.
+KEYWORD_INTENTS = (
+    ("greeting", re.compile(r"^(hi|hello|hey|good (morning|afternoon|evening))$")),
+    ("weekly_summary", re.compile(
+        r"^((show|give)( me)? )?(my )?(weekly summary|week summary|summary (of|for) (my|this) week)$"
+        r"|^(show )?my week$"
+        r"|^what did i (do|work on) this week$"
+    )),
+    ("daily_summary", re.compile(
+        r"^((show|give)( me)? )?(my )?(daily summary|today'?s? summary|summary (of|for) today)$"
+        r"|^(show )?my tasks( for)? today$"
+        r"|^what did i (do|work on) today$"
+    )),
+)
+HOURS_RE = re.compile(r"\d\s*(h|hr|hrs|hours?)\b")
+
+
+def keyword_intent(message: str) -> Optional[str]:
+    """
+    Intent for messages a keyword rule can decide, else None
+
+    Args:
+        message: User's natural language message
+    """
+    lower = " ".join(message.lower().split()).rstrip("?!. ")
+    if HOURS_RE.search(lower):
+        return None
+    for intent, pattern in KEYWORD_INTENTS:
+        if pattern.search(lower):
+            return intent
+    return None
+
+
+@timed_stage("detect_intent")
+async def understand_turn(message: str):
+    """
+    Intent and entries for a message: fast path and keyword rules first,
+    then one (batched) LLM call. Returns a TurnUnderstanding.
+    """
+    from bot.nlp.understand import understand_message
+    return await understand_message(message)
+
 
 async def detect_intent(message: str) -> str:
-    user_prompt = f"Message: \"{message}\""
-    raw = await call_llm(INTENT_SYSTEM_PROMPT + "\n" + user_prompt)
-
-    try:
-        import json
-        return json.loads(raw).get("intent","unknown")
-    except:
-        return "unknown"
+    """Classify a message (see understand_turn)"""
+    result = await understand_turn(message)
+    return result.intent
@@ -0,0 +1,253 @@
+"""
+bot/nlp/llm_backends.py - Pluggable LLM backends (live, record, replay)
+
+call_llm() sends every prompt through the backend chosen by LLM_BACKEND:
+
+    live     OpenAI through the shared ChatOpenAI client
+    record   live, and each prompt -> response pair (with usage and
+             latency) is appended to LLM_STORE_PATH
+    replay   answers from LLM_STORE_PATH without network; a prompt that
+             was never recorded raises LLMReplayMiss
+
+The bot's prompts carry today's date, so pairs are stored with the date
+replaced by a placeholder and dates in the answer are shifted by the days
+elapsed since recording: a store recorded on Monday replays the same turns
+on Friday. Dates the user typed (any other date in the prompt) are absolute
+and are not shifted. The store is read once at startup
+(load_llm_backend()), not on the event loop by the first call. LLM_REPLAY_LATENCY_MS simulates the model's latency in replay
+("recorded" waits as long as the original call did).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, Optional, Set, Tuple
+
+from bot.config import LLM_BACKEND, LLM_STORE_PATH, LLM_REPLAY_LATENCY_MS
+
+logger = logging.getLogger(__name__)
+
+TODAY_PLACEHOLDER = "<today>"
+DATE_RE = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
+
+# (answer text, usage dict with input_tokens/output_tokens)
+Completion = Tuple[str, Dict[str, int]]
+
+
+class LLMReplayMiss(LookupError):
+    """Replay backend has no recorded answer for a prompt"""
+
+
+def _store_key(model: str, max_tokens: int, prompt: str) -> str:
+    """Stable key for a prompt with today's date taken out"""
+    normalized = prompt.replace(date.today().isoformat(), TODAY_PLACEHOLDER)
+    digest = hashlib.sha256(f"{model}\0{max_tokens}\0{normalized}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _literal_dates(prompt: str) -> Set[str]:
+    """Dates written out in a prompt other than today's (typed by the user)"""
+    today = date.today().isoformat()
+    return {m.group(0) for m in DATE_RE.finditer(prompt)} - {today}
+
+
+def _shift_dates(text: str, days: int, keep: Set[str] = frozenset()) -> str:
+    """Move every YYYY-MM-DD in `text` by `days`, except those in `keep`"""
+    if not days:
+        return text
+
+    def shift(match):
+        if match.group(0) in keep:
+            return match.group(0)
+        try:
+            shifted = date(*map(int, match.groups())) + timedelta(days=days)
+        except ValueError:
+            return match.group(0)
+        return shifted.isoformat()
+
+    return DATE_RE.sub(shift, text)
+
+
+class LiveBackend:
+    """OpenAI through the shared client (bot/nlp/llm_client.py)"""
+
+    name = "live"
+
+    async def complete(self, prompt: str, max_tokens: int) -> Completion:
+        from bot.nlp.llm_client import get_llm
+
+        msg = await get_llm(max_tokens).ainvoke(prompt)
+        content = msg.content if hasattr(msg, "content") else str(msg)
+        return content, dict(getattr(msg, "usage_metadata", None) or {})
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name}
+
+
+class LLMStore:
+    """
+    Prompt -> response pairs in a JSONL file
+
+    Call load() at startup; otherwise the file is read on first use.
+
+    Args:
+        path: JSONL file (one pair per line; later lines win)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._pairs: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def pairs(self) -> Dict[str, Dict[str, Any]]:
+        if self._pairs is None:
+            self._pairs = self._read()
+        return self._pairs
+
+    async def load(self) -> None:
+        """Read the file in a thread so the event loop never blocks on it"""
+        if self._pairs is None:
+            pairs = await asyncio.get_running_loop().run_in_executor(None, self._read)
+            if self._pairs is None:
+                self._pairs = pairs
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        pairs = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        pair = json.loads(line)
+                        pairs[pair["key"]] = pair
+        logger.info("Loaded %s LLM pairs from %s", len(pairs), self.path)
+        return pairs
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.pairs().get(key)
+
+    async def add(self, pair: Dict[str, Any]) -> None:
+        self.pairs()[pair["key"]] = pair
+        line = json.dumps(pair, ensure_ascii=False) + "\n"
+        await asyncio.get_running_loop().run_in_executor(None, self._append, line)
+
+    def _append(self, line: str) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+class RecordBackend:
+    """Live calls, saving each pair to the store"""
+
+    name = "record"
+
+    def __init__(self, store: LLMStore, model: str):
+        self.store = store
+        self.model = model
+        self.live = LiveBackend()
+        self.recorded = 0
+
+    async def complete(self, prompt: str, max_tokens: int) -> Completion:
+        started = time.perf_counter()
+        content, usage = await self.live.complete(prompt, max_tokens)
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        await self.store.add({
+            "key": _store_key(self.model, max_tokens, prompt),
+            "recorded_on": date.today().isoformat(),
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "prompt": prompt,
+            "response": content,
+            "usage": usage,
+            "latency_ms": round(latency_ms, 1),
+        })
+        self.recorded += 1
+        return content, usage
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "store": self.store.path, "recorded": self.recorded}
+
+
+class ReplayBackend:
+    """
+    Recorded answers, no network
+
+    Args:
+        store: Recorded pairs
+        model: Model name the pairs were recorded with
+        latency_ms: Milliseconds to wait per call, or "recorded"
+    """
+
+    name = "replay"
+
+    def __init__(self, store: LLMStore, model: str, latency_ms: str = "0"):
+        self.store = store
+        self.model = model
+        self.latency_ms = latency_ms
+        self.hits = 0
+        self.misses = 0
+
+    async def complete(self, prompt: str, max_tokens: int) -> Completion:
+        key = _store_key(self.model, max_tokens, prompt)
+        pair = self.store.get(key)
+        if pair is None:
+            self.misses += 1
+            raise LLMReplayMiss(f"no recorded answer for prompt {key[:12]} in {self.store.path}")
+        self.hits += 1
+
+        if self.latency_ms == "recorded":
+            delay_ms = pair.get("latency_ms", 0)
+        else:
+            delay_ms = float(self.latency_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+        days = (date.today() - date.fromisoformat(pair["recorded_on"])).days
+        response = _shift_dates(pair["response"], days, keep=_literal_dates(prompt))
+        return response, dict(pair.get("usage") or {})
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "store": self.store.path,
+            "pairs": len(self.store.pairs()),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+BACKENDS = ("live", "record", "replay")
+
+_backend = None
+
+
+def get_backend(model: str):
+    """
+    Get the configured backend, constructing it on first use
+
+    Args:
+        model: Model name (part of the store key)
+    """
+    global _backend
+    if _backend is None:
+        if LLM_BACKEND == "record":
+            _backend = RecordBackend(LLMStore(LLM_STORE_PATH), model)
+        elif LLM_BACKEND == "replay":
+            _backend = ReplayBackend(LLMStore(LLM_STORE_PATH), model, LLM_REPLAY_LATENCY_MS)
+        elif LLM_BACKEND == "live":
+            _backend = LiveBackend()
+        else:
+            raise ValueError(f"LLM_BACKEND must be one of {', '.join(BACKENDS)}, got {LLM_BACKEND!r}")
+        logger.info("LLM backend: %s", _backend.name)
+    return _backend
+
+
+def get_llm_backend_stats() -> Dict[str, Any]:
+    """Backend name and its counters (store hits/misses, pairs recorded)"""
+    if _backend is None:
+        return {"backend": LLM_BACKEND}
+    return _backend.stats()
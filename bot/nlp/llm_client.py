@@ -1,17 +1,93 @@
-from langchain_openai import ChatOpenAI
-from bot.config import OPENAI_API_KEY
+"""
+bot/nlp/llm_client.py - Shared, lazily constructed LLM client
+
+langchain_openai is imported and the ChatOpenAI client built on the first
+LLM call, not when the bot is imported. All NLP code goes through
+get_llm()/call_llm(), so the process holds a single client (and a single
+HTTP connection pool); callers needing a different max_tokens get a
+binding of the same client. call_llm() goes through the configured
+backend (live, record or replay; see bot/nlp/llm_backends.py).
+"""
+
+import time
+from typing import Any, Optional
+
+from bot import tracing
+from bot.config import OPENAI_API_KEY, OPENAI_BASE_URL
 from bot.logging import logger
+from bot.metrics import LLM_CALLS, STAGE_SECONDS, record_llm_usage
+from bot.nlp.llm_backends import get_backend
+
+LLM_MODEL = "gpt-4o-mini"
+LLM_MAX_TOKENS = 512
+
+_llm = None
+
+
+def get_llm(max_tokens: Optional[int] = None) -> Any:
+    """
+    Get the shared chat model, constructing it on first use
+
+    Args:
+        max_tokens: Answer limit for this caller (default LLM_MAX_TOKENS)
+
+    Returns:
+        ChatOpenAI instance (or a binding of it with a different max_tokens)
+    """
+    global _llm
+    if _llm is None:
+        from langchain_openai import ChatOpenAI
 
-llm = ChatOpenAI(
-    api_key=OPENAI_API_KEY,
-    model="gpt-4o-mini",
-    temperature=0,
-    max_tokens=512,
-)
+        _llm = ChatOpenAI(
+            api_key=OPENAI_API_KEY,
+            base_url=OPENAI_BASE_URL or None,
+            model=LLM_MODEL,
+            temperature=0,
+            max_tokens=LLM_MAX_TOKENS,
+        )
 
-async def call_llm(prompt: str) -> str:
+    if max_tokens is None or max_tokens == LLM_MAX_TOKENS:
+        return _llm
+    return _llm.bind(max_tokens=max_tokens)
+
+
+async def load_llm_backend() -> None:
+    """Construct the LLM backend and read its record/replay store (app startup)"""
+    store = getattr(get_backend(LLM_MODEL), "store", None)
+    if store is not None:
+        await store.load()
+
+
+async def call_llm(prompt: str, max_tokens: Optional[int] = None) -> str:
     logger.info("Calling LLM...")
-    msg = await llm.ainvoke(prompt)
-    if hasattr(msg, "content"):
-        return msg.content
-    return str(msg)
+    started = time.perf_counter()
+    backend = get_backend(LLM_MODEL)
+    with tracing.span("llm", model=LLM_MODEL, backend=backend.name, prompt_chars=len(prompt)) as span:
+        try:
+            content, usage = await backend.complete(prompt, max_tokens or LLM_MAX_TOKENS)
+        except Exception:
+            LLM_CALLS.labels("error").inc()
+            raise
+        finally:
+            STAGE_SECONDS.labels("llm").observe(time.perf_counter() - started)
+
+        if span and usage:
+            span.set(input_tokens=usage.get("input_tokens", 0), output_tokens=usage.get("output_tokens", 0))
+
+    LLM_CALLS.labels("ok").inc()
+    record_llm_usage(usage)
+    return content
+
+
+def strip_code_fences(raw_text: str) -> str:
+    """Remove a markdown code block (```json ... ```) around an LLM answer"""
+    raw_text = raw_text.strip()
+    CODE_FENCE = "```"
+    if raw_text.startswith(CODE_FENCE):
+        parts = raw_text.split(CODE_FENCE)
+        if len(parts) >= 2:
+            raw_text = parts[1]
+            if raw_text.startswith("json"):
+                raw_text = raw_text[4:]
+            raw_text = raw_text.strip()
+    return raw_text
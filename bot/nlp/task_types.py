@@ -0,0 +1,91 @@
+"""
+bot/nlp/task_types.py - Canonical task types and their keyword variations
+Shared by the timesheet flow, the fast-path parser and the import scripts
+"""
+
+import re
+from typing import Dict, List, Optional
+
+# Standard type -> accepted variations (all lowercase)
+TASK_TYPE_VARIATIONS: Dict[str, List[str]] = {
+    "development": ["development", "dev", "coding", "programming"],
+    "testing": ["testing", "test", "qa", "quality assurance"],
+    "debugging": ["debugging", "debug", "bugfix", "bug fixing"],
+    "meeting": ["meeting", "discussion", "call"],
+    "research": ["research", "investigation", "analysis"],
+    "documentation": ["documentation", "docs", "writing"],
+    "devops": ["devops", "deployment", "ci/cd", "pipeline"],
+}
+
+# Variations that also describe other kinds of work ("writing tests",
+# "call about the deployment"); any other match in the text wins over them
+GENERIC_VARIATIONS = {"writing", "call", "discussion", "analysis"}
+
+# Valid task types for normalization
+VALID_TASK_TYPES = {
+    variation
+    for variations in TASK_TYPE_VARIATIONS.values()
+    for variation in variations
+}
+
+
+def lookup_task_type(keyword: str) -> Optional[str]:
+    """
+    Map a single keyword to its standard task type
+
+    Args:
+        keyword: Raw keyword (e.g., "qa", "Bug Fixing")
+
+    Returns:
+        Standard task type (e.g., "Testing"), or None if not a known variation
+    """
+    lower = keyword.lower().strip()
+
+    for standard, variations in TASK_TYPE_VARIATIONS.items():
+        if lower in variations:
+            return standard.capitalize()
+
+    return None
+
+
+def find_task_type(text: str) -> Optional[str]:
+    """
+    Find the task type a free-text description is most specifically about
+
+    Specific variations beat generic ones (GENERIC_VARIATIONS), then longer
+    variations beat shorter ones, then the earliest mention wins. Plurals
+    ("tests", "meetings") count as the variation.
+
+    Args:
+        text: Task description (e.g., "writing tests for the api")
+
+    Returns:
+        Standard task type (e.g., "Testing"), or None if no variation is mentioned
+    """
+    best = None
+
+    for standard, variations in TASK_TYPE_VARIATIONS.items():
+        for variation in variations:
+            m = re.search(r"(?<!\w)" + re.escape(variation) + r"(?:s|es)?(?!\w)", text, re.IGNORECASE)
+            if m:
+                rank = (variation in GENERIC_VARIATIONS, -len(variation), m.start())
+                if best is None or rank < best[0]:
+                    best = (rank, standard.capitalize())
+
+    return best[1] if best else None
+
+
+def normalize_task_type(task_type: str) -> str:
+    """
+    Normalize task type to standard format
+
+    Args:
+        task_type: Raw task type string
+
+    Returns:
+        Normalized task type (e.g., "Testing", "Development")
+    """
+    if not task_type:
+        return "Unknown"
+
+    return lookup_task_type(task_type) or task_type.capitalize()
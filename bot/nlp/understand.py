@@ -0,0 +1,270 @@
+"""
+bot/nlp/understand.py - Single LLM call for intent + entry extraction
+
+One structured response serves both intent routing and entry
+extraction, so a turn pays for at most one round trip. Messages the fast
+path or the keyword rules decide never reach the LLM, and with
+EXTRACT_BATCH_ENABLED the call is micro-batched across users.
+"""
+
+import copy
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, date
+from typing import List, Dict, Any, Optional
+
+from bot.cache import TTLCache
+from bot.config import (
+    FASTPATH_ENABLED,
+    EXTRACT_BATCH_ENABLED,
+    EXTRACT_BATCH_WINDOW_MS,
+    EXTRACT_BATCH_MAX_SIZE,
+)
+from bot.nlp.batching import ExtractionBatcher
+from bot.nlp.extract import cache_extraction_result
+from bot.nlp.fastpath import try_fast_path
+from bot.nlp.intents import VALID_INTENTS, keyword_intent
+from bot.nlp.llm_client import call_llm, strip_code_fences
+
+logger = logging.getLogger(__name__)
+
+# Recent results, so a repeated message is served without another call
+_recent = TTLCache(maxsize=1000, ttl=120)
+
+UNDERSTAND_PROMPT = """
+You are the language understanding step of a timesheet bot.
+Classify the user's message and extract any work entries in one pass.
+
+Output ONLY a valid JSON object. No markdown, no backticks, no explanation.
+
+Format:
+{{
+  "intent": "timesheet_log",
+  "entries": [
+    {{
+      "date": "YYYY-MM-DD",
+      "hours": 3.5,
+      "task": "testing mobile app",
+      "project": "Glovatrix",
+      "task_type": "Testing"
+    }}
+  ],
+  "correction_target": null
+}}
+
+"intent" is one of:
+greeting, date_query, timesheet_log, weekly_summary, daily_summary, correction,
+admin_user_summary, admin_project_summary, admin_efficiency, unknown
+
+Examples:
+"today 4h api testing" => timesheet_log
+"what did i do this week" => weekly_summary
+"show my tasks today" => daily_summary
+"correct yesterday 4h to 3h" => correction
+"how much work john did" => admin_user_summary
+"project summary glovatrix" => admin_project_summary
+"user performance last month" => admin_efficiency
+
+Rules for "entries" (only for timesheet_log, else []):
+- "date": Parse relative dates ("today", "yesterday", "monday") to YYYY-MM-DD
+- "hours": Extract as float (3h → 3.0, 2.5h → 2.5)
+- "task": Brief description of work done
+- "project": Project name if mentioned, else empty string ""
+- "task_type": One of: Development, Testing, Debugging, Meeting, Research, Documentation, DevOps, or Unknown
+
+Rules for "correction_target" (only for correction, else null):
+{{"scope": "last" or "date", "date": "YYYY-MM-DD" or null, "hours": new hours as float or null}}
+
+Today's date: {today}
+
+User message: "{user_message}"
+
+Output JSON object:
+"""
+
+
+@dataclass
+class TurnUnderstanding:
+    """Intent, extracted entries and correction target for one message"""
+
+    intent: str
+    entries: List[Dict[str, Any]] = field(default_factory=list)
+    correction_target: Optional[Dict[str, Any]] = None
+    # True when the LLM call failed or its answer could not be parsed
+    failed: bool = False
+
+
+async def understand_message(message: str) -> TurnUnderstanding:
+    """
+    Classify a message and extract its entries in a single LLM call
+
+    Messages the fast path or keyword_intent() decide are answered
+    without the LLM. Extracted entries are also seeded into the extraction
+    cache so a later extract_timesheet_entries() call is served locally.
+
+    Args:
+        message: User's natural language message
+
+    Returns:
+        TurnUnderstanding (intent "unknown" and failed=True if the call failed)
+    """
+    today_date = datetime.now().date()
+
+    if FASTPATH_ENABLED:
+        entries = try_fast_path(message, today_date)
+        if entries is not None:
+            return TurnUnderstanding(intent="timesheet_log", entries=entries)
+
+    intent = keyword_intent(message)
+    if intent is not None:
+        return TurnUnderstanding(intent=intent)
+
+    key = f"{today_date.isoformat()}|{' '.join(message.lower().split())}"
+    cached = _recent.get(key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+
+    if _batcher is not None:
+        result = await _batcher.submit(message, today_date)
+    else:
+        result = await _llm_understand(message, today_date)
+    if result is None:
+        return TurnUnderstanding(intent="unknown", failed=True)
+
+    _recent.set(key, copy.deepcopy(result))
+    if result.intent == "timesheet_log":
+        cache_extraction_result(message, today_date, result.entries)
+
+    return result
+
+
+async def _llm_understand(message: str, today_date: date) -> Optional[TurnUnderstanding]:
+    """Run the combined prompt and parse its JSON object"""
+    prompt = UNDERSTAND_PROMPT.format(
+        today=today_date.strftime("%Y-%m-%d"),
+        user_message=message,
+    )
+
+    try:
+        raw_text = strip_code_fences(await call_llm(prompt))
+        data = json.loads(raw_text)
+        if not isinstance(data, dict):
+            raise ValueError(f"expected JSON object, got {type(data).__name__}")
+
+        result = _to_understanding(data)
+        logger.info("Understood intent=%s with %s entries", result.intent, len(result.entries))
+        return result
+
+    except (json.JSONDecodeError, ValueError, TypeError) as e:
+        logger.error("Understanding parse error: %s", e)
+        return None
+
+    except Exception as e:
+        logger.error("Understanding error: %s", e)
+        return None
+
+
+def _to_understanding(data: Dict[str, Any]) -> TurnUnderstanding:
+    """Build a TurnUnderstanding from one answer object (raises on bad dates)"""
+    intent = data.get("intent", "unknown")
+    if intent not in VALID_INTENTS:
+        intent = "unknown"
+
+    entries = data.get("entries") or []
+    if not isinstance(entries, list):
+        entries = [entries]
+    for entry in entries:
+        if "date" in entry and isinstance(entry["date"], str):
+            entry["date"] = datetime.strptime(entry["date"], "%Y-%m-%d").date()
+
+    correction_target = data.get("correction_target")
+    if not isinstance(correction_target, dict):
+        correction_target = None
+
+    return TurnUnderstanding(
+        intent=intent,
+        entries=entries,
+        correction_target=correction_target,
+    )
+
+
+def _parse_understanding(item: Any) -> Optional[TurnUnderstanding]:
+    """Validate one item of the batched answer, or None if malformed"""
+    if not isinstance(item, dict):
+        return None
+    try:
+        return _to_understanding(item)
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+# === MICRO-BATCHING ===
+
+BATCH_UNDERSTAND_PROMPT = """
+You are the language understanding step of a timesheet bot.
+Classify EACH of the numbered user messages below and extract its work entries.
+The messages come from different users and are independent of each other.
+
+Output ONLY a valid JSON object mapping each message number to its result object.
+No markdown, no backticks, no explanation.
+
+Format:
+{{
+  "1": {{
+    "intent": "timesheet_log",
+    "entries": [
+      {{
+        "date": "YYYY-MM-DD",
+        "hours": 3.5,
+        "task": "testing mobile app",
+        "project": "Glovatrix",
+        "task_type": "Testing"
+      }}
+    ],
+    "correction_target": null
+  }},
+  "2": {{"intent": "weekly_summary", "entries": [], "correction_target": null}}
+}}
+
+"intent" is one of:
+greeting, date_query, timesheet_log, weekly_summary, daily_summary, correction,
+admin_user_summary, admin_project_summary, admin_efficiency, unknown
+
+Rules for "entries" (only for timesheet_log, else []):
+- "date": Parse relative dates ("today", "yesterday", "monday") to YYYY-MM-DD using that message's date
+- "hours": Extract as float (3h → 3.0, 2.5h → 2.5)
+- "task": Brief description of work done
+- "project": Project name if mentioned, else empty string ""
+- "task_type": One of: Development, Testing, Debugging, Meeting, Research, Documentation, DevOps, or Unknown
+
+Rules for "correction_target" (only for correction, else null):
+{{"scope": "last" or "date", "date": "YYYY-MM-DD" or null, "hours": new hours as float or null}}
+
+Messages:
+{messages}
+
+Output JSON object:
+"""
+
+
+async def _call_batch_llm(prompt: str) -> str:
+    # Batched answers carry one result object per message
+    return await call_llm(prompt, max_tokens=256 * EXTRACT_BATCH_MAX_SIZE)
+
+
+_batcher = None
+if EXTRACT_BATCH_ENABLED:
+    _batcher = ExtractionBatcher(
+        call_llm=_call_batch_llm,
+        single_extract=_llm_understand,
+        window_ms=EXTRACT_BATCH_WINDOW_MS,
+        max_size=EXTRACT_BATCH_MAX_SIZE,
+        prompt=BATCH_UNDERSTAND_PROMPT,
+        parse_item=_parse_understanding,
+    )
+
+
+def get_understand_batch_stats() -> Dict[str, Any]:
+    """Micro-batching counters for the understand call (empty if disabled)"""
+    return dict(_batcher.stats) if _batcher is not None else {}
@@ -0,0 +1,154 @@
+# bot/scripts/bench_snapshot.py - Compare snapshot analytics with the equivalent SQL
+#
+# Usage:
+#   python -m bot.scripts.bench_snapshot
+#   python -m bot.scripts.bench_snapshot --from 2024-01-01 --to 2024-12-31 --repeat 10
+#   python -m bot.scripts.bench_snapshot --rebuild
+#
+# Each report runs --repeat times against the memory-mapped snapshot and
+# against the raw `timesheet` table; the median and best times are printed.
+# Results are cross-checked so a stale snapshot shows up as a mismatch.
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from datetime import date
+
+from bot.analytics.snapshot import Snapshot, build_snapshot
+from bot.config import SNAPSHOT_DIR
+from bot.db.pool import init_pool, get_pool
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 90, 99)
+
+SQL = {
+    "group_sum": """
+        SELECT project, SUM(hours)::float8 AS hours
+        FROM timesheet
+        WHERE entry_date BETWEEN $1 AND $2
+        GROUP BY project
+    """,
+    "weekly_pivot": """
+        SELECT project, date_trunc('week', entry_date)::date AS week_start,
+               SUM(hours)::float8 AS hours
+        FROM timesheet
+        WHERE entry_date BETWEEN $1 AND $2
+        GROUP BY 1, 2
+    """,
+    "user_percentiles": """
+        WITH daily AS (
+            SELECT user_id, entry_date, SUM(hours)::float8 AS hours
+            FROM timesheet
+            WHERE entry_date BETWEEN $1 AND $2
+            GROUP BY 1, 2
+        )
+        SELECT user_id,
+               percentile_cont($3::float8[]) WITHIN GROUP (ORDER BY hours) AS p
+        FROM daily
+        GROUP BY user_id
+    """,
+}
+
+
+def _timed(fn, repeat: int):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, timings
+
+
+async def _timed_async(fn, repeat: int):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, timings
+
+
+def _close(a: float, b: float) -> bool:
+    # float32 hours in the snapshot vs NUMERIC in Postgres
+    return abs(a - b) <= 1e-3 * max(1.0, abs(a), abs(b))
+
+
+def _check(name: str, snap, sql_rows) -> bool:
+    if name == "group_sum":
+        expected = {r["project"]: r["hours"] for r in sql_rows}
+        return expected.keys() == snap.keys() and all(_close(snap[k], v) for k, v in expected.items())
+
+    if name == "weekly_pivot":
+        labels, weeks, matrix = snap
+        cells = {
+            (label, week): matrix[i, j]
+            for i, label in enumerate(labels)
+            for j, week in enumerate(weeks)
+            if matrix[i, j]
+        }
+        expected = {(r["project"], r["week_start"]): r["hours"] for r in sql_rows}
+        return expected.keys() == cells.keys() and all(_close(cells[k], v) for k, v in expected.items())
+
+    expected = {r["user_id"]: r["p"] for r in sql_rows}
+    return expected.keys() == snap.keys() and all(
+        all(_close(snap[u][float(p)], v) for p, v in zip(PERCENTILES, values))
+        for u, values in expected.items()
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark snapshot analytics vs SQL")
+    parser.add_argument("--path", default=SNAPSHOT_DIR, help=f"snapshot directory (default: {SNAPSHOT_DIR})")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, default=date(1970, 1, 1))
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, default=date(9999, 12, 31))
+    parser.add_argument("--repeat", type=int, default=5, help="runs per report")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the snapshot first")
+    args = parser.parse_args()
+
+    await init_pool()
+
+    if args.rebuild:
+        _, build_ms = await _timed_async(lambda: build_snapshot(args.path), 1)
+        logger.info("Snapshot build: %.0f ms", build_ms[0])
+
+    started = time.perf_counter()
+    snapshot = Snapshot(args.path)
+    logger.info("Snapshot open: %s rows in %.1f ms", snapshot.rows, (time.perf_counter() - started) * 1000)
+
+    window = (args.date_from, args.date_to)
+    reports = {
+        "group_sum": lambda: snapshot.group_sum("project", *window),
+        "weekly_pivot": lambda: snapshot.weekly_pivot("project", *window),
+        "user_percentiles": lambda: snapshot.user_percentiles(PERCENTILES, *window),
+    }
+
+    pool = get_pool()
+    print(f"{'report':<18} {'snapshot ms':>20} {'sql ms':>20} {'speedup':>8}  match")
+    for name, report in reports.items():
+        snap, snap_ms = _timed(report, args.repeat)
+
+        sql_args = window
+        if name == "user_percentiles":
+            sql_args += ([p / 100 for p in PERCENTILES],)
+        async with pool.acquire() as conn:
+            sql_rows, sql_ms = await _timed_async(lambda: conn.fetch(SQL[name], *sql_args), args.repeat)
+
+        snap_med = statistics.median(snap_ms)
+        sql_med = statistics.median(sql_ms)
+        print(
+            f"{name:<18} "
+            f"{snap_med:>9.2f} (min {min(snap_ms):>6.2f}) "
+            f"{sql_med:>9.2f} (min {min(sql_ms):>6.2f}) "
+            f"{sql_med / max(snap_med, 1e-9):>7.1f}x  "
+            f"{'yes' if _check(name, snap, sql_rows) else 'NO'}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
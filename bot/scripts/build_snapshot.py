@@ -0,0 +1,37 @@
+# bot/scripts/build_snapshot.py - Dump the timesheet table into a columnar snapshot
+#
+# Usage:
+#   python -m bot.scripts.build_snapshot                       # writes SNAPSHOT_DIR
+#   python -m bot.scripts.build_snapshot --path /data/ts --chunk-size 100000
+#
+# Run from cron (e.g. nightly); org-wide reports then read the memory-mapped
+# snapshot instead of the primary database. Requires numpy
+# (pip install -r requirements-analytics.txt).
+
+import argparse
+import asyncio
+import logging
+
+from bot.analytics.snapshot import build_snapshot
+from bot.config import SNAPSHOT_DIR
+from bot.db.pool import init_pool
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Build a columnar timesheet snapshot")
+    parser.add_argument("--path", default=SNAPSHOT_DIR, help=f"target directory (default: {SNAPSHOT_DIR})")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="rows per cursor batch")
+    args = parser.parse_args()
+
+    await init_pool()
+    meta = await build_snapshot(args.path, chunk_size=args.chunk_size)
+
+    sizes = ", ".join(f"{len(v)} {k}s" for k, v in meta["dictionaries"].items())
+    logger.info("Snapshot ready: %s rows (%s)", meta["rows"], sizes)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
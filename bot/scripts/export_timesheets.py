@@ -0,0 +1,53 @@
+# bot/scripts/export_timesheets.py - Stream timesheet rows to CSV/JSONL
+#
+# Usage:
+#   python -m bot.scripts.export_timesheets --from 2025-01-01 --to 2025-01-31 -o jan.csv
+#   python -m bot.scripts.export_timesheets --user adhish --format jsonl > adhish.jsonl
+
+import argparse
+import asyncio
+import logging
+import sys
+from datetime import date
+
+from bot.db.pool import init_pool
+from bot.db.export import write_export, EXPORT_FORMATS
+
+logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Export timesheet rows as CSV/JSONL")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    parser.add_argument("--user", help="username or user_id")
+    parser.add_argument("--project", help="exact project name")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="YYYY-MM-DD")
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="YYYY-MM-DD")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    args = parser.parse_args()
+
+    await init_pool()
+
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        async def write(text: str):
+            out.write(text)
+
+        count = await write_export(
+            write,
+            args.format,
+            user=args.user,
+            project=args.project,
+            date_from=args.date_from,
+            date_to=args.date_to,
+        )
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    logger.info("Exported %s rows", count)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,244 @@
+# bot/scripts/import_timesheets.py - Bulk-load historical timesheet data via COPY
+#
+# Usage:
+#   python -m bot.scripts.import_timesheets export.csv
+#   python -m bot.scripts.import_timesheets export.jsonl --chunk-size 10000
+#
+# Each row needs: username (or user_id), date, hours, and optionally
+# project, task, task_type, created_at. Rows are streamed, validated and
+# copied in chunks inside one transaction, so memory stays flat and a
+# failed import leaves nothing behind.
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import sys
+import time
+from datetime import date, datetime, time as dtime
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
+from bot.config import DEFAULT_TIMEZONE
+from bot.db.pool import init_pool, get_pool
+from bot.db.rollup import mark_rollup_changed
+from bot.nlp.task_types import normalize_task_type
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+COLUMNS = [
+    "user_id", "entry_date", "project", "task", "hours",
+    "task_type", "raw_msg", "created_at",
+]
+
+
+class RowError(ValueError):
+    """Raised for a row that fails validation"""
+
+
+def iter_rows(path: str, fmt: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Stream (line_no, row dict) from a CSV or JSONL file"""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            for line_no, row in enumerate(csv.DictReader(f), start=2):
+                yield line_no, row
+        else:
+            for line_no, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_no, {"__error__": f"invalid JSON: {e}"}
+                    continue
+                yield line_no, row if isinstance(row, dict) else {"__error__": "not an object"}
+
+
+def _parse_date(value: Any) -> date:
+    if isinstance(value, date):
+        return value
+    text = str(value or "").strip()
+    if not text:
+        raise RowError("missing date")
+    try:
+        return datetime.fromisoformat(text[:10]).date()
+    except ValueError:
+        raise RowError(f"invalid date: {text!r}")
+
+
+def _parse_created_at(value: Any, entry_date: date, tz: ZoneInfo) -> datetime:
+    """Use the exported timestamp if present, else midnight of the entry date"""
+    text = str(value or "").strip()
+    if text:
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError:
+            raise RowError(f"invalid created_at: {text!r}")
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=tz)
+    return datetime.combine(entry_date, dtime(), tzinfo=tz)
+
+
+def normalize_row(row: Dict[str, Any], user_id: int, tz: ZoneInfo, raw_msg: str) -> tuple:
+    """
+    Validate a row and convert it to a COPY record (see COLUMNS)
+
+    Raises:
+        RowError: If the row is invalid
+    """
+    entry_date = _parse_date(row.get("date") or row.get("entry_date"))
+
+    try:
+        hours = float(row.get("hours") or 0)
+    except (TypeError, ValueError):
+        raise RowError(f"invalid hours: {row.get('hours')!r}")
+    if not 0 < hours <= 24:
+        raise RowError(f"hours out of range: {hours}")
+
+    project = str(row.get("project") or "").strip()
+    task = str(row.get("task") or "").strip()
+    task_type = normalize_task_type(str(row.get("task_type") or "").strip())
+    created_at = _parse_created_at(row.get("created_at"), entry_date, tz)
+
+    return (user_id, entry_date, project, task, hours, task_type, raw_msg, created_at)
+
+
+class UserResolver:
+    """
+    Maps usernames to user_id, one query per distinct username, and checks
+    numeric user_ids against the users table (loaded once), so a bad id is
+    rejected like any other row instead of failing the COPY on the foreign key
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._cache: Dict[str, Optional[int]] = {}
+        self._user_ids: Optional[Set[int]] = None
+
+    async def resolve(self, row: Dict[str, Any]) -> int:
+        if row.get("user_id") not in (None, ""):
+            try:
+                user_id = int(row["user_id"])
+            except (TypeError, ValueError):
+                raise RowError(f"invalid user_id: {row['user_id']!r}")
+            if self._user_ids is None:
+                records = await self._conn.fetch("SELECT user_id FROM users")
+                self._user_ids = {r["user_id"] for r in records}
+            if user_id not in self._user_ids:
+                raise RowError(f"unknown user_id: {user_id}")
+            return user_id
+
+        username = str(row.get("username") or "").strip()
+        if not username:
+            raise RowError("missing username")
+
+        if username not in self._cache:
+            self._cache[username] = await self._conn.fetchval(
+                "SELECT user_id FROM users WHERE username = $1",
+                username,
+            )
+
+        user_id = self._cache[username]
+        if user_id is None:
+            raise RowError(f"unknown username: {username!r}")
+        return user_id
+
+
+async def import_file(
+    path: str,
+    fmt: str,
+    chunk_size: int = 5000,
+    raw_msg: str = "import",
+    max_errors: int = 100,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    """
+    Stream a CSV/JSONL export into the timesheet table
+
+    Returns:
+        Dict with imported, rejected and total row counts
+    """
+    tz = ZoneInfo(DEFAULT_TIMEZONE)
+    pool = get_pool()
+    stats = {"total": 0, "imported": 0, "rejected": 0}
+    started = time.perf_counter()
+
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            resolver = UserResolver(conn)
+            chunk = []
+
+            async def flush():
+                if chunk and not dry_run:
+                    await conn.copy_records_to_table(
+                        "timesheet",
+                        records=chunk,
+                        columns=COLUMNS,
+                    )
+                stats["imported"] += len(chunk)
+                chunk.clear()
+                rate = stats["total"] / max(time.perf_counter() - started, 1e-9)
+                logger.info(
+                    "Progress: %s imported, %s rejected, %.0f rows/s",
+                    stats["imported"], stats["rejected"], rate,
+                )
+
+            for line_no, row in iter_rows(path, fmt):
+                stats["total"] += 1
+                try:
+                    if "__error__" in row:
+                        raise RowError(row["__error__"])
+                    user_id = await resolver.resolve(row)
+                    chunk.append(normalize_row(row, user_id, tz, raw_msg))
+                except RowError as e:
+                    stats["rejected"] += 1
+                    if stats["rejected"] <= max_errors:
+                        logger.warning("Line %s: %s", line_no, e)
+                    continue
+
+                if len(chunk) >= chunk_size:
+                    await flush()
+
+            await flush()
+
+        if not dry_run:
+            await mark_rollup_changed(conn)
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        "%s %s of %s rows (%s rejected) in %.1fs",
+        "Validated" if dry_run else "Imported",
+        stats["imported"], stats["total"], stats["rejected"], elapsed,
+    )
+    return stats
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Bulk-import timesheet rows from CSV/JSONL")
+    parser.add_argument("path", help="CSV or JSONL file")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="default: from file extension")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="rows per COPY")
+    parser.add_argument("--raw-msg", default="import", help="value stored in raw_msg")
+    parser.add_argument("--max-errors", type=int, default=100, help="rejected rows to log")
+    parser.add_argument("--dry-run", action="store_true", help="validate only, write nothing")
+    args = parser.parse_args()
+
+    fmt = args.format or ("jsonl" if args.path.endswith((".jsonl", ".ndjson")) else "csv")
+
+    await init_pool()
+    stats = await import_file(
+        args.path,
+        fmt,
+        chunk_size=args.chunk_size,
+        raw_msg=args.raw_msg,
+        max_errors=args.max_errors,
+        dry_run=args.dry_run,
+    )
+    if stats["rejected"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
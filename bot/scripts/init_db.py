@@ -24,8 +24,8 @@ async def main():
             "SELECT user_id FROM users WHERE username = 'adhish'"
         )
         if not existing:
-            user_id = await create_user("adhish", "Adhish Pawar", "Timesheet@123")
-            logger.info(f"Seeded user: adhish / Timesheet@123 (id={user_id})")
+            user_id = await create_user("adhish", "Adhish Pawar", "Timesheet@123", role="admin")
+            logger.info("Seeded admin user: adhish / Timesheet@123 (id=%s)", user_id)
         else:
             logger.info("User 'adhish' already exists, skipping seed.")
 
@@ -0,0 +1,408 @@
+# bot/scripts/load_test.py - End-to-end load test of the bot app
+#
+# Usage:
+#   python -m bot.scripts.load_test                              # 1000 users, 100 at a time
+#   python -m bot.scripts.load_test --users 5000 --concurrency 500 --llm-latency-ms 800
+#   python -m bot.scripts.load_test --workers 4 --json results.json
+#
+# Starts the app (python -m bot.app.serve) with Bot Framework auth disabled
+# and OPENAI_BASE_URL pointing at a stub LLM (bot/scripts/stub_llm.py) with
+# the given latency. Replies are not returned on the HTTP request: the bot
+# posts them to the activity's serviceUrl, which is a stub Bot Connector in
+# this process, so sync and ASYNC_TURNS_ENABLED modes are measured alike.
+#
+# Seeded users (loadtest_00001, ...) share one password hashed with
+# --bcrypt-rounds (default 4, to keep bcrypt out of the numbers; use 12 to
+# include it). Their sessions and timesheet rows are wiped before each run.
+# Each user logs in, logs time (answering clarifications and confirming)
+# and asks for summaries. The report has turn latency percentiles per step,
+# throughput, DB queries per turn (summed from the workers' /healthz
+# heartbeats) and LLM calls per turn (counted by the stub).
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import signal
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import aiohttp
+from aiohttp import web
+
+from bot.db.pool import init_pool, get_pool
+from bot.hashing import hash_password, shutdown_hashing_executor
+from bot.scripts.stub_llm import StubLLM
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 90, 99)
+
+USERNAME_PREFIX = "loadtest_"
+EXTERNAL_ID_PREFIX = "loadtest-"
+PASSWORD = "loadtest-password"
+
+# (step kind, message); clarification turns are added as the bot asks
+CONVERSATION = (
+    ("login", "hi"),
+    ("login", "{username}"),
+    ("login", PASSWORD),
+    ("log", "today 4h api testing for Glovatrix"),
+    ("log", "yesterday 3h code review"),
+    ("log", "2.5h sprint planning meeting on Atlas"),
+    ("log", "worked on the release pipeline"),
+    ("summary", "what did i do this week"),
+    ("summary", "show my tasks today"),
+)
+MAX_CLARIFICATIONS = 4
+
+
+def follow_up(reply: str) -> Optional[str]:
+    """Answer to a clarification question or confirmation (None when done)"""
+    lower = (reply or "").lower()
+    if "'yes'" in lower or "(yes/no" in lower or "again, or do you want" in lower:
+        return "yes"
+    if "task type" in lower or "type of work" in lower or "pick one" in lower:
+        return "Development"
+    if "project" in lower and ("?" in lower or "project name" in lower):
+        return "Glovatrix"
+    if "actually doing" in lower or "describe the work" in lower or "but no task" in lower:
+        return "fixing the login bug"
+    return None
+
+
+class StubConnector:
+    """Bot Connector stand-in: receives the bot's replies by conversation id"""
+
+    def __init__(self):
+        self._waiting: Dict[str, asyncio.Future] = {}
+        self.unexpected = 0
+        self._runner = None
+
+    def expect(self, conversation_id: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[conversation_id] = future
+        return future
+
+    async def handle(self, req: web.Request) -> web.Response:
+        body = await req.json()
+        future = self._waiting.pop(req.match_info["conversation_id"], None)
+        if future is not None and not future.done():
+            future.set_result(body.get("text") or "")
+        else:
+            self.unexpected += 1
+        return web.json_response({"id": uuid.uuid4().hex})
+
+    async def start(self, host: str, port: int) -> None:
+        app = web.Application()
+        app.router.add_post("/v3/conversations/{conversation_id}/activities{tail:.*}", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+# === SETUP ===
+
+async def seed_users(count: int, bcrypt_rounds: int) -> None:
+    """Create (or reset) the load-test users and wipe their previous runs"""
+    await init_pool()
+    pool = get_pool()
+    password_hash = await hash_password(PASSWORD, rounds=bcrypt_rounds)
+    usernames = [f"{USERNAME_PREFIX}{i:05d}" for i in range(1, count + 1)]
+
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            await conn.execute(
+                "DELETE FROM sessions WHERE external_id LIKE $1",
+                f"{EXTERNAL_ID_PREFIX}%",
+            )
+            await conn.execute("""
+                DELETE FROM timesheet
+                WHERE user_id IN (SELECT user_id FROM users WHERE username LIKE $1)
+            """, f"{USERNAME_PREFIX}%")
+            await conn.execute("""
+                INSERT INTO users (username, display_name, password_hash)
+                SELECT u, 'Load Test ' || u, $2 FROM unnest($1::text[]) AS u
+                ON CONFLICT (username) DO UPDATE SET password_hash = EXCLUDED.password_hash
+            """, usernames, password_hash)
+
+    await pool.close()
+    logger.info("Seeded %s users (bcrypt rounds %s)", count, bcrypt_rounds)
+
+
+def read_status(path: str) -> Optional[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+async def wait_status(path: str, ready: Callable[[dict], bool], timeout: float) -> dict:
+    """Poll the supervisor status file until `ready(status)` holds"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = read_status(path)
+        if status and ready(status):
+            return status
+        await asyncio.sleep(0.2)
+    raise SystemExit(f"App did not report ready within {timeout:.0f}s (see the app log)")
+
+
+def total_queries(status: dict) -> int:
+    return sum((w.get("health") or {}).get("pool", {}).get("queries", 0) for w in status["workers"])
+
+
+async def start_app(args, status_path: str, llm_url: str, log_file) -> asyncio.subprocess.Process:
+    env = dict(
+        os.environ,
+        BOT_APP_ID="",
+        BOT_APP_PASSWORD="",
+        OPENAI_API_KEY="stub",
+        OPENAI_BASE_URL=llm_url,
+        # A warm cache file from an earlier run would hide LLM calls
+        EXTRACT_CACHE_PATH="",
+        SERVE_STATUS_PATH=status_path,
+        SERVE_HEARTBEAT_INTERVAL="1",
+    )
+    return await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "bot.app.serve",
+        "--workers", str(args.workers),
+        "--host", "127.0.0.1",
+        "--port", str(args.port),
+        env=env,
+        stdout=log_file,
+        stderr=log_file,
+    )
+
+
+# === CONVERSATIONS ===
+
+class Results:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.completed = 0
+
+    @property
+    def turns(self) -> int:
+        return sum(len(v) for v in self.latencies.values())
+
+
+async def send_turn(
+    http: aiohttp.ClientSession,
+    connector: StubConnector,
+    args,
+    external_id: str,
+    conversation_id: str,
+    text: str,
+) -> tuple:
+    """Post one message activity and wait for the bot's reply at the connector"""
+    reply = connector.expect(conversation_id)
+    activity = {
+        "type": "message",
+        "id": uuid.uuid4().hex,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "channelId": "loadtest",
+        "serviceUrl": f"http://127.0.0.1:{args.connector_port}",
+        "from": {"id": external_id, "name": external_id},
+        "recipient": {"id": "timesheet-bot", "name": "Timesheet Bot"},
+        "conversation": {"id": conversation_id},
+        "text": text,
+    }
+
+    started = time.perf_counter()
+    async with http.post(f"http://127.0.0.1:{args.port}/api/messages", json=activity) as resp:
+        if resp.status >= 300:
+            raise RuntimeError(f"/api/messages answered {resp.status}")
+    reply_text = await asyncio.wait_for(reply, args.timeout)
+    return time.perf_counter() - started, reply_text
+
+
+async def run_user(n: int, http, connector, args, results: Results, run_id: str) -> None:
+    username = f"{USERNAME_PREFIX}{n:05d}"
+    external_id = f"{EXTERNAL_ID_PREFIX}{run_id}-{n}"
+    conversation_id = f"conv-{run_id}-{n}"
+
+    async def turn(kind: str, text: str) -> str:
+        if args.think_ms:
+            await asyncio.sleep(random.uniform(0, 2 * args.think_ms) / 1000)
+        try:
+            elapsed, reply = await send_turn(http, connector, args, external_id, conversation_id, text)
+        except Exception:
+            results.errors[kind] += 1
+            raise
+        results.latencies[kind].append(elapsed)
+        return reply
+
+    try:
+        for kind, template in CONVERSATION:
+            reply = await turn(kind, template.format(username=username))
+            if kind != "log":
+                continue
+            for _ in range(MAX_CLARIFICATIONS):
+                answer = follow_up(reply)
+                if answer is None:
+                    break
+                reply = await turn("clarify", answer)
+    except Exception as e:
+        logger.debug("User %s stopped: %s: %s", n, type(e).__name__, e)
+        return
+    results.completed += 1
+
+
+async def run_load(args, connector: StubConnector, results: Results) -> float:
+    """Run every user's conversation, at most --concurrency at a time"""
+    run_id = uuid.uuid4().hex[:8]
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited(n, http):
+        async with semaphore:
+            await run_user(n, http, connector, args, results, run_id)
+
+    connector_limit = aiohttp.TCPConnector(limit=args.concurrency)
+    async with aiohttp.ClientSession(connector=connector_limit) as http:
+        started = time.perf_counter()
+        await asyncio.gather(*(limited(n, http) for n in range(1, args.users + 1)))
+        return time.perf_counter() - started
+
+
+# === REPORT ===
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(p / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def build_report(args, results: Results, elapsed: float, queries: int, stub: StubLLM, unexpected: int) -> dict:
+    turns = results.turns
+    steps = {}
+    for kind, values in sorted(results.latencies.items()) + [("all", [v for vs in results.latencies.values() for v in vs])]:
+        values = sorted(values)
+        steps[kind] = {
+            "turns": len(values),
+            "errors": results.errors.get(kind, 0) if kind != "all" else sum(results.errors.values()),
+            "mean_ms": statistics.fmean(values) * 1000 if values else 0.0,
+            **{f"p{p}_ms": percentile(values, p) * 1000 for p in PERCENTILES},
+            "max_ms": values[-1] * 1000 if values else 0.0,
+        }
+
+    return {
+        "users": args.users,
+        "completed_users": results.completed,
+        "concurrency": args.concurrency,
+        "workers": args.workers,
+        "llm_latency_ms": args.llm_latency_ms,
+        "elapsed_s": elapsed,
+        "turns": turns,
+        "turns_per_sec": turns / elapsed if elapsed else 0.0,
+        "db_queries_per_turn": queries / turns if turns else 0.0,
+        "llm_calls_per_turn": stub.calls / turns if turns else 0.0,
+        "llm_tokens_per_turn": (stub.prompt_tokens + stub.completion_tokens) / turns if turns else 0.0,
+        "unexpected_replies": unexpected,
+        "steps": steps,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"\n{report['completed_users']}/{report['users']} conversations completed, "
+        f"{report['turns']} turns in {report['elapsed_s']:.1f}s "
+        f"({report['turns_per_sec']:.1f} turns/s, {report['workers']} workers, "
+        f"concurrency {report['concurrency']}, LLM latency {report['llm_latency_ms']:.0f} ms)"
+    )
+    print(f"DB queries/turn: {report['db_queries_per_turn']:.2f}")
+    print(f"LLM calls/turn:  {report['llm_calls_per_turn']:.3f} ({report['llm_tokens_per_turn']:.0f} tokens/turn)")
+    if report["unexpected_replies"]:
+        print(f"Replies nobody waited for: {report['unexpected_replies']}")
+
+    print(f"\n{'step':<10}{'turns':>8}{'errors':>8}{'mean':>10}" + "".join(f"{'p' + str(p):>10}" for p in PERCENTILES) + f"{'max':>10}")
+    for kind, s in report["steps"].items():
+        print(
+            f"{kind:<10}{s['turns']:>8}{s['errors']:>8}{s['mean_ms']:>10.1f}"
+            + "".join(f"{s[f'p{p}_ms']:>10.1f}" for p in PERCENTILES)
+            + f"{s['max_ms']:>10.1f}"
+        )
+    print("(latencies in ms, from POST /api/messages until the reply reaches the connector)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load test the bot with a stub channel and LLM")
+    parser.add_argument("--users", type=int, default=1000, help="simulated users (one conversation each)")
+    parser.add_argument("--concurrency", type=int, default=100, help="conversations running at once")
+    parser.add_argument("--think-ms", type=float, default=0, help="mean pause before each message")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds to wait for a reply")
+    parser.add_argument("--workers", type=int, default=1, help="app worker processes")
+    parser.add_argument("--port", type=int, default=3979, help="app port")
+    parser.add_argument("--connector-port", type=int, default=8088)
+    parser.add_argument("--llm-port", type=int, default=8089)
+    parser.add_argument("--llm-latency-ms", type=float, default=400)
+    parser.add_argument("--llm-jitter-ms", type=float, default=100)
+    parser.add_argument("--bcrypt-rounds", type=int, default=4, help="cost of the seeded password hash")
+    parser.add_argument("--app-log", default="load_test_app.log", help="app stdout/stderr")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    await seed_users(args.users, args.bcrypt_rounds)
+    shutdown_hashing_executor()
+
+    stub = StubLLM(args.llm_latency_ms, args.llm_jitter_ms)
+    connector = StubConnector()
+    await stub.start("127.0.0.1", args.llm_port)
+    await connector.start("127.0.0.1", args.connector_port)
+
+    status_path = os.path.join(tempfile.mkdtemp(prefix="load_test_"), "status.json")
+    with open(args.app_log, "ab") as log_file:
+        app = await start_app(args, status_path, f"http://127.0.0.1:{args.llm_port}/v1", log_file)
+        try:
+            before = await wait_status(
+                status_path,
+                lambda s: len(s["workers"]) == args.workers
+                and all(w["ready"] and w.get("health") for w in s["workers"]),
+                timeout=120,
+            )
+            logger.info("App ready (%s workers), running %s conversations", args.workers, args.users)
+
+            results = Results()
+            elapsed = await run_load(args, connector, results)
+
+            # Next heartbeat of every worker carries the final query counts
+            finished_at = time.time()
+            after = await wait_status(
+                status_path,
+                lambda s: all(w["last_heartbeat"] > finished_at for w in s["workers"]),
+                timeout=30,
+            )
+        finally:
+            app.send_signal(signal.SIGTERM)
+            await app.wait()
+            await connector.stop()
+            await stub.stop()
+
+    report = build_report(
+        args, results, elapsed, total_queries(after) - total_queries(before), stub, connector.unexpected,
+    )
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
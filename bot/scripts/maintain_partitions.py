@@ -0,0 +1,29 @@
+# bot/scripts/maintain_partitions.py - Create upcoming monthly timesheet partitions
+#
+# Usage (e.g. from a monthly cron):
+#   python -m bot.scripts.maintain_partitions --months-ahead 6
+
+import argparse
+import asyncio
+import logging
+
+from bot.config import TIMESHEET_PARTITIONS_AHEAD
+from bot.db.pool import init_pool
+from bot.db.partitions import ensure_timesheet_partitions
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Create upcoming timesheet partitions")
+    parser.add_argument("--months-ahead", type=int, default=TIMESHEET_PARTITIONS_AHEAD)
+    args = parser.parse_args()
+
+    pool = await init_pool()
+    partitions = await ensure_timesheet_partitions(pool, args.months_ahead)
+    logger.info("Partitions present: %s", ", ".join(partitions))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,38 @@
+# bot/scripts/migrate.py - Show or apply schema migrations
+#
+# Usage:
+#   python -m bot.scripts.migrate            # apply pending migrations
+#   python -m bot.scripts.migrate --status   # print applied vs latest version
+
+import argparse
+import asyncio
+import logging
+
+import asyncpg
+
+from bot.config import POSTGRES_DSN
+from bot.db.migrate import get_schema_version, latest_version, run_migrations
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Schema migrations")
+    parser.add_argument("--status", action="store_true", help="only print versions")
+    args = parser.parse_args()
+
+    pool = await asyncpg.create_pool(dsn=POSTGRES_DSN, min_size=1, max_size=1)
+    try:
+        if args.status:
+            async with pool.acquire() as conn:
+                current = await get_schema_version(conn)
+            logger.info("Schema version: %s (latest: %s)", current, latest_version())
+        else:
+            await run_migrations(pool)
+    finally:
+        await pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,38 @@
+# bot/scripts/rebuild_rollup.py - Recompute or verify the daily rollup table
+#
+# Usage:
+#   python -m bot.scripts.rebuild_rollup --verify   # report mismatches only
+#   python -m bot.scripts.rebuild_rollup            # rebuild from raw entries
+
+import argparse
+import asyncio
+import logging
+import sys
+
+from bot.db.pool import init_pool
+from bot.db.rollup import rebuild_rollup, verify_rollup
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Rebuild/verify timesheet_daily_rollup")
+    parser.add_argument("--verify", action="store_true", help="compare only, change nothing")
+    args = parser.parse_args()
+
+    pool = await init_pool()
+
+    if args.verify:
+        mismatches = await verify_rollup(pool)
+        for m in mismatches[:50]:
+            logger.warning("Mismatch: %s", m)
+        if mismatches:
+            sys.exit(1)
+        return
+
+    await rebuild_rollup(pool)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
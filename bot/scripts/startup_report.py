@@ -0,0 +1,120 @@
+# bot/scripts/startup_report.py - Break down bot startup cost (imports and init)
+#
+# Usage:
+#   python -m bot.scripts.startup_report                  # import breakdown
+#   python -m bot.scripts.startup_report --init --db      # + LLM client and DB pool init
+#   python -m bot.scripts.startup_report --budget-ms 1500 # exit 1 if over budget
+#
+# `import bot.app.main` runs in a fresh interpreter with -X importtime.
+# The report lists the slowest imports and the time per top-level package.
+# The check fails if the import exceeds --budget-ms or if it pulled in the
+# LLM stack (langchain/openai), which must stay unimported until the first
+# LLM call.
+
+import argparse
+import json
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+# Modules that must not be imported by `import bot.app.main`
+LAZY_MODULES = ("langchain_openai", "langchain_core", "openai")
+
+_CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import bot.app.main
+report = {{"import_ms": (time.perf_counter() - started) * 1000}}
+report["lazy_loaded"] = sorted(m for m in {lazy!r} if m in sys.modules)
+
+if {init!r}:
+    from bot.nlp.llm_client import get_llm
+    started = time.perf_counter()
+    get_llm()
+    report["llm_client_ms"] = (time.perf_counter() - started) * 1000
+
+if {db!r}:
+    import asyncio
+    from bot.db.pool import init_pool
+    started = time.perf_counter()
+    asyncio.run(init_pool())
+    report["db_pool_ms"] = (time.perf_counter() - started) * 1000
+
+print("REPORT " + json.dumps(report))
+"""
+
+
+def run_child(init: bool, db: bool) -> Tuple[Dict, List[Tuple[str, int, int]]]:
+    """
+    Import the bot in a fresh interpreter
+
+    Returns:
+        (timings report, [(module, self_us, cumulative_us)] from -X importtime)
+    """
+    code = _CHILD.format(lazy=LAZY_MODULES, init=init, db=db)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        raise SystemExit(f"Importing the bot failed (exit {proc.returncode})")
+
+    report = {}
+    for line in proc.stdout.splitlines():
+        if line.startswith("REPORT "):
+            report = json.loads(line[len("REPORT "):])
+
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        imports.append((module.rstrip(), int(self_us), int(cumulative_us)))
+
+    return report, imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report bot import and init times")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    parser.add_argument("--init", action="store_true", help="also time LLM client construction")
+    parser.add_argument("--db", action="store_true", help="also time init_pool (needs Postgres)")
+    parser.add_argument("--budget-ms", type=float, help="fail if `import bot.app.main` takes longer")
+    args = parser.parse_args()
+
+    report, imports = run_child(args.init, args.db)
+
+    print(f"import bot.app.main: {report['import_ms']:.0f} ms ({len(imports)} modules)")
+    for key, label in (("llm_client_ms", "LLM client (first use)"), ("db_pool_ms", "DB pool init")):
+        if key in report:
+            print(f"{label}: {report[key]:.0f} ms")
+
+    print("\nSlowest imports (cumulative ms):")
+    for module, _, cumulative in sorted(imports, key=lambda m: -m[2])[:args.top]:
+        print(f"  {cumulative / 1000:8.1f}  {module.strip()}")
+
+    by_package = defaultdict(int)
+    for module, self_us, _ in imports:
+        by_package[module.strip().split(".")[0]] += self_us
+
+    print("\nSelf time by top-level package (ms):")
+    for package, self_us in sorted(by_package.items(), key=lambda p: -p[1])[:args.top]:
+        print(f"  {self_us / 1000:8.1f}  {package}")
+
+    failed = False
+    if report["lazy_loaded"]:
+        print(f"\nFAIL: LLM stack imported eagerly: {', '.join(report['lazy_loaded'])}")
+        failed = True
+    if args.budget_ms is not None and report["import_ms"] > args.budget_ms:
+        print(f"\nFAIL: import took {report['import_ms']:.0f} ms, budget {args.budget_ms:.0f} ms")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+# bot/scripts/stub_llm.py - OpenAI-compatible stub LLM for load tests and offline runs
+#
+# Usage:
+#   python -m bot.scripts.stub_llm --port 8089 --latency-ms 400 --jitter-ms 150
+#   OPENAI_BASE_URL=http://localhost:8089/v1 OPENAI_API_KEY=stub python -m bot.app.main
+#
+# Serves POST /v1/chat/completions. Answers are built with a few regexes
+# from the user message(s) in the bot's own prompts (single and batched
+# understand and extraction), so conversations behave like they would with
+# the real model. Every answer waits latency +/- jitter first; token usage
+# is approximated as characters / 4.
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import re
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+from aiohttp import web
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PROJECTS = ("Glovatrix", "TeleInsight", "Atlas", "Orion")
+
+TASK_TYPES = (
+    ("Testing", ("test", "qa")),
+    ("Debugging", ("bug", "debug", "fix")),
+    ("Meeting", ("meeting", "standup", "call", "sync")),
+    ("Documentation", ("doc", "readme", "wiki")),
+    ("DevOps", ("deploy", "pipeline", "ci", "infra")),
+    ("Research", ("research", "spike", "poc")),
+    ("Development", ("dev", "api", "build", "implement", "feature", "code")),
+)
+
+HOURS_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(?:h|hr|hrs|hours?)\b", re.IGNORECASE)
+USER_MESSAGE_RE = re.compile(r'User message: "(.*)"')
+TODAY_RE = re.compile(r"Today's date: (\d{4}-\d{2}-\d{2})")
+BATCH_ITEM_RE = re.compile(r'^(\d+)\. \(date: (\d{4}-\d{2}-\d{2})\) "(.*)"$', re.MULTILINE)
+
+
+def extract_entries(message: str, today: date) -> List[Dict[str, Any]]:
+    """Entries the model would plausibly return for a message"""
+    hours = HOURS_RE.search(message)
+    if not hours:
+        return []
+
+    lower = message.lower()
+    entry_date = today - timedelta(days=1) if "yesterday" in lower else today
+    project = next((p for p in PROJECTS if p.lower() in lower), "")
+    task_type = next(
+        (name for name, words in TASK_TYPES if any(w in lower for w in words)),
+        "Unknown",
+    )
+
+    task = HOURS_RE.sub("", message)
+    for word in ("today", "yesterday", "for", "on", project):
+        if word:
+            task = re.sub(rf"\b{re.escape(word)}\b", "", task, flags=re.IGNORECASE)
+    task = " ".join(task.split())
+
+    return [{
+        "date": entry_date.isoformat(),
+        "hours": float(hours.group(1)),
+        "task": task,
+        "project": project,
+        "task_type": task_type,
+    }]
+
+
+def classify(message: str) -> str:
+    """Intent for the combined understand prompt"""
+    lower = message.lower()
+    if "correct" in lower or "change" in lower:
+        return "correction"
+    if "project summary" in lower:
+        return "admin_project_summary"
+    if any(w in lower for w in ("performance", "efficiency")):
+        return "admin_efficiency"
+    if "how much work" in lower:
+        return "admin_user_summary"
+    if "week" in lower:
+        return "weekly_summary"
+    if "today" in lower and any(w in lower for w in ("summary", "tasks", "show")):
+        return "daily_summary"
+    if HOURS_RE.search(message):
+        return "timesheet_log"
+    if lower.strip() in {"hi", "hello", "hey"}:
+        return "greeting"
+    return "unknown"
+
+
+def understand(message: str, today: date) -> Dict[str, Any]:
+    """Answer object for the combined understand prompt"""
+    intent = classify(message)
+    entries = extract_entries(message, today) if intent == "timesheet_log" else []
+    return {"intent": intent, "entries": entries, "correction_target": None}
+
+
+def answer(prompt: str) -> str:
+    """Answer text for one of the bot's prompts"""
+    batch = BATCH_ITEM_RE.findall(prompt)
+    if batch:
+        if '"intent"' in prompt:
+            return json.dumps({
+                n: understand(json.loads(f'"{msg}"'), date.fromisoformat(day))
+                for n, day, msg in batch
+            })
+        return json.dumps({
+            n: extract_entries(json.loads(f'"{msg}"'), date.fromisoformat(day))
+            for n, day, msg in batch
+        })
+
+    match = USER_MESSAGE_RE.search(prompt)
+    message = match.group(1) if match else ""
+    today_match = TODAY_RE.search(prompt)
+    today = date.fromisoformat(today_match.group(1)) if today_match else date.today()
+
+    if '"intent"' in prompt:
+        return json.dumps(understand(message, today))
+
+    return json.dumps(extract_entries(message, today))
+
+
+class StubLLM:
+    """
+    Chat-completions endpoint with configurable latency
+
+    Args:
+        latency_ms: Mean time before each answer
+        jitter_ms: Uniform +/- spread around latency_ms
+    """
+
+    def __init__(self, latency_ms: float = 400, jitter_ms: float = 0):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._runner = None
+
+    async def handle(self, req: web.Request) -> web.Response:
+        body = await req.json()
+        prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+        self.calls += 1
+
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        content = answer(prompt)
+        usage = {
+            "prompt_tokens": len(prompt) // 4,
+            "completion_tokens": len(content) // 4,
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        self.prompt_tokens += usage["prompt_tokens"]
+        self.completion_tokens += usage["completion_tokens"]
+
+        return web.json_response({
+            "id": f"chatcmpl-stub-{self.calls}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        })
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self.handle)
+        return app
+
+    async def start(self, host: str, port: int) -> None:
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        logger.info("Stub LLM on http://%s:%s/v1 (latency %.0f ms)", host, port, self.latency * 1000)
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Serve an OpenAI-compatible stub LLM")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=400)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    stub = StubLLM(args.latency_ms, args.jitter_ms)
+    await stub.start(args.host, args.port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stub.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -176,3 +176,17 @@ def reply_correction_no_entry():
         "I'd love to correct something, but your timesheet is empty."
     ]
     return random.choice(options)
+
+
+# ============================================================================
+# SYSTEM RESPONSES
+# ============================================================================
+
+def reply_busy():
+    """Turn queue is full; the message was not processed"""
+    options = [
+        "I'm swamped right now 😅 Please send that again in a minute.",
+        "Too many messages at once – I couldn't get to yours. Try again shortly? 🙏",
+        "I'm a bit busy at the moment ⏳ Please resend your message in a little while."
+    ]
+    return random.choice(options)
@@ -0,0 +1,336 @@
+"""
+bot/tracing.py - Request-scoped tracing with contextvars
+
+Every inbound activity starts a trace whose id doubles as the turn id.
+Spans opened anywhere below it (router, flows, LLM calls, pool acquire,
+queries) find their parent through a ContextVar, so nothing has to be
+passed around. The turn id is also stamped on every log record
+(`%(turn_id)s`), which ties log lines of one turn together.
+
+Sampling is decided once per turn (TRACE_SAMPLE_RATE); for an unsampled
+turn span() costs a ContextVar lookup. Finished spans go into a bounded
+buffer that a background task flushes to a JSONL file or an OTLP/HTTP
+(JSON) collector; when the buffer is full, spans are dropped and counted,
+never blocking a turn.
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from bot.config import (
+    TRACE_ENABLED,
+    TRACE_SAMPLE_RATE,
+    TRACE_EXPORTER,
+    TRACE_JSONL_PATH,
+    TRACE_OTLP_ENDPOINT,
+    TRACE_BUFFER_SIZE,
+    TRACE_FLUSH_INTERVAL,
+)
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "timesheet-bot"
+
+
+class Span:
+    __slots__ = (
+        "trace_id", "span_id", "parent_id", "name", "start", "end",
+        "attributes", "status", "sampled",
+    )
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], sampled: bool):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.attributes: Dict[str, Any] = {}
+        self.status = "ok"
+        self.sampled = sampled
+
+    def set(self, **attributes) -> None:
+        """Add attributes to the span"""
+        if self.sampled:
+            self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "end": self.end,
+            "duration_ms": round((self.end - self.start) * 1000, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+            "pid": os.getpid(),
+        }
+
+
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+# Finished, sampled spans waiting for export
+_buffer: deque = deque()
+_stats = {"turns": 0, "sampled": 0, "spans": 0, "dropped": 0, "exported": 0, "export_errors": 0}
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def current_turn_id() -> Optional[str]:
+    """Trace id of the turn being processed (None outside a turn)"""
+    span = _current.get()
+    return span.trace_id if span else None
+
+
+def _finish(span: Span) -> None:
+    span.end = time.time()
+    if not span.sampled:
+        return
+    _stats["spans"] += 1
+    if len(_buffer) >= TRACE_BUFFER_SIZE:
+        _stats["dropped"] += 1
+        return
+    _buffer.append(span)
+
+
+@contextmanager
+def start_turn(name: str = "turn", **attributes) -> Iterator[Span]:
+    """
+    Open the root span of a turn (new trace id = turn id)
+
+    Args:
+        name: Span name
+        **attributes: Span attributes (channel, activity id, ...)
+    """
+    sampled = TRACE_ENABLED and random.random() < TRACE_SAMPLE_RATE
+    _stats["turns"] += 1
+    if sampled:
+        _stats["sampled"] += 1
+
+    span = Span(name, os.urandom(16).hex(), None, sampled)
+    span.set(**attributes)
+    with _activate(span):
+        yield span
+
+
+@contextmanager
+def span(name: str, parent: Optional[Span] = None, **attributes) -> Iterator[Optional[Span]]:
+    """
+    Open a child span of the current (or given) span
+
+    Yields None, and records nothing, outside a sampled turn.
+
+    Args:
+        name: Span name
+        parent: Explicit parent, e.g. a turn resumed on a worker task
+        **attributes: Span attributes
+    """
+    parent = parent or _current.get()
+    if parent is None or not parent.sampled:
+        yield None
+        return
+
+    child = Span(name, parent.trace_id, parent.span_id, True)
+    child.attributes.update(attributes)
+    with _activate(child):
+        yield child
+
+
+@contextmanager
+def resume(parent: Optional[Span], name: str) -> Iterator[Optional[Span]]:
+    """
+    Continue a turn in another task (e.g. the async turn worker)
+
+    Unlike span(), the turn id is restored even for unsampled turns.
+    """
+    if parent is None:
+        yield None
+        return
+
+    child = Span(name, parent.trace_id, parent.span_id, parent.sampled)
+    with _activate(child):
+        yield child
+
+
+@contextmanager
+def _activate(span: Span) -> Iterator[Span]:
+    token = _current.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.status = "error"
+        span.set(error=f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        _current.reset(token)
+        _finish(span)
+
+
+def record_span(name: str, duration: float, **attributes) -> None:
+    """
+    Record an already finished operation as a child of the current span
+
+    Used where only the elapsed time is known afterwards (query logger).
+
+    Args:
+        name: Span name
+        duration: Seconds the operation took
+        **attributes: Span attributes
+    """
+    parent = _current.get()
+    if parent is None or not parent.sampled:
+        return
+
+    child = Span(name, parent.trace_id, parent.span_id, True)
+    child.start = time.time() - duration
+    child.attributes.update(attributes)
+    _finish(child)
+
+
+def install_log_correlation() -> None:
+    """Give every log record a `turn_id` attribute ("-" outside a turn)"""
+    factory = logging.getLogRecordFactory()
+    if getattr(factory, "_adds_turn_id", False):
+        return
+
+    def record_factory(*args, **kwargs):
+        record = factory(*args, **kwargs)
+        span = _current.get()
+        record.turn_id = span.trace_id[:12] if span else "-"
+        return record
+
+    record_factory._adds_turn_id = True
+    logging.setLogRecordFactory(record_factory)
+
+
+def get_tracing_stats() -> Dict[str, Any]:
+    """Turns seen/sampled, spans recorded/dropped/exported and buffer size"""
+    return {
+        "enabled": TRACE_ENABLED,
+        "sample_rate": TRACE_SAMPLE_RATE,
+        "exporter": TRACE_EXPORTER,
+        "buffered": len(_buffer),
+        **_stats,
+    }
+
+
+# === EXPORT ===
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_payload(spans: List[Span]) -> Dict[str, Any]:
+    """OTLP/HTTP JSON body (ExportTraceServiceRequest)"""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": SERVICE_NAME}},
+                {"key": "process.pid", "value": {"intValue": str(os.getpid())}},
+            ]},
+            "scopeSpans": [{
+                "scope": {"name": "bot.tracing"},
+                "spans": [
+                    {
+                        "traceId": s.trace_id,
+                        "spanId": s.span_id,
+                        **({"parentSpanId": s.parent_id} if s.parent_id else {}),
+                        "name": s.name,
+                        "kind": 1,
+                        "startTimeUnixNano": str(int(s.start * 1e9)),
+                        "endTimeUnixNano": str(int(s.end * 1e9)),
+                        "attributes": [
+                            {"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()
+                        ],
+                        "status": {"code": 2 if s.status == "error" else 1},
+                    }
+                    for s in spans
+                ],
+            }],
+        }],
+    }
+
+
+def _write_jsonl(spans: List[Span]) -> None:
+    with open(TRACE_JSONL_PATH, "a", encoding="utf-8") as f:
+        for s in spans:
+            f.write(json.dumps(s.to_dict(), default=str) + "\n")
+
+
+class SpanExporter:
+    """Background task draining the span buffer every TRACE_FLUSH_INTERVAL seconds"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._session = None
+
+    def start(self) -> None:
+        if TRACE_ENABLED and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="trace-exporter")
+            logger.info("Tracing on: sample rate %s, exporter %s", TRACE_SAMPLE_RATE, TRACE_EXPORTER)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self.flush()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(TRACE_FLUSH_INTERVAL)
+            await self.flush()
+
+    async def flush(self) -> None:
+        spans = []
+        while _buffer:
+            spans.append(_buffer.popleft())
+        if not spans:
+            return
+
+        try:
+            if TRACE_EXPORTER == "otlp":
+                await self._post_otlp(spans)
+            else:
+                await asyncio.get_running_loop().run_in_executor(None, _write_jsonl, spans)
+            _stats["exported"] += len(spans)
+        except Exception as e:
+            _stats["export_errors"] += 1
+            logger.warning("Exporting %s spans failed: %s", len(spans), e)
+
+    async def _post_otlp(self, spans: List[Span]) -> None:
+        import aiohttp
+
+        if self._session is None:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5))
+        async with self._session.post(TRACE_OTLP_ENDPOINT, json=_otlp_payload(spans)) as resp:
+            if resp.status >= 300:
+                raise RuntimeError(f"collector answered {resp.status}")
+
+
+exporter = SpanExporter()
@@ -0,0 +1,74 @@
+"""Shared fixtures: a throwaway Postgres database per test (TEST_POSTGRES_DSN)"""
+
+import asyncio
+import os
+import uuid
+from urllib.parse import urlsplit, urlunsplit
+
+import pytest
+
+
+@pytest.fixture
+def pg_dsn():
+    """DSN of a freshly created, empty database (dropped after the test)"""
+    dsn = os.getenv("TEST_POSTGRES_DSN")
+    if not dsn:
+        pytest.skip("set TEST_POSTGRES_DSN to run database tests")
+    asyncpg = pytest.importorskip("asyncpg")
+
+    name = f"timesheet_test_{uuid.uuid4().hex[:12]}"
+
+    async def admin(sql):
+        conn = await asyncpg.connect(dsn)
+        try:
+            await conn.execute(sql)
+        finally:
+            await conn.close()
+
+    asyncio.run(admin(f'CREATE DATABASE "{name}"'))
+    yield urlunsplit(urlsplit(dsn)._replace(path=f"/{name}"))
+    asyncio.run(admin(f'DROP DATABASE "{name}" WITH (FORCE)'))
+
+
+@pytest.fixture
+def run_db(pg_dsn, monkeypatch):
+    """
+    Run `fn(pool)` against the test database with a migrated bot pool
+
+    The pool (bot.db.pool.init_pool) lives for one asyncio.run() call.
+    """
+    from bot.db import pool as pool_module
+
+    monkeypatch.setattr(pool_module, "POSTGRES_DSN", pg_dsn)
+
+    def run(fn):
+        async def main():
+            pool_module._pool = None
+            pool = await pool_module.init_pool()
+            try:
+                return await fn(pool)
+            finally:
+                await pool.close()
+                pool_module._pool = None
+
+        return asyncio.run(main())
+
+    return run
+
+
+@pytest.fixture
+def run_pool(pg_dsn):
+    """Run `fn(pool)` against the test database with a plain asyncpg pool (no migrations)"""
+    import asyncpg
+
+    def run(fn):
+        async def main():
+            pool = await asyncpg.create_pool(pg_dsn, min_size=1, max_size=4)
+            try:
+                return await fn(pool)
+            finally:
+                await pool.close()
+
+        return asyncio.run(main())
+
+    return run
@@ -0,0 +1,51 @@
+"""Admin user-summary questions resolve the user they name"""
+
+import pytest
+
+pytest.importorskip("asyncpg")
+
+from bot.app.admin_flow import _user_candidates  # noqa: E402
+from bot.db import analytics  # noqa: E402
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("how much work did adhish do this week", ["adhish"]),
+    ("hours for maria last month", ["maria"]),
+    ("john's summary", ["john"]),
+    ("performance of user bob.k", ["bob.k"]),
+    ("how much work did the team do this week", []),
+    ("will you show me the weekly summary", []),
+])
+def test_user_candidates_come_from_name_positions(text, expected):
+    assert _user_candidates(text) == expected
+
+
+def test_find_user_prefers_exact_username(run_db):
+    async def scenario(pool):
+        await pool.execute(
+            "INSERT INTO users (username, password_hash, display_name) VALUES "
+            "('adhish', 'x', 'Adhish Rao'), ('will', 'x', 'Will Smith'), "
+            "('msmith', 'x', 'Adhish Smith'), ('jdoe', 'x', 'John Doe')"
+        )
+        return (
+            await analytics.find_user(["adhish"]),
+            await analytics.find_user(["john"]),
+            await analytics.find_user(["nobody"]),
+        )
+
+    by_username, by_first_name, unknown = run_db(scenario)
+
+    assert by_username["username"] == "adhish"
+    assert by_first_name["username"] == "jdoe"
+    assert unknown is None
+
+
+def test_find_user_skips_ambiguous_first_name(run_db):
+    async def scenario(pool):
+        await pool.execute(
+            "INSERT INTO users (username, password_hash, display_name) VALUES "
+            "('asmith', 'x', 'Anna Smith'), ('ajones', 'x', 'Anna Jones')"
+        )
+        return await analytics.find_user(["anna"])
+
+    assert run_db(scenario) is None
@@ -0,0 +1,42 @@
+"""Cached admin reports see writes made by other processes (needs Postgres)"""
+
+from datetime import date
+
+import pytest
+
+pytest.importorskip("asyncpg")
+
+from bot.db import analytics  # noqa: E402
+
+START, END = date(2026, 10, 5), date(2026, 10, 11)
+
+
+def test_report_cache_follows_rollup_counter(run_db, monkeypatch):
+    monkeypatch.setattr(analytics, "_cache", analytics.TTLCache(maxsize=10, ttl=3600))
+
+    async def scenario(pool):
+        user_id = await pool.fetchval(
+            "INSERT INTO users (username, password_hash) VALUES ('ana', 'x') RETURNING user_id"
+        )
+
+        async def write(hours):
+            # Plain SQL on a separate connection: another worker or an import
+            await pool.execute(
+                "INSERT INTO timesheet (user_id, entry_date, project, task, hours, task_type) "
+                "VALUES ($1, $2, 'Atlas', 'dev', $3, 'Development')",
+                user_id, date(2026, 10, 7), hours,
+            )
+
+        await write(2.0)
+        first = await analytics.user_weekly_summary(user_id, START, END)
+        cached = await analytics.user_weekly_summary(user_id, START, END)
+
+        await write(3.0)
+        after_write = await analytics.user_weekly_summary(user_id, START, END)
+        return first, cached, after_write
+
+    first, cached, after_write = run_db(scenario)
+
+    assert first[0]["hours"] == 2.0
+    assert cached is first
+    assert after_write[0]["hours"] == 5.0
@@ -0,0 +1,70 @@
+"""Micro-batching of the LLM understand call across concurrent turns"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("asyncpg")
+
+from bot.app import router  # noqa: E402
+from bot.nlp import understand  # noqa: E402
+from bot.nlp.batching import ExtractionBatcher  # noqa: E402
+from bot.scripts.stub_llm import answer  # noqa: E402
+
+MESSAGES = [
+    "spent 3 hrs on api build for Atlas",
+    "2 hours debugging the login bug for Orion",
+    "research spike on caching, 1.5 hrs, TeleInsight",
+    "4 hrs writing docs for Glovatrix",
+]
+
+
+def test_concurrent_turns_share_one_llm_call(monkeypatch):
+    calls = []
+
+    async def fake_llm(prompt, max_tokens=None):
+        calls.append(prompt)
+        await asyncio.sleep(0.01)
+        return answer(prompt)
+
+    async def fake_session(external_id):
+        return {"state": "AUTHENTICATED", "user_id": 100 + int(external_id[1:])}
+
+    seen = {}
+
+    async def fake_timesheet(user_id, external_id, session, message, understanding=None):
+        seen[external_id] = understanding
+        return "ok"
+
+    batcher = ExtractionBatcher(
+        call_llm=fake_llm,
+        single_extract=understand._llm_understand,
+        window_ms=50,
+        max_size=16,
+        prompt=understand.BATCH_UNDERSTAND_PROMPT,
+        parse_item=understand._parse_understanding,
+    )
+    monkeypatch.setattr(understand, "_batcher", batcher)
+    monkeypatch.setattr(understand, "call_llm", fake_llm)
+    monkeypatch.setattr(understand, "FASTPATH_ENABLED", False)
+    monkeypatch.setattr(understand, "_recent", understand.TTLCache(maxsize=10, ttl=60))
+    monkeypatch.setattr(router, "get_or_create_session", fake_session)
+    monkeypatch.setattr(router, "handle_new_timesheet_message", fake_timesheet)
+
+    async def run():
+        return await asyncio.gather(
+            *(router.route_message(f"u{i}", msg) for i, msg in enumerate(MESSAGES))
+        )
+
+    results = asyncio.run(run())
+
+    assert [r["reply"] for r in results] == ["ok"] * len(MESSAGES)
+    assert len(calls) == 1
+    assert batcher.stats["batches"] == 1
+    assert batcher.stats["batched_items"] == len(MESSAGES)
+    assert not batcher._tasks
+    for i in range(len(MESSAGES)):
+        result = seen[f"u{i}"]
+        assert result.intent == "timesheet_log"
+        assert not result.failed
+        assert len(result.entries) == 1
@@ -0,0 +1,65 @@
+"""Inbound activity de-duplication: claim, complete and release"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from bot.app import dedup
+from bot.cache import TTLCache
+
+
+@pytest.fixture(params=["memory", "postgres"])
+def backend(request, monkeypatch):
+    monkeypatch.setattr(dedup, "DEDUP_ENABLED", True)
+    monkeypatch.setattr(dedup, "DEDUP_BACKEND", request.param)
+    monkeypatch.setattr(dedup, "_memory", TTLCache(maxsize=100, ttl=600))
+    if request.param == "postgres":
+        pytest.importorskip("asyncpg")
+        return request.getfixturevalue("run_db")
+    return lambda fn: asyncio.run(fn(None))
+
+
+def test_retry_of_answered_activity_gets_stored_reply(backend):
+    async def scenario(pool):
+        first = await dedup.claim("conv:1")
+        in_flight = await dedup.claim("conv:1")
+        await dedup.complete("conv:1", "Logged 2h")
+        retry = await dedup.claim("conv:1")
+        return first, in_flight, retry
+
+    first, in_flight, retry = backend(scenario)
+
+    assert first == (dedup.NEW, None)
+    assert in_flight == (dedup.IN_FLIGHT, None)
+    assert retry == (dedup.DUPLICATE, "Logged 2h")
+
+
+def test_released_claim_is_processed_again(backend):
+    async def scenario(pool):
+        await dedup.claim("conv:2")
+        await dedup.release("conv:2")
+        return await dedup.claim("conv:2")
+
+    assert backend(scenario) == (dedup.NEW, None)
+
+
+def test_activities_without_id_are_never_deduplicated(backend):
+    activity = SimpleNamespace(id=None, conversation=SimpleNamespace(id="conv"))
+    assert dedup.activity_key(activity) is None
+
+    async def scenario(pool):
+        return [await dedup.claim(None) for _ in range(2)]
+
+    assert backend(scenario) == [(dedup.NEW, None)] * 2
+
+
+def test_store_errors_do_not_block_messages(monkeypatch):
+    async def broken(*args):
+        raise OSError("database unavailable")
+
+    monkeypatch.setattr(dedup, "DEDUP_ENABLED", True)
+    monkeypatch.setattr(dedup, "DEDUP_BACKEND", "postgres")
+    monkeypatch.setattr(dedup, "_maybe_purge", broken)
+
+    assert asyncio.run(dedup.claim("conv:3")) == (dedup.NEW, None)
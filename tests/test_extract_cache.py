@@ -0,0 +1,107 @@
+"""TTLCache and the extraction result cache"""
+
+import asyncio
+from datetime import date
+
+import pytest
+
+from bot import cache as cache_module
+from bot.cache import TTLCache
+from bot.nlp import extract
+
+TODAY = date(2026, 10, 16)
+ENTRIES = [{"date": TODAY, "hours": 2.0, "task": "api testing", "project": "Atlas", "task_type": "Testing"}]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    return now
+
+
+def test_ttl_cache_expires_entries(clock):
+    c = TTLCache(maxsize=10, ttl=60)
+    c.set("a", 1)
+    assert c.get("a") == 1 and "a" in c
+
+    clock[0] += 61
+    assert c.get("a") is None and "a" not in c
+    assert c.stats()["hits"] == 1 and c.stats()["misses"] == 1
+
+
+def test_ttl_cache_evicts_least_recently_used(clock):
+    c = TTLCache(maxsize=2, ttl=60)
+    c.set("a", 1)
+    c.set("b", 2)
+    c.get("a")
+    c.set("c", 3)
+
+    assert "b" not in c
+    assert c.get("a") == 1 and c.get("c") == 3
+    assert c.evictions == 1
+
+
+def test_ttl_cache_items_skip_expired(clock):
+    c = TTLCache(maxsize=10, ttl=60)
+    c.set("old", 1, expires_at=clock[0] + 5)
+    c.set("new", 2)
+    clock[0] += 10
+
+    assert [key for key, _, _ in c.items()] == ["new"]
+
+
+def test_ttl_cache_size_zero_stores_nothing():
+    c = TTLCache(maxsize=0, ttl=60)
+    c.set("a", 1)
+    assert len(c) == 0
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(extract, "_cache", TTLCache(maxsize=100, ttl=3600))
+    return extract._cache
+
+
+def test_cache_key_normalizes_case_and_whitespace():
+    assert extract._cache_key("  Did API  testing\n2h ", TODAY) == extract._cache_key("did api testing 2h", TODAY)
+    assert extract._cache_key("did api testing 2h", TODAY) != extract._cache_key("did api testing 2h", date(2026, 10, 17))
+
+
+def test_extract_serves_cache_hits_as_copies(fresh_cache, monkeypatch):
+    async def no_llm(*args):
+        raise AssertionError("LLM called on a cache hit")
+
+    monkeypatch.setattr(extract, "FASTPATH_ENABLED", False)
+    monkeypatch.setattr(extract, "_batcher", None)
+    monkeypatch.setattr(extract, "_llm_extract", no_llm)
+    extract.cache_extraction_result("did api testing 2h", extract.datetime.now().date(), ENTRIES)
+
+    first = asyncio.run(extract.extract_timesheet_entries("Did API  testing 2h"))
+    first[0]["hours"] = 99
+    second = asyncio.run(extract.extract_timesheet_entries("did api testing 2h"))
+
+    assert second == ENTRIES
+    assert ENTRIES[0]["hours"] == 2.0
+
+
+def test_save_and_load_round_trip(fresh_cache, tmp_path, monkeypatch):
+    path = str(tmp_path / "extract_cache.json")
+    extract.cache_extraction_result("did api testing 2h", TODAY, ENTRIES)
+    fresh_cache.set("2026-10-16|expired", [], expires_at=1.0)
+
+    assert extract.save_extraction_cache(path) == 1
+    assert not list(tmp_path.glob("*.tmp"))
+
+    monkeypatch.setattr(extract, "_cache", TTLCache(maxsize=100, ttl=3600))
+    assert extract.load_extraction_cache(path) == 1
+    assert extract._cache.get(extract._cache_key("did api testing 2h", TODAY)) == ENTRIES
+
+
+def test_load_ignores_missing_or_corrupt_file(fresh_cache, tmp_path):
+    assert extract.load_extraction_cache(str(tmp_path / "missing.json")) == 0
+
+    corrupt = tmp_path / "corrupt.json"
+    corrupt.write_text("{not json")
+    assert extract.load_extraction_cache(str(corrupt)) == 0
+    assert len(fresh_cache) == 0
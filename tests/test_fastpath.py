@@ -0,0 +1,89 @@
+"""Fast-path parser: what it answers locally and what it leaves to the LLM"""
+
+from datetime import date
+
+import pytest
+
+from bot.nlp.fastpath import parse_timesheet_message, register_known_projects, try_fast_path
+from bot.nlp.task_types import find_task_type
+
+# A Thursday
+TODAY = date(2026, 10, 15)
+
+register_known_projects(["Glovatrix", "TeleInsight"])
+
+
+def test_simple_message_is_a_hit():
+    entries = try_fast_path("today 4h api testing", TODAY)
+    assert entries == [{
+        "date": TODAY,
+        "hours": 4.0,
+        "task": "api testing",
+        "project": "",
+        "task_type": "Testing",
+    }]
+
+
+def test_project_and_relative_date():
+    entries = try_fast_path("yesterday 2.5h debugging login on glovatrix", TODAY)
+    assert len(entries) == 1
+    assert entries[0]["date"] == date(2026, 10, 14)
+    assert entries[0]["hours"] == 2.5
+    assert entries[0]["project"] == "Glovatrix"
+    assert entries[0]["task_type"] == "Debugging"
+
+
+def test_last_weekday_resolves_to_past_date():
+    entries, _ = parse_timesheet_message("last monday 3h dev glovatrix", TODAY)
+    assert entries[0]["date"] == date(2026, 10, 12)
+
+
+@pytest.mark.parametrize("message", [
+    "3h dev tomorrow",
+    "next monday 3h dev",
+    "3h dev this week",
+    "2h testing last month",
+    "3 days ago 2h dev",
+    "2h dev on the weekend",
+])
+def test_unresolved_date_words_fall_through(message):
+    assert parse_timesheet_message(message, TODAY) == ([], 0.0)
+    assert try_fast_path(message, TODAY) is None
+
+
+def test_unknown_task_type_falls_through():
+    assert try_fast_path("yesterday 90m standup glovatrix", TODAY) is None
+
+
+def test_specific_task_type_beats_generic_word():
+    entries = try_fast_path("writing tests 2h today", TODAY)
+    assert entries[0]["task_type"] == "Testing"
+    assert entries[0]["task"] == "writing tests"
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("writing tests", "Testing"),
+    ("writing docs", "Documentation"),
+    ("writing", "Documentation"),
+    ("call about the deployment", "Devops"),
+    ("bug fixing in dev build", "Debugging"),
+    ("team meetings", "Meeting"),
+    ("lunch", None),
+])
+def test_find_task_type(text, expected):
+    assert find_task_type(text) == expected
+
+
+def test_two_hour_mentions_fall_through():
+    assert try_fast_path("today 2h dev 3h testing", TODAY) is None
+
+
+def test_multiple_dates_give_one_entry_each():
+    entries, confidence = parse_timesheet_message(
+        "today 2h testing glovatrix, yesterday 3h dev teleinsight", TODAY
+    )
+    assert [(e["date"], e["hours"], e["project"]) for e in entries] == [
+        (TODAY, 2.0, "Glovatrix"),
+        (date(2026, 10, 14), 3.0, "TeleInsight"),
+    ]
+    assert confidence == 1.0
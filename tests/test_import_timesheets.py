@@ -0,0 +1,30 @@
+"""Bulk import rejects rows for unknown users instead of failing (needs Postgres)"""
+
+import pytest
+
+pytest.importorskip("asyncpg")
+
+from bot.scripts.import_timesheets import import_file  # noqa: E402
+
+
+def test_unknown_user_id_is_rejected_not_fatal(run_db, tmp_path):
+    async def scenario(pool):
+        user_id = await pool.fetchval(
+            "INSERT INTO users (username, password_hash) VALUES ('ana', 'x') RETURNING user_id"
+        )
+        path = tmp_path / "export.csv"
+        path.write_text(
+            "user_id,username,date,hours,project,task\n"
+            f"{user_id},,2026-10-05,2,Atlas,dev\n"
+            f"{user_id + 1000},,2026-10-05,3,Atlas,dev\n"
+            ",ana,2026-10-06,4,Atlas,review\n"
+            ",nobody,2026-10-06,1,Atlas,review\n"
+        )
+        stats = await import_file(str(path), "csv")
+        hours = await pool.fetchval("SELECT sum(hours) FROM timesheet WHERE user_id = $1", user_id)
+        return stats, hours
+
+    stats, hours = run_db(scenario)
+
+    assert stats == {"total": 4, "imported": 2, "rejected": 2}
+    assert float(hours) == 6.0
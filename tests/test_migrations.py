@@ -0,0 +1,62 @@
+"""Versioned schema migrations (needs Postgres)"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("asyncpg")
+
+from bot.db import migrate  # noqa: E402
+
+
+def test_fresh_database_reaches_latest_version(run_pool):
+    async def scenario(pool):
+        version = await migrate.run_migrations(pool)
+        applied = await pool.fetch("SELECT version FROM schema_version ORDER BY version")
+        indexes = await pool.fetch("SELECT indexname FROM pg_indexes WHERE tablename = 'timesheet'")
+        return version, [r["version"] for r in applied], {r["indexname"] for r in indexes}
+
+    version, applied, indexes = run_pool(scenario)
+
+    assert version == migrate.latest_version()
+    assert applied == [v for v, _, _ in migrate.load_migrations()]
+    assert {"idx_timesheet_user_created", "idx_timesheet_user_date"} <= indexes
+
+
+def test_second_run_is_a_no_op(run_pool):
+    async def scenario(pool):
+        await migrate.run_migrations(pool)
+        before = await pool.fetch("SELECT version, applied_at FROM schema_version ORDER BY version")
+        version = await migrate.run_migrations(pool)
+        after = await pool.fetch("SELECT version, applied_at FROM schema_version ORDER BY version")
+        return version, before, after
+
+    version, before, after = run_pool(scenario)
+
+    assert version == migrate.latest_version()
+    assert before == after
+
+
+def test_concurrent_runs_apply_each_migration_once(run_pool):
+    async def scenario(pool):
+        versions = await asyncio.gather(*(migrate.run_migrations(pool) for _ in range(3)))
+        count = await pool.fetchval("SELECT count(*) FROM schema_version")
+        return versions, count
+
+    versions, count = run_pool(scenario)
+
+    assert versions == [migrate.latest_version()] * 3
+    assert count == len(migrate.load_migrations())
+
+
+def test_pending_migrations_apply_on_top_of_existing_schema(run_pool, monkeypatch):
+    migrations = migrate.load_migrations()
+
+    async def scenario(pool):
+        monkeypatch.setattr(migrate, "load_migrations", lambda: migrations[:2])
+        partial = await migrate.run_migrations(pool)
+        monkeypatch.setattr(migrate, "load_migrations", lambda: migrations)
+        full = await migrate.run_migrations(pool)
+        return partial, full
+
+    assert run_pool(scenario) == (migrations[1][0], migrations[-1][0])
@@ -0,0 +1,93 @@
+"""Monthly partitioning of the timesheet table (needs Postgres)"""
+
+import asyncio
+from datetime import date, datetime, timezone
+
+import pytest
+
+pytest.importorskip("asyncpg")
+
+from bot.db import migrate  # noqa: E402
+from bot.db.partitions import ensure_timesheet_partitions  # noqa: E402
+
+
+async def _migrate_to(pool, monkeypatch, version):
+    load_all = migrate.load_migrations
+    monkeypatch.setattr(migrate, "load_migrations", lambda: [m for m in load_all() if m[0] <= version])
+    await migrate.run_migrations(pool)
+    monkeypatch.setattr(migrate, "load_migrations", load_all)
+
+
+def test_swap_keeps_legacy_rows_and_routes_them(run_pool, monkeypatch):
+    async def scenario(pool):
+        await _migrate_to(pool, monkeypatch, 2)
+        user_id = await pool.fetchval(
+            "INSERT INTO users (username, password_hash) VALUES ('ana', 'x') RETURNING user_id"
+        )
+        await pool.executemany(
+            "INSERT INTO timesheet (user_id, entry_date, task, hours, created_at) VALUES ($1, $2, 'dev', $3, $4)",
+            [
+                (user_id, date(2024, 1, 15), 2.0, None),
+                (user_id, date(2024, 3, 2), 3.0, None),
+                (user_id, None, 1.5, datetime(2024, 3, 9, 10, tzinfo=timezone.utc)),
+            ],
+        )
+        legacy = await pool.fetch("SELECT entry_id, hours FROM timesheet ORDER BY entry_id")
+
+        await migrate.run_migrations(pool)
+
+        rows = await pool.fetch("""
+            SELECT entry_id, hours, entry_date, tableoid::regclass::text AS part
+            FROM timesheet ORDER BY entry_id
+        """)
+        new_id = await pool.fetchval(
+            "INSERT INTO timesheet (user_id, entry_date, task, hours) VALUES ($1, CURRENT_DATE, 'dev', 1) "
+            "RETURNING entry_id",
+            user_id,
+        )
+        kind = await pool.fetchval("SELECT relkind FROM pg_class WHERE relname = 'timesheet'")
+        return legacy, rows, new_id, kind
+
+    legacy, rows, new_id, kind = run_pool(scenario)
+
+    assert kind == b"p"
+    assert [(r["entry_id"], r["hours"]) for r in rows] == [(r["entry_id"], r["hours"]) for r in legacy]
+    assert [r["part"] for r in rows] == ["timesheet_2024_01", "timesheet_2024_03", "timesheet_2024_03"]
+    assert rows[2]["entry_date"] == date(2024, 3, 9)
+    assert new_id > max(r["entry_id"] for r in rows)
+
+
+def test_new_partition_takes_rows_from_default(run_db):
+    async def scenario(pool):
+        user_id = await pool.fetchval(
+            "INSERT INTO users (username, password_hash) VALUES ('ana', 'x') RETURNING user_id"
+        )
+        await pool.execute(
+            "INSERT INTO timesheet (user_id, entry_date, task, hours) VALUES ($1, '2099-06-10', 'dev', 2)",
+            user_id,
+        )
+        before = await pool.fetchval("SELECT tableoid::regclass::text FROM timesheet")
+        await pool.fetchval("SELECT ensure_timesheet_partition('2099-06-01')")
+        after = await pool.fetchval("SELECT tableoid::regclass::text FROM timesheet")
+        return before, after
+
+    assert run_db(scenario) == ("timesheet_default", "timesheet_2099_06")
+
+
+def test_concurrent_ensure_creates_each_partition_once(run_db):
+    async def scenario(pool):
+        results = await asyncio.gather(*(
+            pool.fetchval("SELECT ensure_timesheet_partition('2098-02-01')") for _ in range(4)
+        ))
+        again = await ensure_timesheet_partitions(pool, months_ahead=2)
+        count = await pool.fetchval("""
+            SELECT count(*) FROM pg_inherits
+            WHERE inhparent = 'timesheet'::regclass AND inhrelid = 'timesheet_2098_02'::regclass
+        """)
+        return results, again, count
+
+    results, again, count = run_db(scenario)
+
+    assert results == ["timesheet_2098_02"] * 4
+    assert len(again) == 3
+    assert count == 1
@@ -0,0 +1,75 @@
+"""Rollup triggers keep timesheet_daily_rollup in step with raw entries (needs Postgres)"""
+
+from datetime import date
+
+import pytest
+
+pytest.importorskip("asyncpg")
+
+from bot.db.rollup import rebuild_rollup, verify_rollup  # noqa: E402
+
+
+async def _user(pool, username="ana"):
+    return await pool.fetchval(
+        "INSERT INTO users (username, password_hash) VALUES ($1, 'x') RETURNING user_id", username
+    )
+
+
+def test_triggers_follow_insert_update_delete(run_db):
+    async def scenario(pool):
+        ana, bob = await _user(pool, "ana"), await _user(pool, "bob")
+        checks = []
+
+        await pool.executemany(
+            "INSERT INTO timesheet (user_id, entry_date, project, task, hours, task_type) "
+            "VALUES ($1, $2, $3, 'dev', $4, $5)",
+            [
+                (ana, date(2026, 10, 5), "Atlas", 2.0, "Development"),
+                (ana, date(2026, 10, 5), "Atlas", 1.5, "Development"),
+                (ana, date(2026, 10, 6), None, 3.0, None),
+                (bob, date(2026, 11, 2), "Atlas", 4.0, "Testing"),
+            ],
+        )
+        checks.append(await verify_rollup(pool))
+
+        # Multi-row update moving entries between keys, users and months
+        await pool.execute("UPDATE timesheet SET project = 'Borealis', hours = hours + 1 WHERE user_id = $1", ana)
+        await pool.execute("UPDATE timesheet SET user_id = $1, entry_date = '2026-10-07' WHERE user_id = $2", ana, bob)
+        checks.append(await verify_rollup(pool))
+
+        await pool.execute("DELETE FROM timesheet WHERE entry_date = '2026-10-05'")
+        checks.append(await verify_rollup(pool))
+
+        rollup = await pool.fetch("""
+            SELECT entry_date, project, hours, entry_count FROM timesheet_daily_rollup
+            WHERE user_id = $1 ORDER BY entry_date
+        """, ana)
+        return checks, [tuple(r) for r in rollup]
+
+    checks, rollup = run_db(scenario)
+
+    assert checks == [[], [], []]
+    assert rollup == [
+        (date(2026, 10, 6), "Borealis", 4.0, 1),
+        (date(2026, 10, 7), "Atlas", 4.0, 1),
+    ]
+
+
+def test_verify_reports_drift_and_rebuild_fixes_it(run_db):
+    async def scenario(pool):
+        user_id = await _user(pool)
+        await pool.execute(
+            "INSERT INTO timesheet (user_id, entry_date, project, task, hours, task_type) "
+            "VALUES ($1, '2026-10-05', 'Atlas', 'dev', 2, 'Development')",
+            user_id,
+        )
+        await pool.execute("UPDATE timesheet_daily_rollup SET hours = hours + 1")
+        drift = await verify_rollup(pool)
+        rows = await rebuild_rollup(pool)
+        return drift, rows, await verify_rollup(pool)
+
+    drift, rows, after = run_db(scenario)
+
+    assert [(d["expected_hours"], d["actual_hours"]) for d in drift] == [(2.0, 3.0)]
+    assert rows == 1
+    assert after == []
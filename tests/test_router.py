@@ -0,0 +1,82 @@
+"""Intent routing: keyword rules only decide first-person requests"""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("asyncpg")
+
+from bot.app import router  # noqa: E402
+from bot.nlp import understand  # noqa: E402
+from bot.nlp.intents import keyword_intent  # noqa: E402
+
+ADMIN_QUERIES = {
+    "how much work did john do this week": "admin_user_summary",
+    "project summary glovatrix this week": "admin_project_summary",
+    "user performance this week": "admin_efficiency",
+    "team efficiency this week": "admin_efficiency",
+}
+
+
+@pytest.fixture
+def routed(monkeypatch):
+    """Run route_message with a fake LLM and record which flow answered"""
+    llm_calls = []
+    flows = []
+
+    async def fake_llm(prompt, max_tokens=None):
+        llm_calls.append(prompt)
+        message = prompt.rsplit('User message: "', 1)[1].split('"', 1)[0]
+        return json.dumps({"intent": ADMIN_QUERIES.get(message, "unknown"), "entries": []})
+
+    async def fake_session(external_id):
+        return {"state": "AUTHENTICATED", "user_id": 7}
+
+    async def fake_admin(user_id, intent, message):
+        flows.append(intent)
+        return "admin"
+
+    async def fake_weekly(user_id):
+        flows.append("weekly_summary")
+        return {"reply": "weekly"}
+
+    async def fake_timesheet(user_id, external_id, session, message, understanding=None):
+        flows.append("timesheet")
+        return "timesheet"
+
+    monkeypatch.setattr(understand, "call_llm", fake_llm)
+    monkeypatch.setattr(understand, "_batcher", None)
+    monkeypatch.setattr(understand, "_recent", understand.TTLCache(maxsize=10, ttl=60))
+    monkeypatch.setattr(router, "get_or_create_session", fake_session)
+    monkeypatch.setattr(router, "handle_admin_query", fake_admin)
+    monkeypatch.setattr(router, "handle_weekly_summary", fake_weekly)
+    monkeypatch.setattr(router, "handle_new_timesheet_message", fake_timesheet)
+
+    def run(message):
+        asyncio.run(router.route_message("u1", message))
+        return flows[-1], len(llm_calls)
+
+    return run
+
+
+@pytest.mark.parametrize("message,intent", sorted(ADMIN_QUERIES.items()))
+def test_admin_queries_mentioning_this_week_reach_admin_flow(routed, message, intent):
+    assert keyword_intent(message) is None
+    flow, llm_calls = routed(message)
+    assert flow == intent
+    assert llm_calls == 1
+
+
+@pytest.mark.parametrize("message", ["weekly summary", "what did i do this week?", "show my week"])
+def test_first_person_weekly_summary_skips_llm(routed, message):
+    flow, llm_calls = routed(message)
+    assert flow == "weekly_summary"
+    assert llm_calls == 0
+
+
+def test_log_line_without_hours_is_not_a_summary(routed):
+    assert keyword_intent("did api testing this week") is None
+    flow, llm_calls = routed("did api testing this week")
+    assert flow == "timesheet"
+    assert llm_calls == 1
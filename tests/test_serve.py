@@ -0,0 +1,32 @@
+"""Supervisor sizing and multi-worker configuration"""
+
+import pytest
+
+from bot.app import serve
+
+
+@pytest.mark.parametrize("workers", [1, 2, 4, 8, 13])
+def test_connections_fit_budget(workers):
+    budget = 40
+    pool = serve.pool_size_per_worker(workers, budget)
+    per_worker = pool + (1 if workers > 1 else 0)
+    # workers + the replacement started by a rolling restart
+    assert per_worker * (workers + 1) <= budget
+
+
+def test_single_worker_keeps_whole_share():
+    assert serve.pool_size_per_worker(1, 40) == 20
+    assert serve.multi_worker_env(1) == {}
+
+
+def test_multi_worker_needs_shared_dedup(monkeypatch):
+    monkeypatch.setattr(serve, "DEDUP_ENABLED", True)
+    monkeypatch.setattr(serve, "DEDUP_BACKEND", "memory")
+    with pytest.raises(ValueError):
+        serve.multi_worker_env(2)
+
+    monkeypatch.setattr(serve, "DEDUP_BACKEND", "postgres")
+    assert serve.multi_worker_env(2) == {
+        "SESSION_CACHE_SIZE": "0",
+        "TURN_LOCK_BACKEND": "postgres",
+    }
@@ -0,0 +1,63 @@
+"""Write-through session cache (needs Postgres)"""
+
+import pytest
+
+asyncpg = pytest.importorskip("asyncpg")
+
+from bot.cache import TTLCache  # noqa: E402
+from bot.db import sessions  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(sessions, "_cache", TTLCache(maxsize=100, ttl=3600))
+
+
+def test_reads_are_served_from_cache(run_db):
+    async def scenario(pool):
+        created = await sessions.get_or_create_session("teams-1")
+        # Changed behind the cache's back: a hit must not see it
+        await pool.execute("UPDATE sessions SET state = 'OTHER' WHERE external_id = 'teams-1'")
+        cached = await sessions.get_or_create_session("teams-1")
+        sessions.invalidate_session("teams-1")
+        reread = await sessions.get_or_create_session("teams-1")
+        return created, cached, reread
+
+    created, cached, reread = run_db(scenario)
+
+    assert created["state"] == cached["state"] == "NEW"
+    assert reread["state"] == "OTHER"
+    assert sessions.get_session_cache_stats()["hits"] == 1
+
+
+def test_updates_write_through(run_db):
+    async def scenario(pool):
+        await sessions.get_or_create_session("teams-2")
+        await sessions.update_session("teams-2", state="AUTHENTICATED")
+        session = await sessions.get_or_create_session("teams-2")
+        stored = await pool.fetchval("SELECT state FROM sessions WHERE external_id = 'teams-2'")
+        return session, stored
+
+    session, stored = run_db(scenario)
+
+    assert session["state"] == stored == "AUTHENTICATED"
+    assert sessions.get_session_cache_stats()["hits"] == 1
+
+
+def test_failed_update_drops_cached_session(run_db):
+    async def scenario(pool):
+        await sessions.get_or_create_session("teams-3")
+        with pytest.raises(asyncpg.PostgresError):
+            await sessions.update_session("teams-3", no_such_column=1)
+        return "teams-3" in sessions._cache
+
+    assert run_db(scenario) is False
+
+
+def test_returned_sessions_are_copies(run_db):
+    async def scenario(pool):
+        session = await sessions.get_or_create_session("teams-4")
+        session["state"] = "MUTATED"
+        return await sessions.get_or_create_session("teams-4")
+
+    assert run_db(scenario)["state"] == "NEW"
@@ -0,0 +1,38 @@
+"""Snapshot reports group like SQL GROUP BY (needs Postgres)"""
+
+from datetime import date
+
+import pytest
+
+pytest.importorskip("asyncpg")
+pytest.importorskip("numpy")
+
+from bot.analytics.snapshot import Snapshot, build_snapshot  # noqa: E402
+
+
+def test_null_and_empty_project_stay_separate(run_db, tmp_path):
+    path = tmp_path / "snapshot"
+
+    async def scenario(pool):
+        user_id = await pool.fetchval(
+            "INSERT INTO users (username, password_hash) VALUES ('ana', 'x') RETURNING user_id"
+        )
+        await pool.executemany(
+            "INSERT INTO timesheet (user_id, entry_date, project, task, hours, task_type) "
+            "VALUES ($1, $2, $3, 'dev', $4, 'Development')",
+            [
+                (user_id, date(2026, 10, 5), None, 1.0),
+                (user_id, date(2026, 10, 6), "", 2.0),
+                (user_id, date(2026, 10, 7), "Atlas", 4.0),
+            ],
+        )
+        await build_snapshot(str(path))
+        rows = await pool.fetch("SELECT project, SUM(hours)::float8 AS hours FROM timesheet GROUP BY project")
+        return {r["project"]: r["hours"] for r in rows}
+
+    expected = run_db(scenario)
+    snapshot = Snapshot(str(path))
+
+    assert snapshot.group_sum("project") == expected == {None: 1.0, "": 2.0, "Atlas": 4.0}
+    labels, _, matrix = snapshot.weekly_pivot("project")
+    assert dict(zip(labels, matrix.sum(axis=1))) == expected
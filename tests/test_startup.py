@@ -0,0 +1,28 @@
+"""Startup budget: `import bot.app.main` stays fast and leaves the LLM stack unloaded"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+for module in ("aiohttp", "botbuilder.core", "asyncpg"):
+    pytest.importorskip(module)
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Generous next to the README's 1500 ms so slow CI machines don't flake
+BUDGET_MS = os.getenv("STARTUP_BUDGET_MS", "3000")
+
+
+def test_startup_report_check():
+    proc = subprocess.run(
+        [sys.executable, "-m", "bot.scripts.startup_report", "--budget-ms", BUDGET_MS, "--top", "5"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+    assert "FAIL" not in proc.stdout
@@ -0,0 +1,43 @@
+"""Registered statements keep working across pool acquires (needs Postgres)"""
+
+import asyncio
+import os
+
+import pytest
+
+asyncpg = pytest.importorskip("asyncpg")
+
+from bot.db import statements  # noqa: E402
+from bot.db.pool import _init_connection  # noqa: E402
+
+DSN = os.getenv("TEST_POSTGRES_DSN")
+
+ADD_ONE = statements.register("test_add_one", "SELECT $1::int + 1")
+
+
+@pytest.mark.skipif(not DSN, reason="set TEST_POSTGRES_DSN to run database tests")
+def test_same_connection_acquired_twice():
+    async def run():
+        pool = await asyncpg.create_pool(
+            dsn=DSN, min_size=1, max_size=1, init=_init_connection, statement_cache_size=16
+        )
+        try:
+            results = []
+            for n in (1, 2):
+                async with pool.acquire() as conn:
+                    pid = conn.get_server_pid()
+                    results.append((
+                        pid,
+                        await statements.fetchval(conn, ADD_ONE, n),
+                        await statements.fetchrow(conn, ADD_ONE, n),
+                        await statements.fetch(conn, ADD_ONE, n),
+                    ))
+            return results
+        finally:
+            await pool.close()
+
+    (pid1, val1, row1, rows1), (pid2, val2, row2, rows2) = asyncio.run(run())
+
+    assert pid1 == pid2
+    assert (val1, row1[0], rows1[0][0]) == (2, 2, 2)
+    assert (val2, row2[0], rows2[0][0]) == (3, 3, 3)
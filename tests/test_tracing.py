@@ -0,0 +1,116 @@
+"""Trace context propagation through tasks and the span buffer"""
+
+import asyncio
+import logging
+from collections import deque
+
+import pytest
+
+from bot import tracing
+
+
+@pytest.fixture
+def sampled(monkeypatch):
+    monkeypatch.setattr(tracing, "TRACE_ENABLED", True)
+    monkeypatch.setattr(tracing, "TRACE_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(tracing, "_buffer", deque())
+    return tracing._buffer
+
+
+def test_child_spans_share_the_turn_trace(sampled):
+    with tracing.start_turn(channel="msteams") as turn:
+        with tracing.span("router") as router:
+            with tracing.span("llm", model="stub") as llm:
+                assert tracing.current_turn_id() == turn.trace_id
+            tracing.record_span("query", 0.002, statement="last_entry")
+    assert tracing.current_span() is None
+
+    by_name = {s.name: s for s in sampled}
+    assert set(by_name) == {"turn", "router", "llm", "query"}
+    assert {s.trace_id for s in sampled} == {turn.trace_id}
+    assert router.parent_id == turn.span_id
+    assert llm.parent_id == router.span_id and llm.attributes == {"model": "stub"}
+    assert by_name["query"].parent_id == router.span_id
+    assert turn.attributes == {"channel": "msteams"}
+
+
+def test_context_follows_tasks(sampled):
+    async def child():
+        with tracing.span("child") as s:
+            return s
+
+    async def run():
+        with tracing.start_turn() as turn:
+            spans = await asyncio.gather(child(), child())
+        return turn, spans
+
+    turn, spans = asyncio.run(run())
+
+    assert all(s.trace_id == turn.trace_id and s.parent_id == turn.span_id for s in spans)
+
+
+def test_resume_continues_turn_in_another_task(monkeypatch):
+    monkeypatch.setattr(tracing, "TRACE_ENABLED", False)
+
+    async def worker(parent):
+        with tracing.resume(parent, "turn.worker"):
+            with tracing.span("unsampled") as child:
+                return tracing.current_turn_id(), child
+
+    async def run():
+        with tracing.start_turn() as turn:
+            parent = tracing.current_span()
+        # The worker runs outside the turn's context, like the turn queue
+        return turn.trace_id, await asyncio.create_task(worker(parent))
+
+    trace_id, (resumed_id, child) = asyncio.run(run())
+
+    assert resumed_id == trace_id
+    assert child is None
+
+
+def test_unsampled_turn_records_nothing(monkeypatch):
+    monkeypatch.setattr(tracing, "TRACE_ENABLED", False)
+    monkeypatch.setattr(tracing, "_buffer", deque())
+
+    with tracing.start_turn():
+        with tracing.span("router") as router:
+            tracing.record_span("query", 0.001)
+
+    assert router is None
+    assert not tracing._buffer
+
+
+def test_errors_mark_the_span(sampled):
+    with pytest.raises(ValueError):
+        with tracing.start_turn():
+            with tracing.span("flow"):
+                raise ValueError("bad entry")
+
+    assert [s.status for s in sampled] == ["error", "error"]
+    assert sampled[0].attributes["error"] == "ValueError: bad entry"
+
+
+def test_full_buffer_drops_spans(sampled, monkeypatch):
+    monkeypatch.setattr(tracing, "TRACE_BUFFER_SIZE", 2)
+    dropped = tracing._stats["dropped"]
+
+    with tracing.start_turn():
+        for n in range(3):
+            with tracing.span(f"step{n}"):
+                pass
+
+    assert len(sampled) == 2
+    assert tracing._stats["dropped"] - dropped == 2
+
+
+def test_log_records_carry_turn_id(sampled, caplog):
+    tracing.install_log_correlation()
+    log = logging.getLogger("tests.tracing")
+
+    with caplog.at_level(logging.INFO, logger="tests.tracing"):
+        with tracing.start_turn() as turn:
+            log.info("inside")
+        log.info("outside")
+
+    assert [r.turn_id for r in caplog.records] == [turn.trace_id[:12], "-"]
@@ -0,0 +1,109 @@
+"""Per-user turn serialization"""
+
+import asyncio
+
+import pytest
+
+from bot.app.turn_lock import KeyedLock
+
+
+def test_same_key_runs_in_arrival_order():
+    async def run():
+        locks = KeyedLock()
+        events = []
+
+        async def turn(key, n):
+            async with locks.hold(key):
+                events.append(("start", n))
+                await asyncio.sleep(0.01)
+                events.append(("end", n))
+
+        await asyncio.gather(*(turn("user-1", n) for n in range(3)))
+        return events, locks.stats()
+
+    events, stats = asyncio.run(run())
+
+    assert events == [("start", 0), ("end", 0), ("start", 1), ("end", 1), ("start", 2), ("end", 2)]
+    assert stats["acquired"] == 3 and stats["contended"] == 2 and stats["max_waiters"] == 2
+
+
+def test_different_keys_do_not_wait():
+    async def run():
+        locks = KeyedLock()
+        inside = asyncio.Event()
+
+        async def first():
+            async with locks.hold("user-1"):
+                await asyncio.wait_for(inside.wait(), 1)
+
+        async def second():
+            async with locks.hold("user-2"):
+                inside.set()
+
+        await asyncio.gather(first(), second())
+        return locks.stats()
+
+    assert asyncio.run(run())["contended"] == 0
+
+
+def test_idle_keys_are_dropped():
+    async def run():
+        locks = KeyedLock()
+        async with locks.hold("user-1"):
+            during = locks.stats()["active_keys"]
+        with pytest.raises(RuntimeError):
+            async with locks.hold("user-2"):
+                raise RuntimeError("turn failed")
+        return during, locks.stats()["active_keys"]
+
+    assert asyncio.run(run()) == (1, 0)
+
+
+def test_cancelled_waiter_releases_its_ref():
+    async def run():
+        locks = KeyedLock()
+        release = asyncio.Event()
+
+        async def holder():
+            async with locks.hold("user-1"):
+                await release.wait()
+
+        task = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(locks.hold("user-1").__aenter__())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        release.set()
+        await task
+        return locks.stats()
+
+    stats = asyncio.run(run())
+    assert stats["active_keys"] == 0 and stats["waiting"] == 0
+
+
+class _FakeShared:
+    def __init__(self):
+        self.calls = []
+        self.polls = 0
+
+    async def acquire(self, key):
+        self.calls.append(("acquire", key))
+
+    async def release(self, key):
+        self.calls.append(("release", key))
+
+
+def test_shared_lock_taken_inside_local_lock():
+    async def run():
+        shared = _FakeShared()
+        locks = KeyedLock(shared=shared)
+        async with locks.hold("user-1"):
+            shared.calls.append(("body", "user-1"))
+        return shared.calls, locks.stats()["backend"]
+
+    calls, backend = asyncio.run(run())
+
+    assert calls == [("acquire", "user-1"), ("body", "user-1"), ("release", "user-1")]
+    assert backend == "postgres"